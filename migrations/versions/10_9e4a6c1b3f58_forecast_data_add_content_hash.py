@@ -0,0 +1,32 @@
+"""forecast_data: add content_hash
+
+Revision ID: 9e4a6c1b3f58
+Revises: 5d2b7e8a1c36
+Create Date: 2026-10-18 13:41:19.062735
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4a6c1b3f58"
+down_revision: Union[str, Sequence[str], None] = "5d2b7e8a1c36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL pour les lignes existantes : réécrites au prochain rafraîchissement
+    op.add_column(
+        "forecast_data", sa.Column("content_hash", sa.String(length=40), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("forecast_data", "content_hash")
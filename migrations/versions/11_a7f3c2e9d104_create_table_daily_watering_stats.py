@@ -0,0 +1,69 @@
+"""Create table daily_watering_stats.
+
+Revision ID: a7f3c2e9d104
+Revises: 9e4a6c1b3f58
+Create Date: 2026-10-18 14:32:50.318442
+
+"""
+
+from typing import Sequence, Union
+
+from collections import Counter, defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+from db.db_watering_stats import COUNTERS, TaskState, _utc_naive, contribution
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7f3c2e9d104"
+down_revision: Union[str, Sequence[str], None] = "9e4a6c1b3f58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    stats = op.create_table(
+        "daily_watering_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("runs", sa.Integer(), nullable=False),
+        sa.Column("completed_runs", sa.Integer(), nullable=False),
+        sa.Column("total_seconds", sa.Integer(), nullable=False),
+        sa.Column("actual_seconds", sa.Integer(), nullable=False),
+        sa.Column("canceled_runs", sa.Integer(), nullable=False),
+        sa.Column("error_runs", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("day"),
+    )
+    # Remplissage dans la même migration : sans ligne de départ, les
+    # changements de statut des tâches existantes rendraient les compteurs
+    # négatifs (scripts/backfill_daily_stats.py reste là pour réparer).
+    tasks = sa.table(
+        "tasks",
+        sa.column("status", sa.String),
+        sa.column("duration", sa.Integer),
+        sa.column("created_at", sa.DateTime),
+        sa.column("updated_at", sa.DateTime),
+    )
+    totals = defaultdict(Counter)
+    rows = op.get_bind().execute(
+        sa.select(
+            tasks.c.status, tasks.c.duration, tasks.c.created_at, tasks.c.updated_at
+        )
+    )
+    for row in rows:
+        state = TaskState(*row)
+        totals[_utc_naive(state.created_at).date()].update(contribution(state))
+    op.bulk_insert(
+        stats,
+        [
+            {"day": day, **{name: counters.get(name, 0) for name in COUNTERS}}
+            for day, counters in sorted(totals.items())
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_watering_stats")
@@ -0,0 +1,38 @@
+"""Create table tank_level_samples.
+
+Revision ID: e25b8f4c7a91
+Revises: a7f3c2e9d104
+Create Date: 2026-10-18 16:05:27.913570
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e25b8f4c7a91"
+down_revision: Union[str, Sequence[str], None] = "a7f3c2e9d104"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tank_level_samples",
+        sa.Column("resolution", sa.String(length=4), nullable=False),
+        sa.Column("measured_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("level", sa.Float(), nullable=False),
+        sa.Column("min_level", sa.SmallInteger(), nullable=False),
+        sa.Column("max_level", sa.SmallInteger(), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("resolution", "measured_at"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tank_level_samples")
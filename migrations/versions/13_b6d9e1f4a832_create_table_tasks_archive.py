@@ -0,0 +1,52 @@
+"""Create table tasks_archive.
+
+Revision ID: b6d9e1f4a832
+Revises: e25b8f4c7a91
+Create Date: 2026-10-18 17:12:44.305118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6d9e1f4a832"
+down_revision: Union[str, Sequence[str], None] = "e25b8f4c7a91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("duration", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_tasks_archive_created_at_id",
+        "tasks_archive",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_tasks_archive_status_created_at_id",
+        "tasks_archive",
+        ["status", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_archive_status_created_at_id", table_name="tasks_archive")
+    op.drop_index("ix_tasks_archive_created_at_id", table_name="tasks_archive")
+    op.drop_table("tasks_archive")
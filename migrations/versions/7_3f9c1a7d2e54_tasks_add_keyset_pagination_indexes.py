@@ -0,0 +1,37 @@
+"""tasks: add keyset pagination indexes on (created_at, id)
+
+Revision ID: 3f9c1a7d2e54
+Revises: b4289ac7f46f
+Create Date: 2026-10-18 09:12:31.204117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c1a7d2e54"
+down_revision: Union[str, Sequence[str], None] = "b4289ac7f46f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tasks_created_at_id", "tasks", ["created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_tasks_status_created_at_id",
+        "tasks",
+        ["status", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_status_created_at_id", table_name="tasks")
+    op.drop_index("ix_tasks_created_at_id", table_name="tasks")
@@ -0,0 +1,52 @@
+"""tasks: add active_slot with a unique index (one task in progress)
+
+Revision ID: c81e4d2f9a07
+Revises: 3f9c1a7d2e54
+Create Date: 2026-10-18 11:02:47.519306
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c81e4d2f9a07"
+down_revision: Union[str, Sequence[str], None] = "3f9c1a7d2e54"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("tasks", sa.Column("active_slot", sa.Integer(), nullable=True))
+
+    # La tâche "in progress" la plus récente prend l'emplacement ; les autres
+    # sont des restes d'arrêts brutaux.
+    bind = op.get_bind()
+    active = bind.execute(
+        sa.text(
+            "SELECT id FROM tasks WHERE status = 'in progress' "
+            "ORDER BY created_at DESC"
+        )
+    ).scalars().all()
+    if active:
+        bind.execute(
+            sa.text("UPDATE tasks SET active_slot = 1 WHERE id = :id"),
+            {"id": active[0]},
+        )
+    for task_id in active[1:]:
+        bind.execute(
+            sa.text("UPDATE tasks SET status = 'canceled' WHERE id = :id"),
+            {"id": task_id},
+        )
+
+    op.create_index("uq_tasks_active_slot", "tasks", ["active_slot"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_tasks_active_slot", table_name="tasks")
+    op.drop_column("tasks", "active_slot")
@@ -0,0 +1,51 @@
+"""weather_data: unique date (deduplicate, keep the latest row)
+
+Revision ID: 5d2b7e8a1c36
+Revises: c81e4d2f9a07
+Create Date: 2026-10-18 12:20:05.847113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d2b7e8a1c36"
+down_revision: Union[str, Sequence[str], None] = "c81e4d2f9a07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Doublons de date : on garde la ligne la plus récemment écrite
+    bind = op.get_bind()
+    duplicates = bind.execute(
+        sa.text(
+            "SELECT date FROM weather_data GROUP BY date HAVING COUNT(*) > 1"
+        )
+    ).scalars().all()
+    for day in duplicates:
+        keep = bind.execute(
+            sa.text(
+                "SELECT id FROM weather_data WHERE date = :date "
+                "ORDER BY updated_at DESC, id DESC LIMIT 1"
+            ),
+            {"date": day},
+        ).scalar()
+        bind.execute(
+            sa.text("DELETE FROM weather_data WHERE date = :date AND id <> :id"),
+            {"date": day, "id": keep},
+        )
+
+    op.drop_index("ix_weather_data_date", table_name="weather_data")
+    op.create_index("ix_weather_data_date", "weather_data", ["date"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_weather_data_date", table_name="weather_data")
+    op.create_index("ix_weather_data_date", "weather_data", ["date"], unique=False)
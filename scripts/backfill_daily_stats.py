@@ -0,0 +1,27 @@
+"""Reconstruit la table daily_watering_stats à partir de tasks (et tasks_archive).
+
+   La migration qui crée la table la remplit déjà ; ce script sert à
+   réparer l'agrégat (tasks_archive compris). Ensuite db_tasks le tient à
+   jour à chaque changement de statut. L'opération est idempotente.
+
+   Usage: python scripts/backfill_daily_stats.py"""
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+for path in (ROOT_DIR, SRC_DIR):
+    path_str = str(path)
+    if path_str not in sys.path and path.exists():
+        sys.path.insert(0, path_str)
+
+from db.db_watering_stats import rebuild_daily_stats  # noqa: E402
+
+
+def main():
+    days = rebuild_daily_stats()
+    print(f"daily_watering_stats rebuilt: {days} day(s).")
+
+
+if __name__ == "__main__":
+    main()
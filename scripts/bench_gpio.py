@@ -0,0 +1,112 @@
+"""Benchmark du vrai GPIOControl sur la carte GPIO virtuelle.
+
+   - getLevel / readLevelMask / debugWaterLevels : appels par seconde ;
+   - openWater / closeWater : durée des séquences vanne/pompe ;
+   - charge : lectures de broches par seconde quand N threads lisent le
+     niveau, en direct (getLevel) ou via le contrôleur partagé.
+
+   Usage: python scripts/bench_gpio.py [--seconds S] [--threads N]
+          [--read-latency S] [--settle S]"""
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+for path in (ROOT_DIR, SRC_DIR):
+    path_str = str(path)
+    if path_str not in sys.path and path.exists():
+        sys.path.insert(0, path_str)
+
+os.environ["GPIO_BACKEND"] = "virtual"
+os.environ.setdefault("FLASK_ENV", "development")
+
+from infrastructure.control import virtual_gpio  # noqa: E402
+from infrastructure.devices.controllers import (  # noqa: E402
+    ControlImpl,
+    DeviceControllerAdapter,
+)
+
+
+def _rate(fn, seconds):
+    calls = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        fn()
+        calls += 1
+    return calls / seconds
+
+
+def bench_calls(control, seconds):
+    for name in ("getLevel", "readLevelMask", "debugWaterLevels"):
+        before = virtual_gpio.board.reads
+        rate = _rate(getattr(control, name), seconds)
+        reads = (virtual_gpio.board.reads - before) / seconds
+        print(f"{name}: {rate:.0f} calls/s, {reads:.0f} pin reads/s")
+
+
+def bench_sequences(control, runs):
+    for name in ("openWater", "closeWater"):
+        durations = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            getattr(control, name)()
+            durations.append((time.perf_counter() - started) * 1000)
+        print(f"{name}: mean={sum(durations) / len(durations):.1f}ms over {runs} runs")
+
+
+def _load(read, threads, seconds):
+    stop = threading.Event()
+    calls = [0] * threads
+
+    def worker(index):
+        while not stop.is_set():
+            read()
+            calls[index] += 1
+
+    before = virtual_gpio.board.reads
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in workers:
+        thread.join()
+    return sum(calls) / seconds, (virtual_gpio.board.reads - before) / seconds
+
+
+def bench_load(control, threads, seconds):
+    rate, reads = _load(control.getLevel, threads, seconds)
+    print(f"load direct ({threads} threads): {rate:.0f} levels/s, {reads:.0f} pin reads/s")
+
+    controller = DeviceControllerAdapter(control)
+    controller.setup()
+    controller.start_sampling()
+    rate, reads = _load(controller.get_level, threads, seconds)
+    print(f"load shared ({threads} threads): {rate:.0f} levels/s, {reads:.0f} pin reads/s")
+    controller.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--read-latency", type=float, default=0.0001)
+    parser.add_argument("--settle", type=float, default=0.05)
+    args = parser.parse_args()
+
+    virtual_gpio.board.read_latency = args.read_latency
+    control = ControlImpl()
+    control.settleDelay = args.settle
+    control.setup()
+
+    bench_calls(control, args.seconds)
+    bench_sequences(control, 5)
+    bench_load(control, args.threads, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark de l'agrégation par tranche de journée.
+
+   Compare ``weather.aggregate_by_partday`` (fromisoformat, listes
+   d'indices, Counter par tranche) à ``partday.aggregate_partday_columns``
+   (un passage, tableaux typés) sur des séries horaires synthétiques de
+   ``--days`` jours pour ``--locations`` points ; vérifie au passage que les
+   deux résultats sont identiques.
+
+   Usage: python scripts/bench_partday.py [--days N] [--locations N]
+          [--repeat N]"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+for path in (ROOT_DIR, SRC_DIR):
+    path_str = str(path)
+    if path_str not in sys.path and path.exists():
+        sys.path.insert(0, path_str)
+
+os.environ.setdefault("FLASK_ENV", "development")
+
+from services.partday import aggregate_partday_columns  # noqa: E402
+from services.weather import aggregate_by_partday  # noqa: E402
+
+
+def synthetic_payload(days, seed):
+    rng = random.Random(seed)
+    start = datetime(2025, 7, 1)
+    hours = [start + timedelta(hours=h) for h in range(24 * days)]
+    return {
+        "hourly": {
+            "time": [h.strftime("%Y-%m-%dT%H:%M") for h in hours],
+            "weather_code": [rng.choice([0, 1, 2, 3, 61, 80, 95]) for _ in hours],
+            "cloudcover": [rng.randint(0, 100) for _ in hours],
+            "temperature_2m": [round(rng.uniform(-5, 35), 1) for _ in hours],
+            "precipitation": [round(rng.uniform(0, 3), 1) for _ in hours],
+        }
+    }
+
+
+def bench(function, payloads, repeat):
+    """Durée médiane d'agrégation de tous les points, en millisecondes."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for payload in payloads:
+            function(payload)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=16)
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = [synthetic_payload(args.days, seed) for seed in range(args.locations)]
+    for payload in payloads:
+        if aggregate_partday_columns(payload) != aggregate_by_partday(payload):
+            sys.exit("Results differ between the two implementations")
+
+    reference = bench(aggregate_by_partday, payloads, args.repeat)
+    columns = bench(aggregate_partday_columns, payloads, args.repeat)
+    print(
+        f"{args.locations} location(s) x {args.days} day(s), "
+        f"median of {args.repeat} run(s)"
+    )
+    print(f"aggregate_by_partday      : {reference:8.2f} ms")
+    print(f"aggregate_partday_columns : {columns:8.2f} ms ({reference / columns:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
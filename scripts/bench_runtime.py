@@ -0,0 +1,148 @@
+"""Benchmark du runtime d'arrosage sans matériel (FakeControl).
+
+   - cutoff : latence entre le passage de la cuve à vide (front simulé)
+     et la fermeture de l'eau par le runtime ;
+   - drift : écart entre la durée demandée et la durée réelle de pompage,
+     pour le runtime actuel et pour l'ancienne boucle ``sleep(1)``.
+
+   Usage: python scripts/bench_runtime.py [--runs N] [--duration S]
+          [--actuation S] [--read-latency S]"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+for path in (ROOT_DIR, SRC_DIR):
+    path_str = str(path)
+    if path_str not in sys.path and path.exists():
+        sys.path.insert(0, path_str)
+
+os.environ.setdefault("FLASK_ENV", "development")
+
+from application.watering.runtime import WateringRuntime  # noqa: E402
+from domain.watering.entities import TaskStatus, WateringTask  # noqa: E402
+from infrastructure.devices.controllers import DeviceControllerAdapter  # noqa: E402
+from infrastructure.control.control_fake import FakeControl  # noqa: E402
+from tests.fakes import InMemoryRepository  # noqa: E402
+
+
+def _task(task_id, duration):
+    now = datetime.now(timezone.utc)
+    return WateringTask(
+        id=task_id,
+        duration=duration,
+        status=TaskStatus.IN_PROGRESS,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def bench_cutoff(runs):
+    """Latence de coupure cuve vide, en millisecondes."""
+    controller = DeviceControllerAdapter()
+    repository = InMemoryRepository()
+    runtime = WateringRuntime(controller, repository)
+    latencies = []
+    for i in range(runs):
+        task_id = f"cutoff-{i}"
+        controller._control.level = 4
+        runtime.start(_task(task_id, 300))
+        time.sleep(0.05)
+        started = time.perf_counter()
+        controller._control.level = 0
+        if not repository.wait(task_id, 5):
+            raise RuntimeError(f"Task {task_id} was not cut off")
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+class _TimedControl(FakeControl):
+    """Simule les temporisations vanne/pompe et horodate la marche de la pompe."""
+
+    def __init__(self, actuation_delay, read_latency):
+        super().__init__()
+        self.settleDelay = actuation_delay
+        self._read_latency = read_latency
+        self.pump_started = None
+        self.pump_stopped = threading.Event()
+        self.pump_on_seconds = None
+
+    def setPump(self, running):
+        if running:
+            self.pump_started = time.perf_counter()
+        elif self.pump_started is not None:
+            self.pump_on_seconds = time.perf_counter() - self.pump_started
+            self.pump_started = None
+            self.pump_stopped.set()
+
+    def readLevelMask(self):
+        time.sleep(self._read_latency)  # 4 lectures GPIO + logs
+        return super().readLevelMask()
+
+    def getLevel(self):
+        time.sleep(self._read_latency)
+        return super().getLevel()
+
+
+def _legacy_run(control, duration):
+    """Reproduit l'ancienne boucle : elapsed += 1 après chaque sleep(1)."""
+    elapsed = 0
+    control.setValve(True)
+    time.sleep(control.settleDelay)
+    control.setPump(True)
+    while elapsed < duration:
+        control.getLevel()
+        time.sleep(1)
+        elapsed += 1
+    control.setPump(False)
+    time.sleep(control.settleDelay)
+    control.setValve(False)
+
+
+def bench_drift(runs, duration, actuation_delay, read_latency):
+    """Écart durée réelle - durée demandée, en millisecondes."""
+    results = {"runtime": [], "legacy loop": []}
+    control = _TimedControl(actuation_delay, read_latency)
+    runtime = WateringRuntime(DeviceControllerAdapter(control), InMemoryRepository())
+    for i in range(runs):
+        control.pump_stopped.clear()
+        runtime.start(_task(f"drift-{i}", duration))
+        control.pump_stopped.wait(duration + 10 * actuation_delay + 5)
+        results["runtime"].append((control.pump_on_seconds - duration) * 1000)
+
+        _legacy_run(control, duration)
+        results["legacy loop"].append((control.pump_on_seconds - duration) * 1000)
+    return results
+
+
+def _report(name, values, unit):
+    print(
+        f"{name}: n={len(values)} min={min(values):.3f}{unit} "
+        f"median={statistics.median(values):.3f}{unit} max={max(values):.3f}{unit}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--duration", type=int, default=5)
+    parser.add_argument("--actuation", type=float, default=0.2)
+    parser.add_argument("--read-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    _report("cutoff latency", bench_cutoff(args.runs), "ms")
+    drift = bench_drift(
+        max(1, args.runs // 10), args.duration, args.actuation, args.read_latency
+    )
+    for name, values in drift.items():
+        _report(f"open time gap ({name})", values, "ms")
+
+
+if __name__ == "__main__":
+    main()
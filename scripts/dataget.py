@@ -121,21 +121,26 @@ def upsert_weather_data(
             updated_at    = NOW()
     """
 
+    params = []
+    for d in target_dates:
+        if d not in daily_data:
+            print(f"[WARN] No data from Open-Meteo for {d}, skipping.")
+            continue
+        record = daily_data[d]
+        params.append(
+            (d, record["min_temp"], record["max_temp"], record["precipitation"])
+        )
+    if not params:
+        return
+
+    # executemany regroupe les lignes en un seul INSERT multi-VALUES ;
+    # ON DUPLICATE KEY s'appuie sur l'index unique weather_data.date.
     with conn.cursor() as cur:
-        for d in target_dates:
-            if d not in daily_data:
-                print(f"[WARN] No data from Open-Meteo for {d}, skipping.")
-                continue
-            record = daily_data[d]
-            cur.execute(
-                query,
-                (
-                    d,
-                    record["min_temp"],
-                    record["max_temp"],
-                    record["precipitation"],
-                ),
-            )
+        cur.executemany(query, params)
+        # Même transaction : invalide les réponses en cache de l'historique.
+        cur.execute(
+            "UPDATE history_version SET version = version + 1 WHERE id = 1"
+        )
     conn.commit()
 
 
@@ -0,0 +1,41 @@
+"""Rétention des tables qui grossissent sans fin.
+
+   - tasks : les tâches de plus de TASK_RETENTION_DAYS jours passent dans
+     tasks_archive, par lots de RETENTION_BATCH_SIZE (les lectures de
+     db_tasks et l'historique, tiré de daily_watering_stats, les voient
+     toujours) ;
+   - forecast_data : suppression des jours passés ;
+   puis OPTIMIZE TABLE / VACUUM si des lignes ont été retirées
+   (RETENTION_OPTIMIZE=0 pour l'éviter).
+
+   Usage: python scripts/retention.py"""
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+for path in (ROOT_DIR, SRC_DIR):
+    path_str = str(path)
+    if path_str not in sys.path and path.exists():
+        sys.path.insert(0, path_str)
+
+import config.config as local_config  # noqa: E402
+from db.db_retention import run_retention  # noqa: E402
+
+
+def main():
+    counts = run_retention(
+        datetime.now(timezone.utc),
+        local_config.TASK_RETENTION_DAYS,
+        local_config.RETENTION_BATCH_SIZE,
+        local_config.RETENTION_OPTIMIZE,
+    )
+    print(
+        f"retention: {counts['tasks']} task(s) archived, "
+        f"{counts['forecast_data']} forecast day(s) deleted."
+    )
+
+
+if __name__ == "__main__":
+    main()
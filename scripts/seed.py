@@ -3,9 +3,10 @@ import random
 from datetime import datetime, timedelta
 import uuid
 from db.db_tasks import add_task
-from db.db_weather_data import add_weather_data
+from db.db_weather_data import add_weather_data_many
 
 now = datetime.now()
+weather = {}
 
 # Remplir les 30 derniers jours
 for day_offset in range(30):
@@ -25,11 +26,14 @@ for day_offset in range(30):
         min_temp = random.uniform(10.0, 20.0)  # Température min entre 10 et 20 °C
         max_temp = random.uniform(20.0, 30.0)  # Température max entre 20 et 30 °C
         precipitation = random.uniform(0.0, 5.0)  # Précipitation entre 0 et 5 mm
-        add_weather_data(
-            day_dt.date(),
-            round(min_temp, 1),
-            round(max_temp, 1),
-            round(precipitation, 1),
-        )
+        weather[day_dt.date()] = {
+            "date": day_dt.date(),
+            "min_temp": round(min_temp, 1),
+            "max_temp": round(max_temp, 1),
+            "precipitation": round(precipitation, 1),
+        }
+
+# Un seul upsert pour toute la période
+add_weather_data_many(weather.values())
 
 print("✅ Fake data inserted.")
@@ -0,0 +1,218 @@
+"""Rejoue une saison d'arrosage en temps simulé.
+
+   Les arrosages du matin et du soir (comme scripts/cron.py) passent par
+   WateringPolicy, WateringTaskManager et WateringRuntime, sur une cuve
+   virtuelle remplie par la pluie. Les tâches sont écrites dans une base
+   SQLite jetable. La météo vient de la table weather_data de la base
+   configurée (--synthetic : météo générée, reproductible).
+
+   Le rapport donne le débit de la simulation et la consommation d'eau ;
+   avec --json, il sert de benchmark de non-régression de l'ordonnancement.
+
+   Usage: python scripts/simulate_season.py [--start 2025-05-01]
+          [--end 2025-09-30] [--synthetic] [--database PATH] [--json]"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT_DIR / "src"
+for path in (ROOT_DIR, SRC_DIR):
+    path_str = str(path)
+    if path_str not in sys.path and path.exists():
+        sys.path.insert(0, path_str)
+
+os.environ.setdefault("FLASK_ENV", "development")
+
+import config.config as local_config  # noqa: E402
+
+SOURCE_DATABASE_URL = local_config.SQLALCHEMY_DATABASE_URL
+PERIODS = (("morning", 7), ("evening", 20))
+
+
+def synthetic_weather(start, end, seed=42):
+    """Été tempéré : maximales autour de 24 °C, une averse tous les 4 jours."""
+    rng = random.Random(seed)
+    days = []
+    day = start
+    while day <= end:
+        season = math.sin(math.pi * (day.timetuple().tm_yday - 80) / 365)
+        max_temp = 14 + 14 * season + rng.gauss(0, 3)
+        rain = rng.expovariate(1 / 6) if rng.random() < 0.25 else 0.0
+        days.append((day, max_temp - 9 - rng.random() * 3, max_temp, round(rain, 1)))
+        day += timedelta(days=1)
+    return days
+
+
+def historical_weather(start, end):
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    from db.models import WeatherData
+
+    engine = create_engine(SOURCE_DATABASE_URL, future=True)
+    with Session(engine) as session:
+        rows = session.scalars(
+            select(WeatherData)
+            .where(WeatherData.date >= start, WeatherData.date <= end)
+            .order_by(WeatherData.date)
+        ).all()
+        return [
+            (row.date, row.min_temp, row.max_temp, row.precipitation) for row in rows
+        ]
+
+
+def _load_config():
+    # Pas de création de config.json par effet de bord
+    if os.path.exists(local_config.CONFIG_FILE):
+        return local_config.load_config()
+    return local_config.DEFAULT_CONFIG
+
+
+def simulate(weather, tank_options):
+    from application.watering.runtime import WateringRuntime
+    from application.watering.scheduler import RuntimeScheduler
+    from domain.shared.clock import SimulatedClock
+    from domain.shared.exceptions import DomainError
+    from domain.watering.policies import WateringPolicy
+    from domain.watering.services import WateringTaskManager
+    from infrastructure.devices.controllers import DeviceTankLevelSensor
+    from infrastructure.devices.simulated import (
+        SimulatedDeviceController,
+        SimulatedTank,
+    )
+    from infrastructure.persistence.watering_task_repository import (
+        SqlAlchemyWateringTaskRepository,
+    )
+
+    config = _load_config()
+    policy = WateringPolicy(
+        config.get("enabled_months", list(range(1, 13))),
+        config.get("watering", {}),
+        float(config.get("min_temperature", 5.0)),
+    )
+
+    first_day = weather[0][0]
+    clock = SimulatedClock(datetime(first_day.year, first_day.month, first_day.day))
+    scheduler = RuntimeScheduler(clock=clock.monotonic, threaded=False)
+    tank = SimulatedTank(**tank_options)
+    controller = SimulatedDeviceController(tank, clock, scheduler)
+    repository = SqlAlchemyWateringTaskRepository(clock)
+    runtime = WateringRuntime(controller, repository, scheduler=scheduler, clock=clock)
+    manager = WateringTaskManager(repository, policy, DeviceTankLevelSensor(controller))
+
+    stats = Counter()
+
+    def step_to(target_monotonic):
+        while True:
+            stats["events"] += scheduler.run_pending()
+            deadline = scheduler.next_deadline()
+            if deadline is None or deadline > target_monotonic:
+                return
+            clock.advance(deadline - clock.monotonic())
+
+    def drain():
+        while runtime.active_task_ids():
+            stats["events"] += scheduler.run_pending()
+            deadline = scheduler.next_deadline()
+            if deadline is None:
+                break
+            clock.advance(deadline - clock.monotonic())
+
+    started = time.perf_counter()
+    for day, min_temp, max_temp, precipitation in weather:
+        tank.rain(precipitation)
+        for period, hour in PERIODS:
+            moment = datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+            step_to((moment - clock.now()).total_seconds() + clock.monotonic())
+            clock.set(moment)
+
+            try:
+                watering_type = policy.classify_temperature(max_temp)
+                duration = policy.duration_for_period(watering_type, period)
+                if duration <= 0:
+                    continue
+                task = manager.start_manual_watering(duration, clock.today(), min_temp)
+            except DomainError as exc:
+                stats[f"refused: {exc}"] += 1
+                continue
+            stats["started"] += 1
+            runtime.start(task)
+            drain()
+            stats[repository.get(task.id).status.value] += 1
+    wall = time.perf_counter() - started
+
+    simulated = clock.monotonic()
+    return {
+        "days": len(weather),
+        "wall_seconds": round(wall, 3),
+        "simulated_seconds_per_wall_second": round(simulated / wall) if wall else None,
+        "runs_per_second": round(stats["started"] / wall, 1) if wall else None,
+        "scheduler_events": stats["events"],
+        "runs": {
+            key: value
+            for key, value in sorted(stats.items())
+            if key not in ("events",)
+        },
+        "pump_minutes": round(controller.pump_seconds / 60, 1),
+        "water_used_litres": round(controller.water_used_litres, 1),
+        "rain_collected_litres": round(tank.rain_litres, 1),
+        "final_tank_litres": round(tank.litres, 1),
+    }
+
+
+def main():
+    today = date.today()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--start", type=date.fromisoformat, default=date(today.year, 5, 1)
+    )
+    parser.add_argument(
+        "--end", type=date.fromisoformat, default=date(today.year, 9, 30)
+    )
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", help="SQLite file (default: temporary)")
+    parser.add_argument("--capacity", type=float, default=1000.0, help="litres")
+    parser.add_argument("--flow", type=float, default=20.0, help="pump L/min")
+    parser.add_argument("--catchment", type=float, default=20.0, help="roof m²")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    # Base jetable : doit être fixée avant le premier import de db.database
+    database = args.database or os.path.join(tempfile.mkdtemp(), "simulation.db")
+    local_config.SQLALCHEMY_DATABASE_URL = f"sqlite:///{database}"
+
+    if args.synthetic:
+        weather = synthetic_weather(args.start, args.end, args.seed)
+    else:
+        weather = historical_weather(args.start, args.end)
+    if not weather:
+        sys.exit("No weather_data for this range (use --synthetic).")
+
+    report = simulate(
+        weather,
+        {
+            "capacity_litres": args.capacity,
+            "pump_flow_lpm": args.flow,
+            "catchment_m2": args.catchment,
+        },
+    )
+    report["database"] = database
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for key, value in report.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date
+from dataclasses import dataclass, field
 from typing import Callable, Dict
 import sys
 
 from application.weather.queries import WeatherQueries
+from domain.shared.clock import Clock, SystemClock
 from domain.watering.ports import DeviceController
 from domain.watering.services import WateringTaskManager
 
@@ -18,6 +18,7 @@ class StartManualWateringHandler:
     manager_factory: Callable[[], WateringTaskManager]
     runtime: WateringRuntime
     weather_queries: WeatherQueries
+    clock: Clock = field(default_factory=SystemClock)
 
     def handle(self, command: StartManualWateringCommand) -> Dict[str, str]:
         forecast_data = None
@@ -36,13 +37,13 @@ class StartManualWateringHandler:
                 forecast_data = None
 
         if forecast_data is None:
-            forecast_data, _ = self.weather_queries.daily_forecast(date.today())
+            forecast_data, _ = self.weather_queries.daily_forecast(self.clock.today())
 
         min_temp = float(forecast_data["temperature_2m_min"])
         manager = self.manager_factory()
         task = manager.start_manual_watering(
             command.duration_seconds,
-            date.today(),
+            self.clock.today(),
             min_temp,
         )
         self.runtime.start(task)
@@ -55,9 +56,10 @@ class StopWateringHandler:
     controller: DeviceController
 
     def handle(self, command: StopWateringCommand) -> Dict[str, str]:
+        # close_water ne bloque pas : la séquence pompe→vanne est confiée à
+        # l'acteur matériel et les demandes concurrentes sont fusionnées.
         cancelled_ids = self.runtime.stop_all()
+        self.controller.close_water()
         if cancelled_ids:
-            self.controller.close_water()
             return {"message": f"Task {cancelled_ids} terminated"}
-        self.controller.close_water()
         return {"error": "Water is already closed"}
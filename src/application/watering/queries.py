@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import base64
+import json
 from dataclasses import dataclass
-from typing import Callable, List, Optional
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
 
 from domain.watering.policies import WateringPolicy
 from domain.watering.ports import WateringTaskRepository
@@ -15,7 +18,11 @@ class CurrentTaskQuery:
 
 @dataclass(slots=True)
 class ListTasksQuery:
-    pass
+    limit: int = 50
+    cursor: Optional[str] = None
+    status: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
 
 
 @dataclass(slots=True)
@@ -23,6 +30,21 @@ class ClassifyWateringQuery:
     temperature: Optional[float]
 
 
+def encode_cursor(created_at: datetime, task_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), task_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Lève ValueError si le curseur n'a pas été produit par encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(task_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor}") from exc
+
+
 class WateringQueries:
     def __init__(
         self,
@@ -38,8 +60,21 @@ class WateringQueries:
             return None
         return task_to_dict(task)
 
-    def list_tasks(self) -> List[dict]:
-        return [task_to_dict(task) for task in self._repository.list_all()]
+    def list_tasks(
+        self, query: ListTasksQuery | None = None
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Une page de tâches et le curseur de la suivante (None en fin de liste)."""
+        query = query or ListTasksQuery()
+        after = decode_cursor(query.cursor) if query.cursor else None
+        # Une ligne de plus que demandé indique s'il existe une page suivante.
+        tasks = self._repository.list_page(
+            query.limit + 1, after, query.status, query.start, query.end
+        )
+        next_cursor = None
+        if len(tasks) > query.limit:
+            tasks = tasks[: query.limit]
+            next_cursor = encode_cursor(tasks[-1].created_at, tasks[-1].id)
+        return [task_to_dict(task) for task in tasks], next_cursor
 
     def classify_watering(self, temperature: Optional[float]) -> str:
         if temperature is None:
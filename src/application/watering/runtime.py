@@ -1,70 +1,269 @@
 from __future__ import annotations
 
+import logging
 import threading
-import time
-from typing import Dict
+from concurrent.futures import Future
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional
 
-from domain.watering.entities import TaskStatus, WateringTask
-from domain.watering.ports import DeviceController, WateringTaskRepository
+from domain.shared.clock import Clock, SystemClock
+from domain.watering.entities import TaskStatus, WaterState, WateringTask
+from domain.watering.ports import (
+    DeviceController,
+    RuntimeJournal,
+    WateringTaskRepository,
+)
+
+from .scheduler import RuntimeScheduler
+
+logger = logging.getLogger(__name__)
+
+# Relecture de secours du niveau, au cas où un front serait manqué.
+DEFAULT_LEVEL_CHECK_INTERVAL = 30.0
+DEFAULT_CHECKPOINT_INTERVAL = 15.0
+_CHECKPOINT_KEY = "#checkpoint"
+
+
+def _level_key(task_id: str) -> str:
+    return f"{task_id}#level"
+
+
+def _log_actuation_error(handle: Future) -> None:
+    if handle.exception() is not None:
+        logger.error("Unable to close water: %s", handle.exception())
 
 
 class WateringRuntime:
     def __init__(
-        self, controller: DeviceController, repository: WateringTaskRepository
+        self,
+        controller: DeviceController,
+        repository: WateringTaskRepository,
+        level_check_interval: float = DEFAULT_LEVEL_CHECK_INTERVAL,
+        scheduler: RuntimeScheduler | None = None,
+        journal: RuntimeJournal | None = None,
+        checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+        clock: Clock | None = None,
     ) -> None:
         self._controller = controller
         self._repository = repository
-        self._cancel_events: Dict[str, threading.Event] = {}
-
-    def start(self, task: WateringTask) -> None:
-        cancel_event = threading.Event()
-        self._cancel_events[task.id] = cancel_event
-        thread = threading.Thread(
-            target=self._run_task,
-            args=(task, cancel_event),
-            daemon=True,
-        )
-        thread.start()
+        self._level_check_interval = level_check_interval
+        self._clock = clock or SystemClock()
+        self._scheduler = scheduler or RuntimeScheduler(clock=self._clock.monotonic)
+        self._journal = journal
+        self._checkpoint_interval = checkpoint_interval
+        self._lock = threading.Lock()
+        self._active: Dict[str, WateringTask] = {}
+        # Secondes déjà arrosées avant une reprise après redémarrage.
+        self._offsets: Dict[str, float] = {}
+        controller.subscribe_level_changes(self._on_level_change)
+
+    def start(self, task: WateringTask, elapsed: float = 0) -> None:
+        with self._lock:
+            self._active[task.id] = task
+            self._offsets[task.id] = elapsed
+        if self._journal:
+            self._journal.record_start(task.id, task.duration, elapsed)
+            self._scheduler.schedule(
+                _CHECKPOINT_KEY, self._checkpoint_interval, self._checkpoint
+            )
+        self._scheduler.call_soon(lambda: self._begin(task))
+
+    def recover(self, grace: timedelta) -> List[str]:
+        """Reprend les arrosages interrompus par un arrêt du processus."""
+        if not self._journal:
+            return []
+        interrupted = self._journal.pending()
+
+        now = self._clock.now()
+        resumed: List[str] = []
+        for run in interrupted:
+            task = self._repository.get(run.task_id)
+            if not task or not task.is_active:
+                continue
+            if run.remaining > 0 and now - run.last_seen <= grace:
+                logger.info(
+                    "Resuming task %s for %.0fs", run.task_id, run.remaining
+                )
+                self.start(task, elapsed=run.elapsed)
+                resumed.append(task.id)
+            else:
+                self._repository.update_status(task.id, TaskStatus.CANCELED.value)
+        # Les reprises sont déjà rejournalisées (fsync) : un arrêt avant ou
+        # pendant le compactage ne perd aucune exécution en cours.
+        self._journal.compact()
+        return resumed
 
     def stop_all(self) -> list[str]:
-        cancelled: list[str] = []
-        for task_id, event in list(self._cancel_events.items()):
-            event.set()
-            cancelled.append(task_id)
+        with self._lock:
+            cancelled = list(self._active)
+            self._active.clear()
+            self._offsets.clear()
+        for task_id in cancelled:
+            self._scheduler.cancel(task_id)
+            self._scheduler.cancel(_level_key(task_id))
             self._repository.update_status(task_id, TaskStatus.CANCELED.value)
-            self._cancel_events.pop(task_id, None)
+            if self._journal:
+                self._journal.record_end(task_id, TaskStatus.CANCELED.value)
+        if cancelled:
+            self._close_water()
         return cancelled
 
-    def _run_task(self, task: WateringTask, cancel_event: threading.Event) -> None:
-        try:
-            interval = 1
-            elapsed = 0
-            self._controller.open_water()
-            while elapsed < task.duration:
-                if cancel_event.is_set():
-                    self._controller.close_water()
-                    self._repository.update_status(task.id, "canceled")
-                    return
-
-                if self._controller.get_level() * 25 <= 0:
-                    self._controller.close_water()
-                    self._repository.update_status(task.id, "canceled")
-                    return
-
-                time.sleep(interval)
-                elapsed += interval
-
-            self._controller.close_water()
-            self._repository.update_status(task.id, "completed")
-        except Exception as exc:  # pragma: no cover - defensive
-            self._controller.close_water()
-            self._repository.update_status(task.id, f"error: {exc}")
-        finally:
-            self._cancel_events.pop(task.id, None)
-
     def cancel_task(self, task_id: str) -> bool:
-        event = self._cancel_events.get(task_id)
-        if not event:
+        if not self.is_active(task_id):
+            return False
+        self._scheduler.call_soon(
+            lambda: self._finish(task_id, TaskStatus.CANCELED.value)
+        )
+        return True
+
+    def pause(self, task_id: str) -> bool:
+        if not self.is_active(task_id) or not self._scheduler.pause(task_id):
+            return False
+        self._scheduler.pause(_level_key(task_id))
+        self._close_water()
+        return True
+
+    def resume(self, task_id: str) -> bool:
+        if not self.is_active(task_id):
             return False
-        event.set()
+
+        reopening = self._controller.open_water()
+        self._when_done(reopening, lambda: self._reopened(task_id, reopening))
         return True
+
+    def extend(self, task_id: str, seconds: float) -> bool:
+        return self.is_active(task_id) and self._scheduler.extend(task_id, seconds)
+
+    def remaining(self, task_id: str) -> Optional[float]:
+        return self._scheduler.remaining(task_id)
+
+    def is_active(self, task_id: str) -> bool:
+        with self._lock:
+            return task_id in self._active
+
+    def active_task_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._active)
+
+    def _on_level_change(self, level: float) -> None:
+        # Cuve vide : on coupe immédiatement les tâches actives.
+        if level * 25 > 0:
+            return
+        self._scheduler.call_soon(self._cancel_all_for_dry_tank)
+
+    def _cancel_all_for_dry_tank(self) -> None:
+        with self._lock:
+            task_ids = list(self._active)
+        for task_id in task_ids:
+            self._finish(task_id, TaskStatus.CANCELED.value)
+
+    def _begin(self, task: WateringTask) -> None:
+        if not self.is_active(task.id):
+            return
+        try:
+            if self._controller.get_level() * 25 <= 0:
+                self._finish(task.id, TaskStatus.CANCELED.value, close=False)
+                return
+            opening = self._controller.open_water()
+        except Exception as exc:  # pragma: no cover - defensive
+            self._finish(task.id, f"error: {exc}")
+            return
+        self._when_done(opening, lambda: self._opened(task, opening))
+
+    def _opened(self, task: WateringTask, opening: Future) -> None:
+        # stop_all pendant l'ouverture : l'acteur a déjà annulé la séquence.
+        if not self.is_active(task.id):
+            return
+        error = opening.exception()
+        if error is not None:
+            self._finish(task.id, f"error: {error}")
+            return
+        if opening.result() != WaterState.OPEN:
+            # Une fermeture a interrompu la séquence avant le démarrage de la
+            # pompe : la vanne est déjà refermée.
+            logger.warning("Water not open for task %s", task.id)
+            self._finish(task.id, TaskStatus.CANCELED.value, close=False)
+            return
+
+        # L'échéance part du moment où la pompe tourne réellement.
+        with self._lock:
+            offset = self._offsets.get(task.id, 0)
+        self._scheduler.schedule(
+            task.id,
+            task.duration - offset,
+            lambda: self._finish(task.id, TaskStatus.COMPLETED.value),
+        )
+        self._schedule_level_check(task.id)
+
+    def _reopened(self, task_id: str, reopening: Future) -> None:
+        if not self.is_active(task_id):
+            return
+        error = reopening.exception()
+        if error is not None:
+            self._finish(task_id, f"error: {error}")
+            return
+        if reopening.result() != WaterState.OPEN:
+            # Reprise interrompue : les minuteries ne doivent pas tourner
+            # vanne fermée.
+            logger.warning("Water not reopened for task %s", task_id)
+            self._finish(task_id, TaskStatus.CANCELED.value, close=False)
+            return
+        self._scheduler.resume(task_id)
+        self._scheduler.resume(_level_key(task_id))
+
+    def _schedule_level_check(self, task_id: str) -> None:
+        self._scheduler.schedule(
+            _level_key(task_id),
+            self._level_check_interval,
+            lambda: self._check_level(task_id),
+        )
+
+    def _check_level(self, task_id: str) -> None:
+        if not self.is_active(task_id):
+            return
+        if self._controller.get_level() * 25 <= 0:
+            self._finish(task_id, TaskStatus.CANCELED.value)
+            return
+        self._schedule_level_check(task_id)
+
+    def _finish(self, task_id: str, status: str, close: bool = True) -> None:
+        with self._lock:
+            task = self._active.pop(task_id, None)
+            self._offsets.pop(task_id, None)
+        if task is None:
+            return
+        self._scheduler.cancel(task_id)
+        self._scheduler.cancel(_level_key(task_id))
+        if close:
+            self._close_water()
+        self._repository.update_status(task_id, status)
+        if self._journal:
+            self._journal.record_end(task_id, status)
+
+    def _checkpoint(self) -> None:
+        # Un seul enregistrement groupé pour toutes les tâches en cours.
+        progress: Dict[str, float] = {}
+        with self._lock:
+            tasks = list(self._active.values())
+            offsets = dict(self._offsets)
+        for task in tasks:
+            remaining = self._scheduler.remaining(task.id)
+            if remaining is None:
+                continue  # vanne pas encore ouverte
+            offset = offsets.get(task.id, 0)
+            progress[task.id] = offset + (task.duration - offset - remaining)
+        if progress:
+            self._journal.record_progress(progress)
+        if tasks:
+            self._scheduler.schedule(
+                _CHECKPOINT_KEY, self._checkpoint_interval, self._checkpoint
+            )
+
+    def _close_water(self) -> None:
+        closing = self._controller.close_water()
+        closing.add_done_callback(_log_actuation_error)
+
+    def _when_done(self, handle: Future, job: Callable[[], None]) -> None:
+        # Les séquences vanne/pompe se terminent sur le thread de l'acteur ;
+        # la suite est toujours exécutée par l'ordonnanceur.
+        handle.add_done_callback(lambda _: self._scheduler.call_soon(job))
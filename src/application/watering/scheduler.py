@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, eq=False)
+class _Timer:
+    key: str
+    callback: Callable[[], None]
+    deadline: Optional[float]  # None lorsque le minuteur est en pause
+    remaining: float
+    generation: int = 0
+
+
+class RuntimeScheduler:
+    """Single thread driving every runtime deadline from a monotonic heap.
+
+    Jobs submitted with ``call_soon`` and expired timers run one at a time on
+    the scheduler thread, so the number of threads does not depend on the
+    number of queued tasks. With ``threaded=False`` no thread is started and
+    the caller drives the scheduler with ``run_pending`` (simulated time).
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = "watering-scheduler",
+        threaded: bool = True,
+    ) -> None:
+        self._clock = clock
+        self._name = name
+        self._threaded = threaded
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, _Timer, int]] = []
+        self._timers: Dict[str, _Timer] = {}
+        self._jobs: Deque[Callable[[], None]] = deque()
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def start(self) -> None:
+        with self._cond:
+            self._ensure_thread()
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def call_soon(self, job: Callable[[], None]) -> None:
+        with self._cond:
+            self._jobs.append(job)
+            self._ensure_thread()
+            self._cond.notify()
+
+    def schedule(self, key: str, delay: float, callback: Callable[[], None]) -> float:
+        """(Re)arme le minuteur ``key`` pour dans ``delay`` secondes."""
+        with self._cond:
+            deadline = self._clock() + max(0.0, delay)
+            timer = _Timer(key, callback, deadline, max(0.0, delay))
+            self._timers[key] = timer
+            self._push(timer)
+            self._ensure_thread()
+            self._cond.notify()
+            return deadline
+
+    def cancel(self, key: str) -> bool:
+        with self._cond:
+            return self._timers.pop(key, None) is not None
+
+    def pause(self, key: str) -> bool:
+        with self._cond:
+            timer = self._timers.get(key)
+            if timer is None or timer.deadline is None:
+                return False
+            timer.remaining = max(0.0, timer.deadline - self._clock())
+            timer.deadline = None
+            timer.generation += 1
+            return True
+
+    def resume(self, key: str) -> bool:
+        with self._cond:
+            timer = self._timers.get(key)
+            if timer is None or timer.deadline is not None:
+                return False
+            timer.deadline = self._clock() + timer.remaining
+            timer.generation += 1
+            self._push(timer)
+            self._cond.notify()
+            return True
+
+    def extend(self, key: str, seconds: float) -> bool:
+        with self._cond:
+            timer = self._timers.get(key)
+            if timer is None:
+                return False
+            if timer.deadline is None:
+                timer.remaining = max(0.0, timer.remaining + seconds)
+                return True
+            timer.deadline += seconds
+            timer.generation += 1
+            self._push(timer)
+            self._cond.notify()
+            return True
+
+    def remaining(self, key: str) -> Optional[float]:
+        with self._cond:
+            timer = self._timers.get(key)
+            if timer is None:
+                return None
+            if timer.deadline is None:
+                return timer.remaining
+            return max(0.0, timer.deadline - self._clock())
+
+    def next_deadline(self) -> Optional[float]:
+        with self._cond:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self) -> int:
+        """Exécute les travaux et minuteurs échus sur le thread appelant."""
+        executed = 0
+        while True:
+            with self._cond:
+                job = self._pop_ready()
+            if job is None:
+                return executed
+            self._run(job)
+            executed += 1
+
+    def _push(self, timer: _Timer) -> None:
+        heapq.heappush(
+            self._heap, (timer.deadline, next(self._seq), timer, timer.generation)
+        )
+
+    def _ensure_thread(self) -> None:
+        if not self._threaded:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+        self._thread.start()
+
+    def _drop_stale(self) -> None:
+        # Les entrées annulées, en pause ou replanifiées restent dans le tas
+        # et sont ignorées paresseusement.
+        while self._heap:
+            _, _, timer, generation = self._heap[0]
+            if (
+                self._timers.get(timer.key) is timer
+                and timer.generation == generation
+                and timer.deadline is not None
+            ):
+                return
+            heapq.heappop(self._heap)
+
+    def _pop_ready(self) -> Optional[Callable[[], None]]:
+        if self._jobs:
+            return self._jobs.popleft()
+        self._drop_stale()
+        if self._heap and self._heap[0][0] <= self._clock():
+            _, _, timer, _ = heapq.heappop(self._heap)
+            del self._timers[timer.key]
+            return timer.callback
+        return None
+
+    def _next_job(self) -> Optional[Callable[[], None]]:
+        with self._cond:
+            while not self._stopped:
+                job = self._pop_ready()
+                if job is not None:
+                    return job
+                timeout = None
+                if self._heap:
+                    timeout = self._heap[0][0] - self._clock()
+                self._cond.wait(timeout)
+            return None
+
+    def _loop(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job: Callable[[], None]) -> None:
+        try:
+            job()
+        except Exception:  # pragma: no cover - defensive
+            logger.exception("Scheduled job failed")
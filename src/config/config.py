@@ -40,6 +40,68 @@ SQLALCHEMY_DATABASE_URL = os.getenv(
 print(f"Using database : {SQLALCHEMY_DATABASE_URL.split('/')[3]}")
 SQL_ECHO = os.getenv("SQL_ECHO", "0") == "1"
 
+# Echantillonnage du niveau de la cuve (secondes / nombre d'echantillons)
+LEVEL_SAMPLE_INTERVAL = float(os.getenv("LEVEL_SAMPLE_INTERVAL", "5"))
+LEVEL_MAX_STALENESS = float(os.getenv("LEVEL_MAX_STALENESS", "10"))
+LEVEL_HISTORY_SIZE = int(os.getenv("LEVEL_HISTORY_SIZE", "720"))
+
+# Historique du niveau de la cuve (table tank_level_samples) : ecriture par lots
+# toutes les TANK_LEVEL_FLUSH_INTERVAL secondes, puis agregats 1 min / 1 h
+TANK_LEVEL_RECORDING = os.getenv("TANK_LEVEL_RECORDING", "1") == "1"
+TANK_LEVEL_FLUSH_INTERVAL = float(os.getenv("TANK_LEVEL_FLUSH_INTERVAL", "60"))
+TANK_LEVEL_RAW_RETENTION_HOURS = int(os.getenv("TANK_LEVEL_RAW_RETENTION_HOURS", "48"))
+TANK_LEVEL_MINUTE_RETENTION_DAYS = int(
+    os.getenv("TANK_LEVEL_MINUTE_RETENTION_DAYS", "30")
+)
+TANK_LEVEL_HOUR_RETENTION_DAYS = int(os.getenv("TANK_LEVEL_HOUR_RETENTION_DAYS", "730"))
+
+# Journal du runtime : reprise des arrosages interrompus par un redemarrage
+RUNTIME_JOURNAL_PATH = os.getenv("RUNTIME_JOURNAL_PATH", "runtime-journal.jsonl")
+RESUME_GRACE_SECONDS = int(os.getenv("RESUME_GRACE_SECONDS", "600"))
+JOURNAL_CHECKPOINT_INTERVAL = float(os.getenv("JOURNAL_CHECKPOINT_INTERVAL", "15"))
+# Progression mise sur disque (fsync) au plus tard toutes les N secondes : borne
+# le temps d'arrosage rejoue apres une coupure de courant
+JOURNAL_SYNC_INTERVAL = float(os.getenv("JOURNAL_SYNC_INTERVAL", "15"))
+
+# Taches gardees en memoire pour /api/task et /api/tasks/<id>
+TASK_READ_MODEL_SIZE = int(os.getenv("TASK_READ_MODEL_SIZE", "50"))
+
+# Pagination de /api/tasks
+TASKS_PAGE_SIZE = int(os.getenv("TASKS_PAGE_SIZE", "50"))
+TASKS_PAGE_SIZE_MAX = int(os.getenv("TASKS_PAGE_SIZE_MAX", "500"))
+
+# Cache de /api/history/series (secondes) : duree de vie en memoire des plages
+# incluant aujourd'hui et des autres, Cache-Control public des plages finies
+# depuis plus de HISTORY_CACHE_SETTLED_DAYS jours (les plus recentes sont
+# revalidees a chaque affichage, via l'ETag)
+HISTORY_CACHE_LIVE_TTL = float(os.getenv("HISTORY_CACHE_LIVE_TTL", "60"))
+HISTORY_CACHE_TTL = float(os.getenv("HISTORY_CACHE_TTL", "3600"))
+HISTORY_CACHE_MAX_AGE = int(os.getenv("HISTORY_CACHE_MAX_AGE", "3600"))
+HISTORY_CACHE_SETTLED_DAYS = int(os.getenv("HISTORY_CACHE_SETTLED_DAYS", "2"))
+
+# Appels Open-Meteo : delai de connexion et de lecture par point d'appel
+# (secondes), nombre de reprises (erreur reseau, 429, 5xx) et delai de base
+OPEN_METEO_CONNECT_TIMEOUT = float(os.getenv("OPEN_METEO_CONNECT_TIMEOUT", "3.05"))
+OPEN_METEO_DAILY_TIMEOUT = float(os.getenv("OPEN_METEO_DAILY_TIMEOUT", "5"))
+OPEN_METEO_FORECAST_TIMEOUT = float(os.getenv("OPEN_METEO_FORECAST_TIMEOUT", "15"))
+OPEN_METEO_RETRIES = int(os.getenv("OPEN_METEO_RETRIES", "2"))
+OPEN_METEO_BACKOFF = float(os.getenv("OPEN_METEO_BACKOFF", "0.5"))
+
+# Cache memoire des previsions devant la base : duree de vie (secondes) et
+# nombre d'entrees
+FORECAST_L1_TTL = float(os.getenv("FORECAST_L1_TTL", "60"))
+FORECAST_L1_SIZE = int(os.getenv("FORECAST_L1_SIZE", "32"))
+
+# Retention (scripts/retention.py) : taches terminees depuis plus de
+# TASK_RETENTION_DAYS jours deplacees dans tasks_archive (0 = jamais), par lots
+TASK_RETENTION_DAYS = int(os.getenv("TASK_RETENTION_DAYS", "365"))
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+RETENTION_OPTIMIZE = os.getenv("RETENTION_OPTIMIZE", "1") == "1"
+
+# Socket du demon materiel : vide = runtime dans le processus web (1 worker)
+RUNTIME_SOCKET = os.getenv("RUNTIME_SOCKET", "")
+RUNTIME_SOCKET_TIMEOUT = float(os.getenv("RUNTIME_SOCKET_TIMEOUT", "5"))
+
 
 def load_version():
     try:
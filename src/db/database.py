@@ -1,5 +1,8 @@
+from contextvars import ContextVar
+from typing import Optional
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
 import config.config as local_config
 
 url = local_config.SQLALCHEMY_DATABASE_URL
@@ -22,7 +25,15 @@ class Base(DeclarativeBase):
     pass
 
 
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+# expire_on_commit=False : les objets restent lisibles après le commit, sans
+# nouvelle requête (les fonctions db_* les renvoient après fermeture).
+SessionLocal = sessionmaker(
+    bind=engine,
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False,
+    future=True,
+)
 
 if url.startswith("sqlite"):
     from db import models  # noqa: F401
@@ -30,6 +41,95 @@ if url.startswith("sqlite"):
     Base.metadata.create_all(bind=engine)
 
 
-# Helper Flask pour obtenir une session par requête si besoin
+_current_session: ContextVar[Optional[Session]] = ContextVar(
+    "db_unit_of_work", default=None
+)
+
+
+class _SharedSession:
+    """Vue de la session d'un UnitOfWork pour les fonctions db_*.
+
+    ``with`` ne la ferme pas et ``commit`` se contente d'un flush : la
+    transaction est validée une seule fois, à la fin du UnitOfWork.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+    def commit(self) -> None:
+        self._session.flush()
+
+    def close(self) -> None:
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class UnitOfWork:
+    """Une session et une transaction partagées par tous les appels db_*.
+
+    Utilisable en ``with`` ou via ``begin``/``end`` (requête Flask). Un
+    UnitOfWork imbriqué participe à la transaction englobante.
+    """
+
+    def __init__(self) -> None:
+        self._session: Optional[Session] = None
+        self._token = None
+
+    def begin(self) -> "UnitOfWork":
+        if _current_session.get() is None:
+            self._session = SessionLocal()
+            self._token = _current_session.set(self._session)
+        return self
+
+    def end(self, failed: bool = False) -> None:
+        if self._session is None:
+            return
+        try:
+            if failed:
+                self._session.rollback()
+            else:
+                self._session.commit()
+        finally:
+            _current_session.reset(self._token)
+            self._session.close()
+            self._session = None
+
+    def __enter__(self) -> "UnitOfWork":
+        return self.begin()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end(failed=exc_type is not None)
+        return False
+
+
+def unit_of_work() -> UnitOfWork:
+    return UnitOfWork()
+
+
+def commit_unit_of_work() -> None:
+    """Valide tout de suite la transaction du UnitOfWork courant.
+
+    À appeler avant un effet de bord irréversible (ouverture de la vanne,
+    projection en mémoire) qui dépend d'une écriture : celle-ci ne doit plus
+    pouvoir être annulée par la fin de la requête. Le UnitOfWork continue
+    dans une nouvelle transaction ; sans UnitOfWork, rien à faire.
+    """
+    session = _current_session.get()
+    if session is not None:
+        session.commit()
+
+
+# Session du UnitOfWork courant si elle existe, sinon une session dédiée
 def get_session():
+    session = _current_session.get()
+    if session is not None:
+        return _SharedSession(session)
     return SessionLocal()
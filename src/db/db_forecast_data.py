@@ -1,10 +1,26 @@
 from sqlalchemy.orm import Session
 
+import hashlib
+import json
+import logging
 from datetime import date as DateType, datetime
 from typing import List, Optional
 
+from sqlalchemy import delete, or_, select, update
+
 from db.database import get_session
 from db.models import ForecastData
+from db.upsert import upsert
+
+
+logger = logging.getLogger(__name__)
+
+# Colonnes prises en compte dans content_hash
+CONTENT_COLUMNS = [
+    c.name
+    for c in ForecastData.__table__.columns
+    if c.name not in ("id", "date", "content_hash", "created_at", "updated_at")
+]
 
 
 def get_connection() -> Session:
@@ -83,14 +99,63 @@ def from_dict_list(data: list[dict]) -> List[ForecastData]:
 
 
 def add_forecast_data(data: list[dict]) -> None:
-    objects = from_dict_list(data)
+    """Synchronise la table avec ``data``, jour par jour.
+
+    Seuls les jours dont le contenu a changé (content_hash) sont réécrits ;
+    les autres n'ont que leur updated_at avancé. Les jours passés ou absents
+    du lot sont supprimés en une requête.
+    """
+    today = DateType.today()
+    objects = [obj for obj in from_dict_list(data) if obj.date >= today]
+    for obj in objects:
+        obj.content_hash = content_hash(obj)
 
     with get_session() as s:
-        # Utilise un DELETE générique compatible avec SQLite/MySQL/PostgreSQL au lieu de
-        # TRUNCATE qui n'est pas supporté par SQLite.
-        s.query(ForecastData).delete(synchronize_session=False)
-        s.add_all(objects)
+        s.execute(
+            delete(ForecastData).where(
+                or_(
+                    ForecastData.date < today,
+                    ForecastData.date.not_in([obj.date for obj in objects]),
+                )
+            )
+        )
+        stored = dict(
+            s.execute(select(ForecastData.date, ForecastData.content_hash)).all()
+        )
+        changed, unchanged = [], []
+        for obj in objects:
+            same = stored.get(obj.date) == obj.content_hash
+            (unchanged if same else changed).append(obj)
+
+        if changed:
+            columns = [c.name for c in ForecastData.__table__.columns]
+            columns.remove("id")
+            upsert(
+                s,
+                ForecastData.__table__,
+                [{name: getattr(obj, name) for name in columns} for obj in changed],
+                keys=["date"],
+                # Un jour réécrit prend les horodatages du lot, created_at compris.
+                update_columns=[name for name in columns if name != "date"],
+            )
+        if unchanged:
+            s.execute(
+                update(ForecastData)
+                .where(ForecastData.date.in_([obj.date for obj in unchanged]))
+                .values(updated_at=max(obj.updated_at for obj in unchanged))
+            )
         s.commit()
+    logger.debug(
+        f"forecast refresh: {len(changed)} day(s) written, {len(unchanged)} unchanged"
+    )
+
+
+def content_hash(obj: ForecastData) -> str:
+    """Empreinte des valeurs prévues d'un jour, horodatages exclus."""
+    values = [getattr(obj, name) for name in CONTENT_COLUMNS]
+    return hashlib.sha1(
+        json.dumps(values, default=str, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
 
 
 def get_forecast():
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+from datetime import date as DateType, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import delete, select, text
+
+from db.database import engine, get_session
+from db.models import ForecastData, Task, TaskArchive
+from db.upsert import upsert
+
+logger = logging.getLogger(__name__)
+
+# Tables allégées par la rétention, à réorganiser ensuite
+PRUNED_TABLES = ("tasks", "forecast_data")
+
+
+def archive_tasks(
+    before: datetime, batch_size: int = 500, now: Optional[datetime] = None
+) -> int:
+    """Déplace dans tasks_archive les tâches créées avant ``before``.
+
+    Un lot de ``batch_size`` tâches par transaction : les verrous restent
+    courts et une interruption ne perd rien (l'archive est écrite par upsert,
+    la relance reprend où elle s'est arrêtée). La tâche en cours n'est jamais
+    archivée ; daily_watering_stats n'est pas modifiée.
+    """
+    archived_at = now or datetime.now(timezone.utc)
+    total = 0
+    while True:
+        with get_session() as s:
+            rows = s.execute(
+                select(
+                    Task.id,
+                    Task.status,
+                    Task.duration,
+                    Task.created_at,
+                    Task.updated_at,
+                )
+                .where(Task.created_at < before, Task.active_slot.is_(None))
+                .order_by(Task.created_at, Task.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            upsert(
+                s,
+                TaskArchive.__table__,
+                [{**row._asdict(), "archived_at": archived_at} for row in rows],
+                keys=["id"],
+            )
+            s.execute(delete(Task).where(Task.id.in_([row.id for row in rows])))
+            s.commit()
+        total += len(rows)
+        if len(rows) < batch_size:
+            break
+    return total
+
+
+def purge_forecast_data(before: DateType) -> int:
+    """Supprime les prévisions des jours antérieurs à ``before``."""
+    with get_session() as s:
+        result = s.execute(delete(ForecastData).where(ForecastData.date < before))
+        s.commit()
+    return result.rowcount or 0
+
+
+def optimize_tables(tables: Iterable[str] = PRUNED_TABLES) -> None:
+    """Rend au disque l'espace libéré (OPTIMIZE / VACUUM selon la base)."""
+    dialect = engine.dialect.name
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if dialect == "sqlite":
+            conn.execute(text("VACUUM"))
+            return
+        for table in tables:
+            if dialect == "postgresql":
+                conn.execute(text(f"VACUUM ANALYZE {table}"))
+            elif dialect in ("mysql", "mariadb"):
+                conn.execute(text(f"OPTIMIZE TABLE {table}")).all()
+            else:
+                logger.info("No table optimization for dialect %s", dialect)
+                return
+
+
+def run_retention(
+    now: datetime,
+    task_retention_days: int,
+    batch_size: int = 500,
+    optimize: bool = True,
+) -> Dict[str, int]:
+    """Applique la politique de rétention ; renvoie le nombre de lignes
+    retirées par table."""
+    counts = {"tasks": 0, "forecast_data": 0}
+    if task_retention_days > 0:
+        counts["tasks"] = archive_tasks(
+            now - timedelta(days=task_retention_days), batch_size, now
+        )
+    counts["forecast_data"] = purge_forecast_data(now.date())
+    if optimize and any(counts.values()):
+        optimize_tables()
+    return counts
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import calendar
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select
+
+from db.database import get_session
+from db.models import TankLevelSample
+from db.upsert import upsert
+
+RAW = "raw"
+# Résolution agrégée -> (source, durée du seau en secondes)
+ROLLUPS = {"1m": (RAW, 60), "1h": ("1m", 3600)}
+RESOLUTIONS = (RAW, *ROLLUPS)
+KEYS = ["resolution", "measured_at"]
+# Seaux déjà stockés recalculés à chaque passe, en plus du dernier : un
+# échantillon arrivé en retard (lot différé, correction d'horloge) y est
+# encore agrégé avant que la rétention ne supprime sa ligne brute.
+LATE_BUCKETS = 1
+
+
+def _utc(dt: datetime) -> datetime:
+    # Les DATETIME relus en base sont naïfs mais déjà en UTC.
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _floor(dt: datetime, step: int) -> datetime:
+    epoch = calendar.timegm(_utc(dt).utctimetuple())
+    return datetime.fromtimestamp(epoch - epoch % step, timezone.utc)
+
+
+def add_samples(samples: Iterable[Tuple[datetime, int]]) -> int:
+    """Insère des échantillons bruts (measured_at, niveau) en une requête."""
+    rows = [
+        {
+            "resolution": RAW,
+            "measured_at": _utc(measured_at),
+            "level": float(level),
+            "min_level": int(level),
+            "max_level": int(level),
+            "samples": 1,
+        }
+        for measured_at, level in samples
+    ]
+    with get_session() as s:
+        # Un échantillon déjà présent (relance après échec) n'est pas doublé.
+        count = upsert(s, TankLevelSample.__table__, rows, KEYS)
+        s.commit()
+    return count
+
+
+def downsample(now: datetime) -> Dict[str, int]:
+    """Agrège les seaux complets pas encore calculés (raw -> 1m -> 1h).
+
+    La reprise se fait ``LATE_BUCKETS`` seaux avant le dernier seau stocké,
+    réécrits par upsert : rien n'est gardé en mémoire entre deux appels.
+    Renvoie le nombre de seaux écrits par résolution.
+    """
+    written = {}
+    with get_session() as s:
+        for resolution, (source, step) in ROLLUPS.items():
+            last = s.scalar(
+                select(func.max(TankLevelSample.measured_at)).where(
+                    TankLevelSample.resolution == resolution
+                )
+            )
+            stmt = select(TankLevelSample).where(
+                TankLevelSample.resolution == source,
+                TankLevelSample.measured_at < _floor(now, step),
+            )
+            if last is not None:
+                since = _utc(last) - timedelta(seconds=step * LATE_BUCKETS)
+                stmt = stmt.where(TankLevelSample.measured_at >= since)
+            buckets: Dict[datetime, List[TankLevelSample]] = defaultdict(list)
+            for sample in s.scalars(stmt):
+                buckets[_floor(sample.measured_at, step)].append(sample)
+
+            rows = []
+            for start, samples in buckets.items():
+                count = sum(sample.samples for sample in samples)
+                rows.append(
+                    {
+                        "resolution": resolution,
+                        "measured_at": start,
+                        "level": sum(x.level * x.samples for x in samples) / count,
+                        "min_level": min(x.min_level for x in samples),
+                        "max_level": max(x.max_level for x in samples),
+                        "samples": count,
+                    }
+                )
+            upsert(s, TankLevelSample.__table__, rows, KEYS)
+            # L'agrégat 1h se calcule sur les lignes 1m écrites juste avant.
+            s.flush()
+            written[resolution] = len(rows)
+        s.commit()
+    return written
+
+
+def prune(now: datetime, retention: Dict[str, timedelta]) -> int:
+    """Supprime, par résolution, les lignes plus anciennes que la rétention."""
+    deleted = 0
+    with get_session() as s:
+        for resolution, keep in retention.items():
+            result = s.execute(
+                delete(TankLevelSample).where(
+                    TankLevelSample.resolution == resolution,
+                    TankLevelSample.measured_at < _utc(now) - keep,
+                )
+            )
+            deleted += result.rowcount or 0
+        s.commit()
+    return deleted
+
+
+def get_samples(
+    start: datetime,
+    end: datetime,
+    resolution: Optional[str] = None,
+) -> Tuple[str, List[TankLevelSample]]:
+    """Niveaux de ``[start, end)`` ; sans ``resolution``, la plus fine qui
+    reste sous ~1500 points (brut jusqu'à 2 h, 1m jusqu'à 24 h, 1h au-delà)."""
+    if resolution is None:
+        span = end - start
+        if span <= timedelta(hours=2):
+            resolution = RAW
+        elif span <= timedelta(days=1):
+            resolution = "1m"
+        else:
+            resolution = "1h"
+    with get_session() as s:
+        rows = s.scalars(
+            select(TankLevelSample)
+            .where(
+                TankLevelSample.resolution == resolution,
+                TankLevelSample.measured_at >= _utc(start),
+                TankLevelSample.measured_at < _utc(end),
+            )
+            .order_by(TankLevelSample.measured_at)
+        ).all()
+    return resolution, rows
@@ -1,13 +1,15 @@
 from __future__ import annotations
 import uuid
-from typing import Optional, Dict, List
+from typing import Iterator, Optional, Dict, List
 
-from sqlalchemy import select, update
+from sqlalchemy import and_, or_, select, union_all, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 
-from db.database import get_session
-from db.models import Task
+from db import db_watering_stats
+from db.database import SessionLocal, get_session
+from db.models import Task, TaskArchive
 from datetime import datetime, timezone
 
 
@@ -16,6 +18,17 @@ def get_connection() -> Session:
     return get_session()
 
 
+ACTIVE_STATUS = "in progress"
+
+
+class ActiveTaskExists(Exception):
+    """Une autre tâche "in progress" occupe déjà l'emplacement actif."""
+
+
+def _active_slot(status) -> Optional[int]:
+    return 1 if str(status) == ACTIVE_STATUS else None
+
+
 def _ensure_utc(dt: datetime) -> datetime:
     """Convertit un datetime (naïf ou aware) en UTC aware sans perte d'information."""
     if dt.tzinfo is None:
@@ -24,7 +37,12 @@ def _ensure_utc(dt: datetime) -> datetime:
 
 
 def add_task(duration, status, created_at=None) -> str:
-    """Insère une tâche et renvoie son id (UUID str)."""
+    """Insère une tâche et renvoie son id (UUID str).
+
+    Lève ActiveTaskExists si la tâche est "in progress" et qu'une autre l'est
+    déjà : la contrainte unique tranche entre insertions concurrentes. Dans un
+    UnitOfWork, la transaction englobante est alors annulée.
+    """
     task_id = str(uuid.uuid4())
     dt = _ensure_utc(created_at) if created_at else datetime.now(timezone.utc)
     with get_session() as s:
@@ -32,14 +50,28 @@ def add_task(duration, status, created_at=None) -> str:
             id=task_id,
             duration=int(duration),
             status=str(status),
+            active_slot=_active_slot(status),
             created_at=dt,
             updated_at=dt,
         )
         s.add(t)
-        s.commit()
+        db_watering_stats.apply_change(
+            s, None, db_watering_stats.TaskState(str(status), int(duration), dt, dt)
+        )
+        _commit_slot(s, status)
     return task_id
 
 
+def _commit_slot(s: Session, status) -> None:
+    try:
+        s.commit()
+    except IntegrityError:
+        s.rollback()
+        if _active_slot(status) is not None:
+            raise ActiveTaskExists() from None
+        raise
+
+
 def get_tasks_by_status(status):
     """Récupère les tâches par statut, triées par created_at décroissant."""
     with get_session() as s:
@@ -75,24 +107,131 @@ def get_tasks_by_status(status):
 #         return [{"date": r.date, "duration": round(r.duration / 60, 1)} for r in rows]
 
 
-def update_status(task_id, new_status) -> None:
+def update_status(task_id, new_status, updated_at=None) -> None:
+    dt = _ensure_utc(updated_at) if updated_at else datetime.now(timezone.utc)
     with get_session() as s:
+        # Verrou sur la ligne : l'agrégat journalier part de l'état lu ici
+        before = s.execute(
+            select(Task.status, Task.duration, Task.created_at, Task.updated_at)
+            .where(Task.id == str(task_id))
+            .with_for_update()
+        ).first()
         s.execute(
             update(Task)
             .where(Task.id == str(task_id))
-            .values(status=str(new_status), updated_at=datetime.now(timezone.utc))
+            .values(
+                status=str(new_status),
+                active_slot=_active_slot(new_status),
+                updated_at=dt,
+            )
         )
-        s.commit()
+        if before is not None:
+            before = db_watering_stats.TaskState(*before)
+            db_watering_stats.apply_change(
+                s, before, before._replace(status=str(new_status), updated_at=dt)
+            )
+        _commit_slot(s, new_status)
 
 
 def get_task(task_id) -> Optional[Dict]:
     with get_session() as s:
-        return s.get(Task, str(task_id))
+        return s.get(Task, str(task_id)) or s.get(TaskArchive, str(task_id))
+
+
+def _select_tasks(
+    model,
+    status: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    stmt = select(
+        model.id, model.status, model.duration, model.created_at, model.updated_at
+    )
+    if status is not None:
+        stmt = stmt.where(model.status == str(status))
+    if start is not None:
+        stmt = stmt.where(model.created_at >= _ensure_utc(start))
+    if end is not None:
+        stmt = stmt.where(model.created_at < _ensure_utc(end))
+    return stmt
+
+
+def _live_and_archived(build):
+    """UNION ALL de ``build(Task)`` et ``build(TaskArchive)``, en sous-requête.
+
+    Chaque branche est enveloppée : elle peut porter son ORDER BY / LIMIT.
+    """
+    return union_all(
+        *(select(build(model).subquery()) for model in (Task, TaskArchive))
+    ).subquery()
 
 
 def get_all_tasks() -> List[Dict]:
+    tasks = _live_and_archived(_select_tasks)
     with get_session() as s:
-        return s.scalars(select(Task).order_by(Task.created_at.desc())).all()
+        return s.execute(select(tasks).order_by(tasks.c.created_at.desc())).all()
+
+
+def get_tasks_page(
+    limit: int,
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[str] = None,
+    status: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Task]:
+    """Page de tâches par (created_at, id) décroissants, après le curseur.
+
+    LIMIT et WHERE sont appliqués en SQL, dans tasks puis dans tasks_archive :
+    le coût ne dépend pas de la taille de l'historique (index
+    ix_tasks_created_at_id / ix_tasks_status_created_at_id et leurs
+    équivalents sur l'archive).
+    """
+
+    def page(model):
+        stmt = _select_tasks(model, status, start, end)
+        if after_created_at is not None:
+            cursor_at = _ensure_utc(after_created_at)
+            stmt = stmt.where(
+                or_(
+                    model.created_at < cursor_at,
+                    and_(model.created_at == cursor_at, model.id < str(after_id)),
+                )
+            )
+        return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(
+            int(limit)
+        )
+
+    tasks = _live_and_archived(page)
+    stmt = (
+        select(tasks)
+        .order_by(tasks.c.created_at.desc(), tasks.c.id.desc())
+        .limit(int(limit))
+    )
+    with get_session() as s:
+        return s.execute(stmt).all()
+
+
+def iter_tasks(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    status: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Iterator[tuple]:
+    """Lignes (id, status, duration, created_at, updated_at) par created_at
+    croissant, lues par lots de ``batch_size`` (curseur côté serveur).
+
+    Tâches archivées comprises. Session dédiée, hors UnitOfWork : le
+    générateur peut être consommé après la fin de la requête HTTP.
+    """
+    tasks = _live_and_archived(lambda model: _select_tasks(model, status, start, end))
+    stmt = select(tasks).order_by(tasks.c.created_at, tasks.c.id)
+    with SessionLocal() as s:
+        yield from s.execute(stmt.execution_options(yield_per=batch_size))
+
+
+def get_recent_tasks(limit: int) -> List[Dict]:
+    return get_tasks_page(limit)
 
 
 # def get_tasks_summary_by_day():
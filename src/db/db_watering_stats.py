@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from datetime import date as DateType, datetime, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from db import history_cache
+from db.database import get_session
+from db.models import DailyWateringStats, Task, TaskArchive
+from db.upsert import upsert
+
+COUNTERS = (
+    "runs",
+    "completed_runs",
+    "total_seconds",
+    "actual_seconds",
+    "canceled_runs",
+    "error_runs",
+)
+
+
+class TaskState(NamedTuple):
+    status: str
+    duration: int
+    created_at: datetime
+    updated_at: datetime
+
+
+def _utc_naive(dt: datetime) -> datetime:
+    # Les DATETIME relus en base sont naïfs mais déjà en UTC.
+    if dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def contribution(state: TaskState) -> Counter:
+    """Part d'une tâche dans les compteurs de son jour."""
+    counters = Counter(runs=1)
+    status = str(state.status)
+    if status == "completed":
+        counters["completed_runs"] += 1
+        counters["total_seconds"] += int(state.duration)
+    elif status == "canceled":
+        counters["canceled_runs"] += 1
+    elif status.startswith("error"):
+        counters["error_runs"] += 1
+    else:
+        return counters
+    elapsed = _utc_naive(state.updated_at) - _utc_naive(state.created_at)
+    counters["actual_seconds"] += max(0, int(elapsed.total_seconds()))
+    return counters
+
+
+def apply_change(
+    s: Session, before: Optional[TaskState], after: Optional[TaskState]
+) -> None:
+    """Reporte le passage de ``before`` à ``after`` dans la table, dans la
+    transaction de l'appelant (compteurs incrémentés par upsert).
+
+    Un jour sans ligne n'a jamais compté ``before`` (tâche antérieure au
+    remplissage de la table) : rien n'y est soustrait ni ajouté, il reste à
+    la charge de rebuild_daily_stats plutôt que de passer en négatif.
+    """
+    deltas: Dict[DateType, Counter] = defaultdict(Counter)
+    if before is not None:
+        deltas[_utc_naive(before.created_at).date()].subtract(contribution(before))
+    if after is not None:
+        deltas[_utc_naive(after.created_at).date()].update(contribution(after))
+    if before is not None:
+        day = _utc_naive(before.created_at).date()
+        baseline = s.scalar(
+            select(DailyWateringStats.day).where(DailyWateringStats.day == day)
+        )
+        if baseline is None:
+            deltas.pop(day, None)
+
+    rows = [
+        {"day": day, **{name: delta.get(name, 0) for name in COUNTERS}}
+        for day, delta in deltas.items()
+        if any(delta.values())
+    ]
+    if rows:
+        history_cache.bump_version(s)
+    upsert(
+        s,
+        DailyWateringStats.__table__,
+        rows,
+        keys=["day"],
+        update_columns=COUNTERS,
+        increment=True,
+    )
+
+
+def get_daily_stats(start: DateType, end: DateType) -> List[DailyWateringStats]:
+    """Jours de ``start`` à ``end`` inclus ayant eu au moins une tâche."""
+    with get_session() as s:
+        return s.scalars(
+            select(DailyWateringStats)
+            .where(DailyWateringStats.day >= start, DailyWateringStats.day <= end)
+            .order_by(DailyWateringStats.day)
+        ).all()
+
+
+def rebuild_daily_stats(batch_size: int = 1000) -> int:
+    """Recalcule toute la table depuis tasks et tasks_archive. Renvoie le
+    nombre de jours."""
+    totals: Dict[DateType, Counter] = defaultdict(Counter)
+    with get_session() as s:
+        for model in (Task, TaskArchive):
+            rows = s.execute(
+                select(model.status, model.duration, model.created_at, model.updated_at)
+                .execution_options(yield_per=batch_size)
+            )
+            for row in rows:
+                state = TaskState(*row)
+                totals[_utc_naive(state.created_at).date()].update(contribution(state))
+
+        s.execute(delete(DailyWateringStats))
+        history_cache.bump_version(s)
+        upsert(
+            s,
+            DailyWateringStats.__table__,
+            [
+                {"day": day, **{name: counters.get(name, 0) for name in COUNTERS}}
+                for day, counters in sorted(totals.items())
+            ],
+            keys=["day"],
+        )
+        s.commit()
+    return len(totals)
@@ -1,11 +1,13 @@
 from sqlalchemy.orm import Session
 
 from datetime import date as DateType, datetime, timezone
-from typing import Optional, Union
+from typing import Iterable, Iterator, Mapping, Optional, Union
 
-from db.database import get_session
+from db import history_cache
+from db.database import SessionLocal, get_session
 from db.models import WeatherData
-from sqlalchemy import text
+from db.upsert import upsert
+from sqlalchemy import select, text
 import logging
 
 
@@ -22,33 +24,73 @@ def add_weather_data(
 ) -> int:
     """Insère ou met à jour les données météo pour une date donnée. Renvoie l'id de la ligne."""
     logger.debug(f"insert weather data at {date}")
-    if isinstance(date, str):
-        date = datetime.strptime(date, "%Y-%m-%d").date()
+    date = _as_date(date)
     with get_session() as s:
-        record = s.query(WeatherData).filter(WeatherData.date == date).first()
-        now_utc = _utc_now()
-        if record:
-            record.min_temp = min_temp
-            record.max_temp = max_temp
-            record.precipitation = precipitation
-            record.updated_at = now_utc
-        else:
-            record = WeatherData(
-                date=date,
-                min_temp=min_temp,
-                max_temp=max_temp,
-                precipitation=precipitation,
-                created_at=now_utc,
-                updated_at=now_utc,
-            )
-            s.add(record)
+        _upsert(
+            s,
+            [
+                {
+                    "date": date,
+                    "min_temp": min_temp,
+                    "max_temp": max_temp,
+                    "precipitation": precipitation,
+                }
+            ],
+        )
         s.commit()
-        s.refresh(record)
+        # populate_existing : l'upsert ne passe pas par la map d'identité
+        record = s.scalars(
+            select(WeatherData)
+            .where(WeatherData.date == date)
+            .execution_options(populate_existing=True)
+        ).one()
         return record.id
 
 
+def add_weather_data_many(rows: Iterable[Mapping]) -> int:
+    """Upsert d'une série de jours (clés date, min_temp, max_temp, precipitation).
+
+    Une seule requête par bloc de db.upsert.CHUNK_SIZE jours. Renvoie le
+    nombre de jours écrits.
+    """
+    with get_session() as s:
+        count = _upsert(
+            s,
+            [
+                {
+                    "date": _as_date(row["date"]),
+                    "min_temp": row["min_temp"],
+                    "max_temp": row["max_temp"],
+                    "precipitation": row["precipitation"],
+                }
+                for row in rows
+            ],
+        )
+        s.commit()
+    logger.debug(f"upserted {count} weather data rows")
+    return count
+
+
+def _upsert(s: Session, rows: list[dict]) -> int:
+    now_utc = _utc_now()
+    for row in rows:
+        row["created_at"] = now_utc
+        row["updated_at"] = now_utc
+    if rows:
+        history_cache.bump_version(s)
+    # created_at conserve la date de première insertion
+    return upsert(
+        s,
+        WeatherData.__table__,
+        rows,
+        keys=["date"],
+        update_columns=["min_temp", "max_temp", "precipitation", "updated_at"],
+    )
+
+
 def delete_weather_data_by_date(date: DateType) -> None:
     with get_session() as s:
+        history_cache.bump_version(s)
         s.execute(text("DELETE FROM weather_data WHERE date = :date"), {"date": date})
         s.commit()
 
@@ -65,5 +107,40 @@ def get_weather_data_by_date(date: DateType) -> Optional[WeatherData]:
         return s.query(WeatherData).filter(WeatherData.date == date).first()
 
 
+def iter_weather_data(
+    start: Optional[DateType] = None,
+    end: Optional[DateType] = None,
+    batch_size: int = 1000,
+) -> Iterator[tuple]:
+    """Lignes (date, min_temp, max_temp, precipitation, created_at, updated_at)
+    de ``start`` à ``end`` inclus, lues par lots (curseur côté serveur).
+
+    Session dédiée, hors UnitOfWork : voir db_tasks.iter_tasks.
+    """
+    stmt = select(
+        WeatherData.date,
+        WeatherData.min_temp,
+        WeatherData.max_temp,
+        WeatherData.precipitation,
+        WeatherData.created_at,
+        WeatherData.updated_at,
+    )
+    if start is not None:
+        stmt = stmt.where(WeatherData.date >= start)
+    if end is not None:
+        stmt = stmt.where(WeatherData.date <= end)
+    stmt = stmt.order_by(WeatherData.date)
+    with SessionLocal() as s:
+        yield from s.execute(stmt.execution_options(yield_per=batch_size))
+
+
+def _as_date(value: Union[DateType, str]) -> DateType:
+    if isinstance(value, str):
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
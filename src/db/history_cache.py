@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date as DateType
+from typing import Callable, Optional, Tuple
+
+from sqlalchemy import select
+
+import config.config as local_config
+from db.models import HistoryVersion
+from db.upsert import upsert
+
+HistoryKey = Tuple[DateType, DateType, str]
+
+_VERSION_ID = 1
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryEntry:
+    body: str
+    etag: str
+    expires_at: float
+
+
+class HistoryCache:
+    """Réponses de /api/history/series par (start, end, bucket).
+
+    Chaque entrée porte l'ETag tiré du compteur ``history_version`` : la
+    route ne la sert que si ce compteur n'a pas bougé, y compris après une
+    écriture d'un autre processus (démon, autres workers,
+    scripts/dataget.py). Une plage incluant aujourd'hui expire après
+    ``live_ttl`` secondes, les autres après ``ttl``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        live_ttl: float = 60.0,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._live_ttl = live_ttl
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[HistoryKey, HistoryEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: HistoryKey) -> Optional[HistoryEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: HistoryKey, body: str, etag: str, live: bool) -> HistoryEntry:
+        expires_at = self._clock() + (self._live_ttl if live else self._ttl)
+        entry = HistoryEntry(body=body, etag=etag, expires_at=expires_at)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+history_cache = HistoryCache(
+    live_ttl=local_config.HISTORY_CACHE_LIVE_TTL,
+    ttl=local_config.HISTORY_CACHE_TTL,
+)
+
+
+def range_etag(key: HistoryKey, version: int) -> str:
+    """ETag d'une plage : sa clé et la version des données en base."""
+    return hashlib.sha1(repr((key, version)).encode("utf-8")).hexdigest()
+
+
+def current_version(session) -> int:
+    """Version courante des données de l'historique (une lecture par clé)."""
+    version = session.scalar(
+        select(HistoryVersion.version).where(HistoryVersion.id == _VERSION_ID)
+    )
+    return version or 0
+
+
+def bump_version(session) -> None:
+    """Incrémente la version dans la transaction de l'écriture : les
+    lecteurs ne la voient changer qu'une fois celle-ci validée."""
+    upsert(
+        session,
+        HistoryVersion.__table__,
+        [{"id": _VERSION_ID, "version": 1}],
+        keys=["id"],
+        increment=True,
+    )
@@ -3,7 +3,16 @@ from __future__ import annotations
 
 from datetime import datetime, date
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, Integer, Float, Date, DateTime, func
+from sqlalchemy import (
+    String,
+    Integer,
+    SmallInteger,
+    Float,
+    Date,
+    DateTime,
+    Index,
+    func,
+)
 
 from db.database import Base
 
@@ -14,7 +23,9 @@ class WeatherData(Base):
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True, index=True
     )
-    date: Mapped[date] = mapped_column(Date, nullable=False, index=True)  # date UTC
+    date: Mapped[date] = mapped_column(
+        Date, nullable=False, index=True, unique=True
+    )  # date UTC
     min_temp: Mapped[float] = mapped_column(Float, nullable=False)  # en °C
     max_temp: Mapped[float] = mapped_column(Float, nullable=False)  # en °C
     precipitation: Mapped[float] = mapped_column(Float, nullable=False)  # en mm
@@ -74,6 +85,8 @@ class ForecastData(Base):
     evening_temp_avg: Mapped[float | None] = mapped_column(Float)
 
     # Métadonnées
+    # sha1 des valeurs prévues : seuls les jours modifiés sont réécrits
+    content_hash: Mapped[str | None] = mapped_column(String(40))
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), nullable=False, index=True
     )
@@ -91,12 +104,21 @@ class ForecastData(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Pagination par curseur (created_at, id), avec ou sans filtre de statut
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        # Une seule ligne peut occuper l'emplacement actif (NULL sinon)
+        Index("uq_tasks_active_slot", "active_slot", unique=True),
+    )
 
     id: Mapped[str] = mapped_column(
         String(64), primary_key=True, index=True
     )  # UUID4 hex
     status: Mapped[str] = mapped_column(String(20), index=True)
     duration: Mapped[int] = mapped_column(Integer)  # en secondes
+    # 1 tant que la tâche est "in progress", NULL ensuite
+    active_slot: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -112,3 +134,80 @@ class Task(Base):
         nullable=False,
         index=True,
     )
+
+
+class TaskArchive(Base):
+    """Tâches terminées sorties de ``tasks`` par la rétention (db_retention).
+
+    Mêmes colonnes que ``tasks`` (sans l'emplacement actif) : les lectures de
+    db_tasks parcourent les deux tables.
+    """
+
+    __tablename__ = "tasks_archive"
+    __table_args__ = (
+        Index("ix_tasks_archive_created_at_id", "created_at", "id"),
+        Index("ix_tasks_archive_status_created_at_id", "status", "created_at", "id"),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20))
+    duration: Mapped[int] = mapped_column(Integer)  # en secondes
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+class DailyWateringStats(Base):
+    """Agrégat journalier des tâches (jour UTC de created_at).
+
+    Tenu à jour à chaque changement de statut par db_tasks ; reconstruit par
+    scripts/backfill_daily_stats.py.
+    """
+
+    __tablename__ = "daily_watering_stats"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    runs: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    completed_runs: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Durées demandées des arrosages terminés, en secondes
+    total_seconds: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Durées réelles (updated_at - created_at) des tâches finies, en secondes
+    actual_seconds: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    canceled_runs: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error_runs: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class TankLevelSample(Base):
+    """Niveau de la cuve (0 à 4 flotteurs immergés) par résolution.
+
+    ``raw`` : un échantillon du sampler ; ``1m`` / ``1h`` : agrégat du seau
+    commençant à ``measured_at`` (moyenne, min, max, nombre d'échantillons).
+    """
+
+    __tablename__ = "tank_level_samples"
+
+    resolution: Mapped[str] = mapped_column(String(4), primary_key=True)
+    measured_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True
+    )
+    level: Mapped[float] = mapped_column(Float, nullable=False)
+    min_level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    max_level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    samples: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
+
+
+class HistoryVersion(Base):
+    """Compteur unique incrémenté par chaque écriture de weather_data ou de
+    daily_watering_stats, dans la transaction de l'écriture : l'ETag de
+    /api/history/series en dérive, quel que soit le processus écrivain."""
+
+    __tablename__ = "history_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -0,0 +1,122 @@
+"""INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE selon le dialecte.
+
+Utilisable depuis l'application (Session), les scripts et les migrations
+Alembic (Connection) : seules une table SQLAlchemy et une connexion sont
+nécessaires.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, List, Mapping, Sequence
+
+from sqlalchemy import Table, and_, select, update
+
+# SQLite limite le nombre de paramètres par requête (32766 depuis 3.32)
+CHUNK_SIZE = 1000
+
+
+def upsert(
+    connection,
+    table: Table,
+    rows: Iterable[Mapping],
+    keys: Sequence[str],
+    update_columns: Sequence[str] | None = None,
+    increment: bool = False,
+) -> int:
+    """Insère ``rows`` ou met à jour les lignes existantes sur ``keys``.
+
+    ``keys`` doit correspondre à une contrainte unique (ou la clé primaire).
+    ``update_columns`` : colonnes réécrites en cas de conflit, par défaut
+    toutes les colonnes fournies hors ``keys`` ; avec ``increment``, leurs
+    valeurs s'ajoutent à celles de la ligne existante (compteurs). Renvoie
+    le nombre de lignes envoyées ; la transaction reste à la charge de
+    l'appelant.
+    """
+    rows = [dict(row) for row in rows]
+    if not rows:
+        return 0
+    if update_columns is None:
+        update_columns = [name for name in rows[0] if name not in keys]
+
+    dialect = _dialect_name(connection)
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start : start + CHUNK_SIZE]
+        if dialect in ("mysql", "mariadb", "sqlite", "postgresql"):
+            connection.execute(
+                _upsert_statement(
+                    dialect, table, chunk, keys, update_columns, increment
+                )
+            )
+        else:
+            _upsert_rows(connection, table, chunk, keys, update_columns, increment)
+    return len(rows)
+
+
+def _dialect_name(connection) -> str:
+    # Session (get_bind) ou Connection (dialect)
+    if hasattr(connection, "get_bind"):
+        return connection.get_bind().dialect.name
+    return connection.dialect.name
+
+
+def _upsert_statement(
+    dialect: str,
+    table: Table,
+    rows: List[dict],
+    keys: Sequence[str],
+    update_columns: Sequence[str],
+    increment: bool = False,
+):
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+
+        stmt = insert(table).values(rows)
+        if not update_columns:
+            # Équivalent d'un INSERT IGNORE limité aux doublons
+            return stmt.on_duplicate_key_update(
+                {name: table.c[name] for name in keys[:1]}
+            )
+        return stmt.on_duplicate_key_update(
+            _new_values(table, stmt.inserted, update_columns, increment)
+        )
+
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    stmt = insert(table).values(rows)
+    if not update_columns:
+        return stmt.on_conflict_do_nothing(index_elements=list(keys))
+    return stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_=_new_values(table, stmt.excluded, update_columns, increment),
+    )
+
+
+def _new_values(table: Table, proposed, update_columns, increment: bool) -> dict:
+    if increment:
+        return {name: table.c[name] + proposed[name] for name in update_columns}
+    return {name: proposed[name] for name in update_columns}
+
+
+def _upsert_rows(
+    connection,
+    table: Table,
+    rows: List[dict],
+    keys: Sequence[str],
+    update_columns: Sequence[str],
+    increment: bool = False,
+) -> None:
+    # Dialecte sans upsert natif : une requête par ligne.
+    for row in rows:
+        match = and_(*(table.c[name] == row[name] for name in keys))
+        exists = connection.execute(select(*table.primary_key).where(match)).first()
+        if exists is None:
+            connection.execute(table.insert().values(row))
+        elif update_columns:
+            values = {
+                name: (table.c[name] + row[name]) if increment else row[name]
+                for name in update_columns
+            }
+            connection.execute(update(table).where(match).values(values))
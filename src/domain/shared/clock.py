@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta, timezone
+
+
+class Clock(ABC):
+    @abstractmethod
+    def now(self) -> datetime:
+        """Horodatage UTC (aware)."""
+
+    @abstractmethod
+    def today(self) -> date: ...
+
+    @abstractmethod
+    def monotonic(self) -> float: ...
+
+
+class SystemClock(Clock):
+    def now(self) -> datetime:
+        return datetime.now(timezone.utc)
+
+    def today(self) -> date:
+        return date.today()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+class SimulatedClock(Clock):
+    """Clock that only moves when ``advance`` or ``set`` is called."""
+
+    def __init__(self, start: datetime) -> None:
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        self._start = start
+        self._elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def now(self) -> datetime:
+        with self._lock:
+            return self._start + timedelta(seconds=self._elapsed)
+
+    def today(self) -> date:
+        return self.now().date()
+
+    def monotonic(self) -> float:
+        with self._lock:
+            return self._elapsed
+
+    def advance(self, seconds: float) -> None:
+        with self._lock:
+            self._elapsed += max(0.0, seconds)
+
+    def set(self, moment: datetime) -> None:
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        with self._lock:
+            # Le temps simulé ne recule jamais.
+            self._elapsed = max(
+                self._elapsed, (moment - self._start).total_seconds()
+            )
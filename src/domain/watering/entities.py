@@ -13,6 +13,13 @@ class TaskStatus(str, Enum):
     ERROR = "error"
 
 
+class WaterState(str, Enum):
+    CLOSED = "closed"
+    OPENING = "opening"  # vanne ouverte, pompe en attente
+    OPEN = "open"
+    CLOSING = "closing"  # pompe arrêtée, vanne en attente
+
+
 @dataclass(slots=True)
 class WateringTask:
     id: str
@@ -22,20 +29,20 @@ class WateringTask:
     updated_at: datetime
     error: Optional[str] = field(default=None)
 
-    def mark_completed(self) -> None:
+    def mark_completed(self, now: Optional[datetime] = None) -> None:
         self.status = TaskStatus.COMPLETED
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now or datetime.now(timezone.utc)
         self.error = None
 
-    def mark_canceled(self) -> None:
+    def mark_canceled(self, now: Optional[datetime] = None) -> None:
         self.status = TaskStatus.CANCELED
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now or datetime.now(timezone.utc)
         self.error = None
 
-    def mark_error(self, message: str) -> None:
+    def mark_error(self, message: str, now: Optional[datetime] = None) -> None:
         self.status = TaskStatus.ERROR
         self.error = message
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at = now or datetime.now(timezone.utc)
 
     @property
     def is_active(self) -> bool:
@@ -49,3 +56,15 @@ class TankLevelSnapshot:
 
     def has_water(self) -> bool:
         return self.level_percent > 0
+
+
+@dataclass(slots=True)
+class InterruptedRun:
+    task_id: str
+    duration: int
+    elapsed: float
+    last_seen: datetime
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.duration - self.elapsed)
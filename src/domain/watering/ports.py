@@ -1,21 +1,25 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Iterable, List, Optional
+from typing import Callable, Iterable, List, Mapping, Optional, Tuple
 
-from domain.watering.entities import TankLevelSnapshot, WateringTask
+from domain.watering.entities import InterruptedRun, TankLevelSnapshot, WateringTask
 
 
 class DeviceController(ABC):
     @abstractmethod
     def setup(self) -> None: ...
 
+    # Les séquences vanne/pompe sont asynchrones : le Future se résout avec
+    # le WaterState atteint, qui n'est pas celui demandé si une fermeture a
+    # interrompu l'ouverture.
     @abstractmethod
-    def open_water(self) -> None: ...
+    def open_water(self) -> Future: ...
 
     @abstractmethod
-    def close_water(self) -> None: ...
+    def close_water(self) -> Future: ...
 
     @abstractmethod
     def get_level(self) -> float: ...
@@ -23,6 +27,12 @@ class DeviceController(ABC):
     @abstractmethod
     def debug_water_levels(self) -> Iterable[int]: ...
 
+    @abstractmethod
+    def level_history(self) -> List[TankLevelSnapshot]: ...
+
+    @abstractmethod
+    def subscribe_level_changes(self, callback: Callable[[float], None]) -> None: ...
+
     @abstractmethod
     def cleanup(self) -> None: ...
 
@@ -42,6 +52,30 @@ class WateringTaskRepository(ABC):
     @abstractmethod
     def list_all(self) -> List[WateringTask]: ...
 
+    def list_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+        status: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[WateringTask]:
+        """Tâches triées par (created_at, id) décroissants, après ``after``.
+
+        Implémentation générique en mémoire ; les dépôts SQL la remplacent.
+        """
+        tasks = sorted(
+            self.list_all(), key=lambda t: (t.created_at, t.id), reverse=True
+        )
+        return [
+            task
+            for task in tasks
+            if (after is None or (task.created_at, task.id) < after)
+            and (status is None or task.status.value == status)
+            and (start is None or task.created_at >= start)
+            and (end is None or task.created_at < end)
+        ][:limit]
+
     @abstractmethod
     def update_status(
         self, task_id: str, status: str, error: Optional[str] = None
@@ -51,3 +85,21 @@ class WateringTaskRepository(ABC):
 class TankLevelSensor(ABC):
     @abstractmethod
     def snapshot(self) -> TankLevelSnapshot: ...
+
+
+class RuntimeJournal(ABC):
+    @abstractmethod
+    def record_start(self, task_id: str, duration: int, elapsed: float = 0) -> None: ...
+
+    @abstractmethod
+    def record_progress(self, progress: Mapping[str, float]) -> None: ...
+
+    @abstractmethod
+    def record_end(self, task_id: str, status: str) -> None: ...
+
+    @abstractmethod
+    def pending(self) -> List[InterruptedRun]: ...
+
+    # Ne garde que les exécutions encore ouvertes dans ce processus.
+    @abstractmethod
+    def compact(self) -> None: ...
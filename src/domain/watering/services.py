@@ -27,6 +27,8 @@ class WateringTaskManager:
         if duration_seconds <= 0 or duration_seconds > self.max_manual_duration_seconds:
             raise DomainError("Invalid duration")
 
+        # Refus rapide ; l'insertion reste protégée par le dépôt (contrainte
+        # unique en base) contre les démarrages concurrents.
         active_task = self.repository.get_active_task()
         if active_task and active_task.is_active:
             raise DomainError("Watering is already in progress.")
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from datetime import date
-from typing import List, Mapping, Sequence
+from datetime import date, datetime
+from typing import List, Mapping, Sequence, Tuple
+
+from domain.weather.value_objects import parse_updated_at
 
 
 class ForecastProvider(ABC):
@@ -12,17 +14,31 @@ class ForecastProvider(ABC):
     @abstractmethod
     def fetch_partday_forecast(self, latitude: float, longitude: float) -> Mapping: ...
 
+    # Prévision du jour et prévisions par tranche ; à surcharger quand le
+    # fournisseur peut tout renvoyer en un seul appel.
+    def fetch_forecast(
+        self, latitude: float, longitude: float
+    ) -> Tuple[Mapping, List[Mapping]]:
+        return (
+            self.fetch_daily_forecast(latitude, longitude),
+            list(self.fetch_partday_forecast(latitude, longitude)),
+        )
+
 
 class ForecastCache(ABC):
     @abstractmethod
     def get_partday_forecast(self) -> List[Mapping]: ...
 
+    # Renvoie les entrées telles que stockées, ou None sans relecture.
     @abstractmethod
-    def store_partday_forecast(self, entries: Sequence[Mapping]) -> None: ...
+    def store_partday_forecast(
+        self, entries: Sequence[Mapping]
+    ) -> List[Mapping] | None: ...
 
     @abstractmethod
     def get_daily_forecast(self, target_date: date) -> Mapping | None: ...
 
+    # Renvoie l'entrée telle que stockée, sans relecture.
     @abstractmethod
     def store_daily_forecast(
         self,
@@ -30,4 +46,14 @@ class ForecastCache(ABC):
         min_temp: float,
         max_temp: float,
         precipitation: float,
-    ) -> None: ...
+    ) -> Mapping | None: ...
+
+    # Horodatages des derniers rafraîchissements ; un cache qui garde les
+    # entrées décodées les surcharge pour éviter de relire la chaîne.
+    def partday_updated_at(self) -> datetime | None:
+        entries = self.get_partday_forecast()
+        return parse_updated_at(entries[0].get("updated_at")) if entries else None
+
+    def daily_updated_at(self, target_date: date) -> datetime | None:
+        entry = self.get_daily_forecast(target_date)
+        return parse_updated_at(entry.get("updated_at")) if entry else None
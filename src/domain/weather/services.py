@@ -1,72 +1,136 @@
 from __future__ import annotations
 
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import date, datetime, timedelta, timezone
-from typing import List, Mapping, Sequence
+from typing import Callable, Dict, Hashable, List, Mapping
 
 from domain.weather.ports import ForecastCache, ForecastProvider
 
+logger = logging.getLogger(__name__)
+
 
 class ForecastService:
+    """Prévisions servies depuis le cache, rafraîchies en arrière-plan.
+
+    Une entrée expirée est renvoyée telle quelle pendant qu'un worker la
+    rafraîchit (stale-while-revalidate) ; seul un cache vide fait attendre
+    l'appelant. Les demandes simultanées d'une même clé partagent un seul
+    appel au fournisseur.
+    """
+
     def __init__(
         self,
         provider: ForecastProvider,
         cache: ForecastCache,
         ttl: timedelta = timedelta(minutes=30),
+        max_workers: int = 2,
     ) -> None:
         self._provider = provider
         self._cache = cache
         self._ttl = ttl
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="forecast-refresh"
+        )
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
 
     def get_partday_forecast(
         self, latitude: float, longitude: float
     ) -> tuple[List[Mapping], bool]:
         cached = self._cache.get_partday_forecast()
-        if cached and self._is_list_fresh(cached):
-            return cached, True
-
-        raw = list(self._provider.fetch_partday_forecast(latitude, longitude))
-        self._cache.store_partday_forecast(raw)
-        return raw, False
+        if not cached:
+            refresh = self._refresh_forecast(date.today(), latitude, longitude)
+            return refresh.result()[1], False
+        if not self._is_recent(self._cache.partday_updated_at()):
+            self._refresh_forecast(date.today(), latitude, longitude)
+        return cached, True
 
     def get_daily_minmax_precip(
         self, target_date: date, latitude: float, longitude: float
     ) -> tuple[Mapping, bool]:
         cached = self._cache.get_daily_forecast(target_date)
-        if cached and self._is_entry_fresh(cached):
-            return cached, True
-
-        raw = self._provider.fetch_daily_forecast(latitude, longitude)
-        self._cache.store_daily_forecast(
-            target_date,
-            raw["temperature_2m_min"],
-            raw["temperature_2m_max"],
-            raw["precipitation_sum"],
-        )
-        refreshed = self._cache.get_daily_forecast(target_date)
-        return (refreshed or raw), False
+        if not cached:
+            refresh = self._refresh_forecast(target_date, latitude, longitude)
+            return refresh.result()[0], False
+        if not self._is_recent(self._cache.daily_updated_at(target_date)):
+            self._refresh_forecast(target_date, latitude, longitude)
+        return cached, True
 
-    def _is_list_fresh(self, entries: Sequence[Mapping]) -> bool:
-        if not entries:
-            return False
-        updated_at = entries[0].get("updated_at")
-        return self._is_recent(updated_at)
+    def _refresh_forecast(
+        self, target_date: date, latitude: float, longitude: float
+    ) -> Future:
+        """Un seul appel au fournisseur remplit les prévisions du jour et par
+        tranche ; le futur donne ``(jour, tranches)``."""
 
-    def _is_entry_fresh(self, entry: Mapping) -> bool:
-        return self._is_recent(entry.get("updated_at"))
+        def refresh() -> tuple[Mapping, List[Mapping]]:
+            # Un rafraîchissement concurrent a pu se terminer entre la lecture
+            # du cache par l'appelant et l'enregistrement de ce futur : on
+            # relit le cache avant d'appeler le fournisseur.
+            cached_daily = self._cache.get_daily_forecast(target_date)
+            cached_partday = self._cache.get_partday_forecast()
+            if (
+                cached_daily
+                and cached_partday
+                and self._is_recent(self._cache.daily_updated_at(target_date))
+                and self._is_recent(self._cache.partday_updated_at())
+            ):
+                return cached_daily, cached_partday
+            daily, partday = self._provider.fetch_forecast(latitude, longitude)
+            partday = self._cache.store_partday_forecast(partday) or partday
+            stored = self._cache.store_daily_forecast(
+                target_date,
+                daily["temperature_2m_min"],
+                daily["temperature_2m_max"],
+                daily["precipitation_sum"],
+            )
+            return stored or daily, partday
 
-    def _is_recent(self, updated_at_value) -> bool:
-        if not updated_at_value:
-            return False
-        if isinstance(updated_at_value, datetime):
-            updated_at = updated_at_value
-        else:
-            updated_at = datetime.strptime(str(updated_at_value), "%Y-%m-%d %H:%M:%S")
+        return self._refresh(("forecast", target_date), refresh)
 
-        # Les horodatages stockés en base sont normalisés en UTC.
-        if updated_at.tzinfo is None:
-            updated_at = updated_at.replace(tzinfo=timezone.utc)
+    def refresh_age(self, target_date: date | None = None) -> float | None:
+        """Secondes écoulées depuis le dernier rafraîchissement des prévisions
+        par tranche, ou de celle du jour ``target_date``.
+
+        L'horodatage vient du cache, déjà décodé quand celui-ci le garde en
+        mémoire : le corps de la réponse n'est pas relu.
+        """
+        if target_date is None:
+            updated_at = self._cache.partday_updated_at()
         else:
-            updated_at = updated_at.astimezone(timezone.utc)
+            updated_at = self._cache.daily_updated_at(target_date)
+        if updated_at is None:
+            return None
+        return max(0.0, (datetime.now(timezone.utc) - updated_at).total_seconds())
+
+    def wait_for_refreshes(self, timeout: float | None = None) -> None:
+        """Attend la fin des rafraîchissements en cours."""
+        with self._lock:
+            pending = list(self._inflight.values())
+        wait(pending, timeout=timeout)
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], object]) -> Future:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._run_refresh, key, fetch)
+                self._inflight[key] = future
+            return future
+
+    def _run_refresh(self, key: Hashable, fetch: Callable[[], object]):
+        try:
+            return fetch()
+        except Exception:
+            logger.exception("Forecast refresh failed for %s", key)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _is_recent(self, updated_at: datetime | None) -> bool:
+        if updated_at is None:
+            return False
 
         now = datetime.now(timezone.utc)
         if updated_at > now:
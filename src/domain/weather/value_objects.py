@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List
 
 
@@ -30,3 +30,17 @@ def serialize_daily_forecast(forecasts: List[DailyForecast]) -> List[Dict[str, f
         }
         for forecast in forecasts
     ]
+
+
+def parse_updated_at(value) -> datetime | None:
+    """Horodatage ``updated_at`` d'une entrée de cache, en UTC."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        updated_at = value
+    else:
+        updated_at = datetime.strptime(str(value), "%Y-%m-%d %H:%M:%S")
+    # Les horodatages stockés en base sont normalisés en UTC.
+    if updated_at.tzinfo is None:
+        return updated_at.replace(tzinfo=timezone.utc)
+    return updated_at.astimezone(timezone.utc)
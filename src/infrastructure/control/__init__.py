@@ -1,7 +1,8 @@
-"""Device control implementations (GPIO, fake, interface)."""
+"""Device control implementations (GPIO, fake, virtual GPIO, interface)."""
 
 __all__ = [
     "control_interface",
     "control_fake",
     "control_gpio",
+    "virtual_gpio",
 ]
@@ -5,9 +5,12 @@ logger = logging.getLogger(__name__)
 
 
 class FakeControl(Control):
+    settleDelay = 0.0
+
     def __init__(self):
         self._control_state = {"pump": None, "valve": None, "levels": []}
         self._level = 4  # Default level for testing
+        self._level_callbacks = []
 
     @property
     def level(self):
@@ -18,7 +21,10 @@ class FakeControl(Control):
         logger.debug(f"Setting level to {value}")
         if not isinstance(value, int) or value < 0:
             raise ValueError("level must be a positive integer")
+        previous = self._level
         self._level = value
+        if value != previous:
+            self._emitLevelEdge(value)
 
     @property
     def control_state(self):
@@ -41,6 +47,12 @@ class FakeControl(Control):
         logger.info("FAKE: pump stopped")
         logger.info("FAKE: valve closed")
 
+    def setValve(self, opened):
+        logger.info(f"FAKE: valve {'opened' if opened else 'closed'}")
+
+    def setPump(self, running):
+        logger.info(f"FAKE: pump {'started' if running else 'stopped'}")
+
     def debugWaterLevels(self):
         water_states = {}
         for i in range(4):
@@ -50,6 +62,22 @@ class FakeControl(Control):
     def getLevel(self):
         return self.level
 
+    def readLevelMask(self):
+        return (1 << self.level) - 1
+
+    def watchLevels(self, callback):
+        self._level_callbacks.append(callback)
+
+    def _emitLevelEdge(self, level):
+        # Equivalent simule de GPIO.add_event_detect : chaque changement de
+        # niveau est signale aux abonnes comme le ferait un front materiel.
+        logger.debug(f"FAKE: level edge, level is now {level}")
+        for callback in list(self._level_callbacks):
+            try:
+                callback(None)
+            except Exception:
+                logger.exception("Level callback failed")
+
     def cleanup(self):
         pass
 
@@ -7,10 +7,15 @@ import config.config as local_config
 
 logger = logging.getLogger(__name__)
 
+# Anti-rebond des flotteurs : une vague dans la cuve ne doit pas declencher
+# une rafale de callbacks.
+LEVEL_BOUNCE_MS = 200
+
 
 class GPIOControl(Control):
     def __init__(self):
         self.control_state = {"pump": None, "valve": None, "levels": []}
+        self._level_callbacks = []
 
     @property
     def control_state(self):
@@ -43,6 +48,7 @@ class GPIOControl(Control):
         # Configure les capteurs de niveau en entrée avec pull-down
         for pin in self.control_state["levels"]:
             GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+        self._registerLevelEdges()
 
         logger.info("✅ GPIO initialized with:")
         logger.info(f"  Pump : GPIO {self.control_state['pump']}")
@@ -62,22 +68,24 @@ class GPIOControl(Control):
                     pass
 
     def openWater(self):
-        valve_pin = self.control_state["valve"]
-        pump_pin = self.control_state["pump"]
-        logger.info("Opening valve (GPIO %s)", valve_pin)
-        GPIO.output(valve_pin, GPIO.HIGH)
-        time.sleep(2)
-        logger.info("Starting pump (GPIO %s)", pump_pin)
-        GPIO.output(pump_pin, GPIO.HIGH)
+        self.setValve(True)
+        time.sleep(self.settleDelay)
+        self.setPump(True)
 
     def closeWater(self):
-        pump_pin = self.control_state["pump"]
+        self.setPump(False)
+        time.sleep(self.settleDelay)
+        self.setValve(False)
+
+    def setValve(self, opened):
         valve_pin = self.control_state["valve"]
-        logger.info("Stopping pump (GPIO %s)", pump_pin)
-        GPIO.output(pump_pin, GPIO.LOW)
-        time.sleep(2)
-        logger.info("Closing valve (GPIO %s)", valve_pin)
-        GPIO.output(valve_pin, GPIO.LOW)
+        logger.info("%s valve (GPIO %s)", "Opening" if opened else "Closing", valve_pin)
+        GPIO.output(valve_pin, GPIO.HIGH if opened else GPIO.LOW)
+
+    def setPump(self, running):
+        pump_pin = self.control_state["pump"]
+        logger.info("%s pump (GPIO %s)", "Starting" if running else "Stopping", pump_pin)
+        GPIO.output(pump_pin, GPIO.HIGH if running else GPIO.LOW)
 
     def debugWaterLevels(self):
         water_states = {}
@@ -91,11 +99,47 @@ class GPIOControl(Control):
     def getLevel(self):
         level = 0
         for i in range(4):
-            logger.info(f"Checking level {i}")
+            logger.debug(f"Checking level {i}")
             if GPIO.input(self.control_state["levels"][i]):
                 level += 1
         return level
 
+    def readLevelMask(self):
+        # Un bit par flotteur, lus en une passe et sans log par broche.
+        mask = 0
+        for i, pin in enumerate(self.control_state["levels"]):
+            if GPIO.input(pin):
+                mask |= 1 << i
+        return mask
+
+    def watchLevels(self, callback):
+        self._level_callbacks.append(callback)
+
+    def _registerLevelEdges(self):
+        # Interruptions sur front montant et descendant : le niveau n'est relu
+        # que lorsqu'un flotteur change d'etat.
+        for pin in self.control_state["levels"]:
+            try:
+                GPIO.remove_event_detect(pin)
+            except Exception:
+                pass
+            GPIO.add_event_detect(
+                pin,
+                GPIO.BOTH,
+                callback=self._onLevelEdge,
+                bouncetime=LEVEL_BOUNCE_MS,
+            )
+
+    def _onLevelEdge(self, channel):
+        # Thread de RPi.GPIO : pas de lecture ici, l'abonne relit le niveau
+        # de facon serialisee (une seule lecture par front).
+        logger.info("Level edge on GPIO %s", channel)
+        for callback in list(self._level_callbacks):
+            try:
+                callback(channel)
+            except Exception:
+                logger.exception("Level callback failed")
+
     def cleanup(self):
         GPIO.cleanup()
         logger.info("GPIO cleaned up successfully.")
@@ -2,6 +2,9 @@ from abc import ABC, abstractmethod
 
 
 class Control(ABC):
+    # Temporisation entre vanne et pompe lors des sequences d'ouverture/fermeture
+    settleDelay = 2.0
+
     @property
     @abstractmethod
     def control_state(self):
@@ -19,6 +22,14 @@ class Control(ABC):
     def closeWater():
         pass
 
+    @abstractmethod
+    def setValve(opened):
+        pass
+
+    @abstractmethod
+    def setPump(running):
+        pass
+
     @abstractmethod
     def debugWaterLevels():
         pass
@@ -27,6 +38,16 @@ class Control(ABC):
     def getLevel():
         pass
 
+    @abstractmethod
+    def readLevelMask():
+        pass
+
+    # callback(channel) a chaque front d'un flotteur, sans relecture du
+    # niveau (channel vaut None hors materiel).
+    @abstractmethod
+    def watchLevels(callback):
+        pass
+
     @abstractmethod
     def cleanup():
         pass
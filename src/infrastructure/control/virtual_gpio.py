@@ -0,0 +1,348 @@
+"""In-process stand-in for ``RPi.GPIO`` with a simple timing model.
+
+``install()`` registers this module as ``RPi.GPIO`` so that ``GPIOControl``
+runs unmodified off-device. The board simulates pin directions, pull
+resistors, a per-read latency, edge events (with contact chatter and
+bouncetime filtering) and a tank drained by the pump output.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Constantes de l'API RPi.GPIO
+BCM = 11
+BOARD = 10
+OUT = 0
+IN = 1
+LOW = 0
+HIGH = 1
+PUD_OFF = 20
+PUD_DOWN = 21
+PUD_UP = 22
+RISING = 31
+FALLING = 32
+BOTH = 33
+
+RPI_INFO = {"TYPE": "Virtual", "P1_REVISION": 3}
+VERSION = "virtual"
+
+_TICK = 0.02
+
+
+@dataclass(slots=True)
+class _Pin:
+    direction: int
+    pull: int = PUD_OFF
+    value: int = LOW
+    edge: Optional[int] = None
+    callbacks: List[Callable[[int], None]] = field(default_factory=list)
+    bouncetime: float = 0.0
+    last_event: float = float("-inf")
+    detected: bool = False
+
+
+class VirtualTank:
+    """Tank drained while the pump output is HIGH, refilled otherwise.
+
+    ``fill`` goes from 0 (empty) to 1 (full); float ``i`` is submerged once
+    the water reaches ``(i + 0.2) / len(level_pins)``.
+    """
+
+    def __init__(
+        self,
+        pump_pin: int,
+        level_pins: List[int],
+        fill: float = 1.0,
+        drain_rate: float = 0.01,
+        refill_rate: float = 0.0,
+    ) -> None:
+        self.pump_pin = pump_pin
+        self.level_pins = list(level_pins)
+        self.fill = fill
+        self.drain_rate = drain_rate
+        self.refill_rate = refill_rate
+
+    def advance(self, seconds: float, pump_running: bool) -> None:
+        rate = -self.drain_rate if pump_running else self.refill_rate
+        self.fill = min(1.0, max(0.0, self.fill + rate * seconds))
+
+    def submerged(self, pin: int) -> Optional[bool]:
+        if pin not in self.level_pins:
+            return None
+        index = self.level_pins.index(pin)
+        return self.fill >= (index + 0.2) / len(self.level_pins)
+
+
+class VirtualBoard:
+    def __init__(
+        self,
+        tank: VirtualTank | None = None,
+        read_latency: float = 0.0,
+        chatter: int = 0,
+    ) -> None:
+        self.tank = tank
+        self.read_latency = read_latency
+        # Rebonds du contact d'un flotteur à chaque changement d'état.
+        self.chatter = chatter
+        self.mode: Optional[int] = None
+        self.warnings = True
+        self.reads = 0
+        self.writes = 0
+        self.events = 0
+        self._pins: Dict[int, _Pin] = {}
+        self._lock = threading.RLock()
+        self._wet: Dict[int, bool] = {}
+        self._last_tick = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- API RPi.GPIO -------------------------------------------------
+    def setmode(self, mode: int) -> None:
+        self.mode = mode
+
+    def setup(self, channel, direction, pull_up_down=PUD_OFF, initial=-1) -> None:
+        self._require_mode()
+        for pin in _channels(channel):
+            with self._lock:
+                state = _Pin(direction=direction, pull=pull_up_down)
+                if direction == OUT and initial != -1:
+                    state.value = int(bool(initial))
+                self._pins[pin] = state
+        self._ensure_physics()
+
+    def output(self, channel, value) -> None:
+        for pin in _channels(channel):
+            with self._lock:
+                state = self._pins.get(pin)
+                if state is None or state.direction != OUT:
+                    raise RuntimeError(
+                        "The GPIO channel has not been set up as an OUTPUT"
+                    )
+                self._advance_tank()
+                state.value = int(bool(value))
+                self.writes += 1
+
+    def input(self, channel: int) -> int:
+        if self.read_latency:
+            time.sleep(self.read_latency)
+        with self._lock:
+            state = self._pins.get(channel)
+            if state is None:
+                raise RuntimeError("You must setup() the GPIO channel first")
+            self.reads += 1
+            if state.direction == OUT:
+                return state.value
+            self._advance_tank()
+            return self._level_of(channel, state)
+
+    def cleanup(self, channel=None) -> None:
+        with self._lock:
+            if channel is None:
+                self._pins.clear()
+                self._wet.clear()
+                self.mode = None
+            else:
+                for pin in _channels(channel):
+                    self._pins.pop(pin, None)
+                    self._wet.pop(pin, None)
+
+    def add_event_detect(self, channel, edge, callback=None, bouncetime=None) -> None:
+        with self._lock:
+            state = self._pins.get(channel)
+            if state is None or state.direction != IN:
+                raise RuntimeError(
+                    "You must setup() the GPIO channel as an input first"
+                )
+            if state.edge is not None:
+                raise RuntimeError(
+                    "Conflicting edge detection already enabled for this GPIO channel"
+                )
+            state.edge = edge
+            state.bouncetime = (bouncetime or 0) / 1000
+            state.callbacks = [callback] if callback else []
+            self._wet[channel] = bool(self._level_of(channel, state))
+        self._ensure_physics()
+
+    def add_event_callback(self, channel, callback) -> None:
+        with self._lock:
+            state = self._pins.get(channel)
+            if state is None or state.edge is None:
+                raise RuntimeError(
+                    "Add event detection using add_event_detect first "
+                    "before adding a callback"
+                )
+            state.callbacks.append(callback)
+
+    def remove_event_detect(self, channel) -> None:
+        with self._lock:
+            state = self._pins.get(channel)
+            if state is not None:
+                state.edge = None
+                state.callbacks = []
+
+    def event_detected(self, channel) -> bool:
+        with self._lock:
+            state = self._pins.get(channel)
+            if state is None or not state.detected:
+                return False
+            state.detected = False
+            return True
+
+    def gpio_function(self, channel) -> int:
+        state = self._pins.get(channel)
+        return state.direction if state else IN
+
+    # -- Simulation ---------------------------------------------------
+    def set_fill(self, fill: float) -> None:
+        with self._lock:
+            self._advance_tank()
+            self.tank.fill = fill
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def _require_mode(self) -> None:
+        if self.mode is None:
+            raise RuntimeError(
+                "Please set pin numbering mode using GPIO.setmode(GPIO.BOARD) "
+                "or GPIO.setmode(GPIO.BCM)"
+            )
+
+    def _level_of(self, pin: int, state: _Pin) -> int:
+        submerged = self.tank.submerged(pin) if self.tank else None
+        if submerged is not None:
+            # Flotteur immergé : contact fermé vers 3,3 V.
+            return HIGH if submerged else (HIGH if state.pull == PUD_UP else LOW)
+        return HIGH if state.pull == PUD_UP else LOW
+
+    def _advance_tank(self) -> None:
+        now = time.monotonic()
+        elapsed, self._last_tick = now - self._last_tick, now
+        if self.tank is None:
+            return
+        pump = self._pins.get(self.tank.pump_pin)
+        running = pump is not None and pump.direction == OUT and pump.value == HIGH
+        self.tank.advance(elapsed, running)
+
+    def _ensure_physics(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._physics, name="virtual-gpio", daemon=True
+        )
+        self._thread.start()
+
+    def _physics(self) -> None:
+        while not self._stop.wait(_TICK):
+            with self._lock:
+                self._advance_tank()
+            self._scan_edges()
+
+    def _scan_edges(self) -> None:
+        fired = []
+        with self._lock:
+            for pin, state in self._pins.items():
+                if state.direction != IN or state.edge is None:
+                    continue
+                wet = bool(self._level_of(pin, state))
+                if self._wet.get(pin) == wet:
+                    continue
+                self._wet[pin] = wet
+                # Un front réel est suivi de quelques rebonds du contact.
+                for toggle in range(1 + 2 * self.chatter):
+                    rising = wet if toggle % 2 == 0 else not wet
+                    if self._accepts(state, rising):
+                        fired.append((pin, list(state.callbacks)))
+        for pin, callbacks in fired:
+            self.events += 1
+            for callback in callbacks:
+                try:
+                    callback(pin)
+                except Exception:  # pragma: no cover - mirrors RPi.GPIO
+                    logger.exception("Virtual GPIO callback failed on %s", pin)
+
+    def _accepts(self, state: _Pin, rising: bool) -> bool:
+        if state.edge == RISING and not rising:
+            return False
+        if state.edge == FALLING and rising:
+            return False
+        now = time.monotonic()
+        if now - state.last_event < state.bouncetime:
+            return False
+        state.last_event = now
+        state.detected = True
+        return True
+
+
+def _channels(channel) -> List[int]:
+    return list(channel) if isinstance(channel, (list, tuple)) else [channel]
+
+
+board = VirtualBoard()
+
+_API = (
+    "setmode",
+    "setup",
+    "output",
+    "input",
+    "cleanup",
+    "add_event_detect",
+    "add_event_callback",
+    "remove_event_detect",
+    "event_detected",
+    "gpio_function",
+)
+
+
+def setwarnings(flag: bool) -> None:
+    board.warnings = bool(flag)
+
+
+def getmode() -> Optional[int]:
+    return board.mode
+
+
+def __getattr__(name: str):
+    if name in _API:
+        return getattr(board, name)
+    raise AttributeError(name)
+
+
+def install(
+    pump_pin: int,
+    level_pins: List[int],
+    read_latency: float | None = None,
+    chatter: int = 0,
+    **tank_options,
+) -> VirtualBoard:
+    """Registers this module as ``RPi.GPIO`` and resets the simulated board."""
+    global board
+    if board is not None:
+        board.close()
+    if read_latency is None:
+        read_latency = float(os.getenv("VIRTUAL_GPIO_READ_LATENCY", "0"))
+    board = VirtualBoard(
+        VirtualTank(pump_pin, level_pins, **tank_options),
+        read_latency=read_latency,
+        chatter=chatter,
+    )
+    package = sys.modules.get("RPi")
+    if package is None or getattr(package, "GPIO", None) is not sys.modules[__name__]:
+        package = types.ModuleType("RPi")
+        package.GPIO = sys.modules[__name__]
+        sys.modules["RPi"] = package
+    sys.modules["RPi.GPIO"] = sys.modules[__name__]
+    return board
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from domain.watering.entities import WaterState
+
+logger = logging.getLogger(__name__)
+
+
+_OPEN = "open"
+_CLOSE = "close"
+_CALL = "call"
+_STOP = "stop"
+
+
+class ActuatorSequencer:
+    """Device actor owning every GPIO access through a command queue.
+
+    The valve→pump and pump→valve sequences run as a state machine: the
+    settle delay between both outputs is a timed transition of the actor
+    thread, so ``open`` and ``close`` return a future immediately. Requests
+    for a state already being reached are coalesced onto the same future,
+    and a close received while opening aborts before the pump starts.
+    """
+
+    def __init__(self, control, settle_delay: float = 2.0) -> None:
+        self._control = control
+        self._settle_delay = settle_delay
+        self._queue: "queue.Queue[Tuple[str, Any, Future]]" = queue.Queue()
+        self._state = WaterState.CLOSED
+        self._step_due: Optional[float] = None
+        self._open_waiters: List[Future] = []
+        self._close_waiters: List[Future] = []
+        self._thread = threading.Thread(
+            target=self._loop, name="water-actuator", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def state(self) -> WaterState:
+        return self._state
+
+    def open(self) -> Future:
+        return self._submit(_OPEN)
+
+    def close(self) -> Future:
+        return self._submit(_CLOSE)
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Exécute ``fn`` sur le thread de l'acteur et attend son résultat."""
+        if threading.current_thread() is self._thread:
+            return fn()
+        return self._submit(_CALL, fn).result()
+
+    def stop(self) -> None:
+        if threading.current_thread() is self._thread:
+            return
+        self._submit(_STOP)
+        self._thread.join(timeout=self._settle_delay + 1)
+
+    def _submit(self, kind: str, payload: Any = None) -> Future:
+        future: Future = Future()
+        self._queue.put((kind, payload, future))
+        return future
+
+    def _loop(self) -> None:
+        while True:
+            timeout = None
+            if self._step_due is not None:
+                timeout = self._step_due - time.monotonic()
+                if timeout <= 0:
+                    self._run_guarded(self._complete_step)
+                    continue
+            try:
+                kind, payload, future = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+
+            if kind == _STOP:
+                future.set_result(self._state)
+                return
+            if kind == _CALL:
+                try:
+                    future.set_result(payload())
+                except Exception as exc:
+                    future.set_exception(exc)
+                continue
+            handler = self._request_open if kind == _OPEN else self._request_close
+            self._run_guarded(lambda: handler(future), future)
+
+    def _request_open(self, future: Future) -> None:
+        if self._state == WaterState.OPEN:
+            future.set_result(self._state)
+            return
+        self._open_waiters.append(future)
+        if self._state == WaterState.OPENING:
+            return
+        if self._state == WaterState.CLOSED:
+            self._control.setValve(True)
+        # CLOSING : la vanne est encore ouverte, on relance la pompe.
+        self._resolve(self._close_waiters)
+        self._enter(WaterState.OPENING)
+
+    def _request_close(self, future: Future) -> None:
+        if self._state == WaterState.CLOSED:
+            future.set_result(self._state)
+            return
+        self._close_waiters.append(future)
+        if self._state == WaterState.CLOSING:
+            return
+        if self._state == WaterState.OPENING:
+            # La pompe n'a pas démarré : la vanne peut être refermée tout de suite.
+            logger.info("Closing valve before pump start")
+            self._control.setValve(False)
+            self._enter(WaterState.CLOSED)
+            self._resolve(self._open_waiters)
+            self._resolve(self._close_waiters)
+            return
+        self._control.setPump(False)
+        self._enter(WaterState.CLOSING)
+
+    def _complete_step(self) -> None:
+        if self._state == WaterState.OPENING:
+            self._control.setPump(True)
+            self._enter(WaterState.OPEN)
+            self._resolve(self._open_waiters)
+        elif self._state == WaterState.CLOSING:
+            self._control.setValve(False)
+            self._enter(WaterState.CLOSED)
+            self._resolve(self._close_waiters)
+        else:  # pragma: no cover - defensive
+            self._step_due = None
+
+    def _enter(self, state: WaterState) -> None:
+        self._state = state
+        if state in (WaterState.OPENING, WaterState.CLOSING):
+            self._step_due = time.monotonic() + self._settle_delay
+        else:
+            self._step_due = None
+
+    def _resolve(self, waiters: List[Future]) -> None:
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(self._state)
+        waiters.clear()
+
+    def _run_guarded(self, step: Callable[[], None], future: Future | None = None):
+        try:
+            step()
+        except Exception as exc:
+            logger.exception("Actuator sequence failed, forcing outputs off")
+            try:
+                self._control.setPump(False)
+                self._control.setValve(False)
+            except Exception:  # pragma: no cover - hardware access
+                logger.exception("Unable to force outputs off")
+            self._enter(WaterState.CLOSED)
+            waiters = self._open_waiters + self._close_waiters
+            if future is not None:
+                waiters.append(future)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(exc)
+            self._open_waiters.clear()
+            self._close_waiters.clear()
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import importlib
+import logging
 import os
 import sys
+from concurrent.futures import Future
 from datetime import datetime, timezone
+from typing import Callable, List
 
+import config.config as local_config
 from domain.watering.entities import TankLevelSnapshot
 from domain.watering.ports import DeviceController, TankLevelSensor
+from infrastructure.devices.actuator import ActuatorSequencer
+from infrastructure.devices.level_sampler import LevelSample, TankLevelSampler
+
+logger = logging.getLogger(__name__)
 
 
 def _resolve_control_impl():
@@ -17,6 +25,15 @@ def _resolve_control_impl():
         importlib.import_module("infrastructure.control.control_interface"),
     )
 
+    if os.environ.get("GPIO_BACKEND") == "virtual":
+        # Vrai code GPIOControl sur une carte simulée (poste de développement).
+        config = local_config.load_config()
+        virtual_gpio = importlib.import_module("infrastructure.control.virtual_gpio")
+        virtual_gpio.install(config["pump"], config["levels"])
+        gpio_module = importlib.import_module("infrastructure.control.control_gpio")
+        sys.modules.setdefault("control.control_gpio", gpio_module)
+        return getattr(gpio_module, "GPIOControl")
+
     environment = os.environ.get("FLASK_ENV", "production")
     if environment in {"development", "test"}:
         fake_module = importlib.import_module("infrastructure.control.control_fake")
@@ -45,31 +62,82 @@ def _resolve_control_impl():
 ControlImpl = _resolve_control_impl()
 
 
+LEVEL_COUNT = 4
+
+
 class DeviceControllerAdapter(DeviceController):
-    def __init__(self) -> None:
-        self._control = ControlImpl()
+    def __init__(self, control=None) -> None:
+        self._control = control if control is not None else ControlImpl()
+        # Tous les accès GPIO passent par l'acteur : aucune requête HTTP
+        # n'attend la temporisation vanne/pompe.
+        self._actuator = ActuatorSequencer(
+            self._control, settle_delay=self._control.settleDelay
+        )
+        self._sampler = TankLevelSampler(
+            lambda: self._actuator.call(self._control.readLevelMask),
+            interval=local_config.LEVEL_SAMPLE_INTERVAL,
+            max_age=local_config.LEVEL_MAX_STALENESS,
+            history_size=local_config.LEVEL_HISTORY_SIZE,
+        )
+        self._level_callbacks: List[Callable[[float], None]] = []
+        self._control.watchLevels(self._on_level_edge)
 
     def setup(self) -> None:
-        self._control.setup()
+        self._actuator.call(self._control.setup)
+        self._sampler.sample_now()
 
-    def open_water(self) -> None:
-        self._control.openWater()
+    def start_sampling(self) -> None:
+        self._sampler.start()
 
-    def close_water(self) -> None:
-        self._control.closeWater()
+    def open_water(self) -> Future:
+        return self._actuator.open()
 
-    def get_level(self) -> float:
-        return float(self.getLevel())
+    def close_water(self) -> Future:
+        return self._actuator.close()
 
-    # Compatibilité ascendante : certains tests patchent getLevel directement
-    def getLevel(self) -> float:  # pragma: no cover - shim
-        return float(self._control.getLevel())
+    def get_level(self) -> float:
+        return float(self._sampler.latest().level)
 
     def debug_water_levels(self):
-        return self._control.debugWaterLevels()
+        sample = self._sampler.latest()
+        pins = list(self._control.control_state.get("levels") or [])
+        return {
+            f"level_{i}": {
+                "gpio_pin": pins[i] if i < len(pins) else None,
+                "state": (sample.mask >> i) & 1,
+            }
+            for i in range(LEVEL_COUNT)
+        }
+
+    def level_history(self) -> List[TankLevelSnapshot]:
+        return [
+            TankLevelSnapshot(
+                level_percent=sample.level * 25, measured_at=sample.measured_at
+            )
+            for sample in self._sampler.history()
+        ]
+
+    def subscribe_level_changes(self, callback: Callable[[float], None]) -> None:
+        self._level_callbacks.append(callback)
+
+    def subscribe_samples(self, listener: Callable[[LevelSample], None]) -> None:
+        # Chaque lecture du sampler (périodique ou sur front), pour l'historique
+        self._sampler.add_listener(listener)
+
+    def _on_level_edge(self, _channel) -> None:
+        # Un front rafraîchit l'échantillon partagé avant de prévenir les abonnés.
+        sample = self._sampler.sample_now()
+        for callback in list(self._level_callbacks):
+            # Un abonné défaillant ne doit pas priver les suivants du front.
+            try:
+                callback(float(sample.level))
+            except Exception:
+                logger.exception("Level change subscriber failed")
 
     def cleanup(self) -> None:
-        self._control.cleanup()
+        self._sampler.stop()
+        self._actuator.call(self._control.cleanup)
+        self._actuator.stop()
 
 
 class DeviceTankLevelSensor(TankLevelSensor):
@@ -85,4 +153,5 @@ class DeviceTankLevelSensor(TankLevelSensor):
 def create_device_controller() -> DeviceControllerAdapter:
     controller = DeviceControllerAdapter()
     controller.setup()
+    controller.start_sampling()
     return controller
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class LevelSample:
+    mask: int  # bit i = flotteur i immergé
+    monotonic: float
+    measured_at: datetime
+
+    @property
+    def level(self) -> int:
+        return bin(self.mask).count("1")
+
+
+class TankLevelSampler:
+    """Reads every level pin from one background thread and shares the result.
+
+    Readers get the latest sample as long as it is younger than ``max_age``;
+    only a stale or missing sample triggers a synchronous hardware read.
+    """
+
+    def __init__(
+        self,
+        read_mask: Callable[[], int],
+        interval: float = 5.0,
+        max_age: float = 10.0,
+        history_size: int = 720,
+    ) -> None:
+        self._read_mask = read_mask
+        self._interval = interval
+        self._max_age = max_age
+        self._history: Deque[LevelSample] = deque(maxlen=history_size)
+        self._read_lock = threading.Lock()
+        self._listeners: List[Callable[[LevelSample], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.hardware_reads = 0
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="tank-level-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self._interval + 1)
+        self._thread = None
+
+    def add_listener(self, listener: Callable[[LevelSample], None]) -> None:
+        self._listeners.append(listener)
+
+    def latest(self, max_age: float | None = None) -> LevelSample:
+        bound = self._max_age if max_age is None else max_age
+        sample = self._last()
+        if sample is not None and time.monotonic() - sample.monotonic <= bound:
+            return sample
+        with self._read_lock:
+            current = self._last()
+            # Un autre lecteur a rafraîchi l'échantillon pendant l'attente du verrou.
+            if current is not sample:
+                return current
+            sample = self._read()
+        self._notify(sample)
+        return sample
+
+    def sample_now(self) -> LevelSample:
+        with self._read_lock:
+            sample = self._read()
+        self._notify(sample)
+        return sample
+
+    def _last(self) -> LevelSample | None:
+        return self._history[-1] if self._history else None
+
+    def _read(self) -> LevelSample:
+        mask = int(self._read_mask())
+        self.hardware_reads += 1
+        sample = LevelSample(
+            mask=mask,
+            monotonic=time.monotonic(),
+            measured_at=datetime.now(timezone.utc),
+        )
+        self._history.append(sample)
+        return sample
+
+    def _notify(self, sample: LevelSample) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(sample)
+            except Exception:  # pragma: no cover - defensive
+                logger.exception("Level sample listener failed")
+
+    def history(self, seconds: float | None = None) -> List[LevelSample]:
+        samples = list(self._history)
+        if seconds is None:
+            return samples
+        threshold = time.monotonic() - seconds
+        return [sample for sample in samples if sample.monotonic >= threshold]
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sample_now()
+            except Exception:  # pragma: no cover - hardware access
+                logger.exception("Unable to sample tank level")
+            self._stop.wait(self._interval)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+
+from application.watering.scheduler import RuntimeScheduler
+from domain.shared.clock import Clock
+from domain.watering.entities import TankLevelSnapshot, WaterState
+from domain.watering.ports import DeviceController
+
+from .controllers import LEVEL_COUNT
+
+_EDGE_KEY = "#tank-edge"
+
+
+class SimulatedTank:
+    """Water tank with four floats, drained by the pump and refilled by rain.
+
+    Float ``i`` is submerged once the tank holds ``(i + 0.2) / 4`` of its
+    capacity, as on the virtual GPIO board.
+    """
+
+    def __init__(
+        self,
+        capacity_litres: float = 1000.0,
+        litres: float | None = None,
+        pump_flow_lpm: float = 20.0,
+        catchment_m2: float = 20.0,
+    ) -> None:
+        self.capacity_litres = capacity_litres
+        self.litres = capacity_litres if litres is None else litres
+        self.pump_flow_lpm = pump_flow_lpm
+        self.catchment_m2 = catchment_m2
+        self.rain_litres = 0.0
+
+    def threshold(self, index: int) -> float:
+        return self.capacity_litres * (index + 0.2) / LEVEL_COUNT
+
+    def level_for(self, litres: float) -> int:
+        return sum(1 for i in range(LEVEL_COUNT) if litres >= self.threshold(i))
+
+    def rain(self, precipitation_mm: float) -> None:
+        # 1 mm sur 1 m² de toiture = 1 litre
+        collected = max(0.0, precipitation_mm) * self.catchment_m2
+        self.rain_litres += collected
+        self.litres = min(self.capacity_litres, self.litres + collected)
+
+
+class SimulatedDeviceController(DeviceController):
+    """Device controller running on simulated time.
+
+    Valve/pump sequences complete immediately and float edges are scheduled
+    on the runtime scheduler at the instant the water crosses a float.
+    """
+
+    def __init__(
+        self, tank: SimulatedTank, clock: Clock, scheduler: RuntimeScheduler
+    ) -> None:
+        self.tank = tank
+        self._clock = clock
+        self._scheduler = scheduler
+        self._pump_since: float | None = None
+        self._callbacks: List[Callable[[float], None]] = []
+        self.pump_seconds = 0.0
+        self.water_used_litres = 0.0
+
+    def setup(self) -> None:
+        return None
+
+    def open_water(self) -> Future:
+        if self._pump_since is None:
+            self._pump_since = self._clock.monotonic()
+            self._schedule_edge()
+        return _done(WaterState.OPEN)
+
+    def close_water(self) -> Future:
+        if self._pump_since is not None:
+            self._settle()
+            self._pump_since = None
+            self._scheduler.cancel(_EDGE_KEY)
+        return _done(WaterState.CLOSED)
+
+    def get_level(self) -> float:
+        return float(self.tank.level_for(self._current_litres()))
+
+    def debug_water_levels(self) -> Dict[str, dict]:
+        litres = self._current_litres()
+        return {
+            f"level_{i}": {
+                "gpio_pin": None,
+                "state": int(litres >= self.tank.threshold(i)),
+            }
+            for i in range(LEVEL_COUNT)
+        }
+
+    def level_history(self) -> List[TankLevelSnapshot]:
+        return [
+            TankLevelSnapshot(
+                level_percent=self.get_level() * 25, measured_at=self._clock.now()
+            )
+        ]
+
+    def subscribe_level_changes(self, callback: Callable[[float], None]) -> None:
+        self._callbacks.append(callback)
+
+    def cleanup(self) -> None:
+        self.close_water()
+
+    def _flow(self) -> float:
+        return self.tank.pump_flow_lpm / 60
+
+    def _current_litres(self) -> float:
+        if self._pump_since is None:
+            return self.tank.litres
+        pumped = (self._clock.monotonic() - self._pump_since) * self._flow()
+        return max(0.0, self.tank.litres - pumped)
+
+    def _settle(self) -> None:
+        elapsed = self._clock.monotonic() - self._pump_since
+        pumped = min(self.tank.litres, elapsed * self._flow())
+        self.pump_seconds += elapsed
+        self.water_used_litres += pumped
+        self.tank.litres -= pumped
+        self._pump_since = self._clock.monotonic()
+
+    def _schedule_edge(self) -> None:
+        litres = self._current_litres()
+        level = self.tank.level_for(litres)
+        if level == 0 or self._flow() <= 0:
+            return
+        below = litres - self.tank.threshold(level - 1)
+        self._scheduler.schedule(
+            _EDGE_KEY, below / self._flow() + 1e-6, self._on_edge
+        )
+
+    def _on_edge(self) -> None:
+        if self._pump_since is None:
+            return
+        self._settle()
+        level = self.get_level()
+        for callback in list(self._callbacks):
+            callback(level)
+        self._schedule_edge()
+
+
+def _done(state: WaterState) -> Future:
+    future: Future = Future()
+    future.set_result(state)
+    return future
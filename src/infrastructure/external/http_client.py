@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+# Réponses qui valent une nouvelle tentative
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True, slots=True)
+class _Validated:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: Any
+
+
+class HttpClient:
+    """Client HTTP partagé : une session requests et son pool de connexions
+    keep-alive, réponses compressées (gzip/deflate).
+
+    ``get_json`` renvoie la réponse JSON décodée. Si l'amont fournit un ETag
+    ou un Last-Modified, l'appel suivant est conditionnel et un 304 renvoie
+    le corps déjà décodé. Les erreurs réseau et les statuts de
+    RETRY_STATUSES sont retentés ``retries`` fois, avec un délai exponentiel
+    tiré au hasard (jitter) pour ne pas relancer en rafale.
+    """
+
+    def __init__(
+        self,
+        default_timeout: Timeout = 10.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        pool_maxsize: int = 4,
+        max_validated: int = 32,
+        sleep: Callable[[float], None] = time.sleep,
+        rand: Callable[[float, float], float] = random.uniform,
+    ) -> None:
+        self._default_timeout = default_timeout
+        self._retries = retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._sleep = sleep
+        self._rand = rand
+        self._max_validated = max_validated
+        self._validated: "OrderedDict[Tuple, _Validated]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers["Accept-Encoding"] = "gzip, deflate"
+
+    def get_json(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+    ) -> Any:
+        key = (url, tuple(sorted((params or {}).items())))
+        with self._lock:
+            validated = self._validated.get(key)
+
+        headers = {}
+        if validated is not None:
+            if validated.etag:
+                headers["If-None-Match"] = validated.etag
+            if validated.last_modified:
+                headers["If-Modified-Since"] = validated.last_modified
+
+        response = self._get(url, params, headers, timeout or self._default_timeout)
+        if response.status_code == 304 and validated is not None:
+            return validated.body
+        response.raise_for_status()
+        body = response.json()
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            with self._lock:
+                self._validated[key] = _Validated(etag, last_modified, body)
+                self._validated.move_to_end(key)
+                while len(self._validated) > self._max_validated:
+                    self._validated.popitem(last=False)
+        return body
+
+    def close(self) -> None:
+        self._session.close()
+
+    def _get(self, url, params, headers, timeout) -> requests.Response:
+        attempt = 0
+        while True:
+            try:
+                response = self._session.get(
+                    url, params=params, headers=headers, timeout=timeout
+                )
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                if attempt >= self._retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+                response.close()
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt >= self._retries:
+                    raise
+                reason = type(exc).__name__
+            delay = self._rand(0, min(self._max_backoff, self._backoff * 2**attempt))
+            logger.warning(
+                "GET %s failed (%s), retrying in %.2fs", url, reason, delay
+            )
+            self._sleep(delay)
+            attempt += 1
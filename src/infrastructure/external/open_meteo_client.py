@@ -6,7 +6,11 @@ from datetime import datetime, timedelta, timezone
 import requests
 
 from domain.weather.ports import ForecastProvider
+from infrastructure.external.http_client import HttpClient, Timeout
 from services import weather
+from services.partday import aggregate_partday_columns
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 
 os.makedirs("/var/log/gunicorn", exist_ok=True)
 
@@ -60,33 +64,84 @@ def _fallback_partday() -> list[dict]:
 
 class OpenMeteoClient(ForecastProvider):
     """ Client for Open-Meteo weather API. """
+
+    def __init__(
+        self,
+        http: HttpClient | None = None,
+        daily_timeout: Timeout = 5,
+        forecast_timeout: Timeout = 15,
+    ) -> None:
+        self._http = http or HttpClient()
+        self._daily_timeout = daily_timeout
+        self._forecast_timeout = forecast_timeout
+
     def fetch_daily_forecast(self, latitude: float, longitude: float) -> dict:
-        url = (
-            "https://api.open-meteo.com/v1/forecast"
-            f"?latitude={latitude}&longitude={longitude}"
-            "&daily=temperature_2m_max,temperature_2m_min,precipitation_sum"
-            "&forecast_days=1&timezone=Europe%2FParis"
-        )
+        params = {
+            "latitude": latitude,
+            "longitude": longitude,
+            "daily": weather.DAILY_VARIABLES,
+            "forecast_days": 1,
+            "timezone": "Europe/Paris",
+        }
         try:
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
-            data = response.json()["daily"]
-            return {
-                "temperature_2m_min": float(data["temperature_2m_min"][0]),
-                "temperature_2m_max": float(data["temperature_2m_max"][0]),
-                "precipitation_sum": float(data["precipitation_sum"][0]),
-                "updated_at": _utc_timestamp(),
-            }
+            data = self._http.get_json(
+                FORECAST_URL, params=params, timeout=self._daily_timeout
+            )
+            return _daily_entry(data["daily"], _utc_timestamp())
         except (requests.RequestException, KeyError, IndexError, ValueError):
             return dict(_FALLBACK_DAILY)
 
     def fetch_partday_forecast(self, latitude: float, longitude: float):
         try:
-            raw = weather.fetch_open_meteo(latitude, longitude)
-            aggregated = weather.aggregate_by_partday(raw)
-            timestamp = _utc_timestamp()
-            for entry in aggregated:
-                entry["updated_at"] = timestamp
-            return aggregated
+            raw = weather.fetch_open_meteo(
+                latitude,
+                longitude,
+                client=self._http,
+                timeout=self._forecast_timeout,
+            )
+            return _partday_entries(raw, _utc_timestamp())
         except (requests.RequestException, KeyError, ValueError):
             return _fallback_partday()
+
+    def fetch_forecast(self, latitude: float, longitude: float):
+        """Prévision du jour et par tranche depuis une seule requête.
+
+        Chaque partie est décodée séparément : un bloc horaire invalide ne
+        fait pas perdre la prévision du jour, et inversement.
+        """
+        try:
+            raw = weather.fetch_open_meteo(
+                latitude,
+                longitude,
+                daily=weather.DAILY_VARIABLES,
+                client=self._http,
+                timeout=self._forecast_timeout,
+            )
+        except (requests.RequestException, ValueError):
+            return dict(_FALLBACK_DAILY), _fallback_partday()
+        timestamp = _utc_timestamp()
+        try:
+            daily = _daily_entry(raw["daily"], timestamp)
+        except (KeyError, IndexError, TypeError, ValueError):
+            daily = dict(_FALLBACK_DAILY)
+        try:
+            partday = _partday_entries(raw, timestamp)
+        except (KeyError, IndexError, TypeError, ValueError):
+            partday = _fallback_partday()
+        return daily, partday
+
+
+def _daily_entry(data, timestamp: str) -> dict:
+    return {
+        "temperature_2m_min": float(data["temperature_2m_min"][0]),
+        "temperature_2m_max": float(data["temperature_2m_max"][0]),
+        "precipitation_sum": float(data["precipitation_sum"][0]),
+        "updated_at": timestamp,
+    }
+
+
+def _partday_entries(raw, timestamp: str) -> list[dict]:
+    aggregated = aggregate_partday_columns(raw)
+    for entry in aggregated:
+        entry["updated_at"] = timestamp
+    return aggregated
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import (
+    Callable,
+    Generic,
+    Hashable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from domain.weather.ports import ForecastCache
+from domain.weather.value_objects import parse_updated_at
+
+T = TypeVar("T")
+
+_PARTDAY = "partday"
+
+
+@dataclass(frozen=True, slots=True)
+class L1Entry(Generic[T]):
+    value: T
+    expires_at: float
+    # updated_at de la valeur, décodé une fois à la mise en cache
+    updated_at: Optional[datetime]
+
+
+class MemoryForecastCache(ForecastCache):
+    """Cache mémoire (L1) devant un autre ForecastCache, en général SQL.
+
+    Les entrées lues dans ``inner`` sont gardées décodées ``ttl`` secondes
+    (les écritures d'un autre processus sont vues au plus tard à l'échéance),
+    ``max_entries`` au plus, les moins récemment lues évincées d'abord. Chaque
+    ``store_*`` écrit d'abord dans ``inner`` puis remplace l'entrée par la
+    valeur stockée.
+    """
+
+    def __init__(
+        self,
+        inner: ForecastCache,
+        ttl: float = 60.0,
+        max_entries: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._inner = inner
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, L1Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_partday_forecast(self) -> List[Mapping]:
+        entry = self._partday_entry()
+        return list(entry.value) if entry is not None else []
+
+    def store_partday_forecast(
+        self, entries: Sequence[Mapping]
+    ) -> List[Mapping] | None:
+        stored = self._inner.store_partday_forecast(entries)
+        if stored:
+            self._put(_PARTDAY, tuple(stored))
+        else:
+            self.invalidate(_PARTDAY)
+        return stored
+
+    def partday_updated_at(self) -> datetime | None:
+        entry = self._partday_entry()
+        return entry.updated_at if entry is not None else None
+
+    def get_daily_forecast(self, target_date: date) -> Mapping | None:
+        entry = self._daily_entry(target_date)
+        return entry.value if entry is not None else None
+
+    def daily_updated_at(self, target_date: date) -> datetime | None:
+        entry = self._daily_entry(target_date)
+        return entry.updated_at if entry is not None else None
+
+    def store_daily_forecast(
+        self,
+        target_date: date,
+        min_temp: float,
+        max_temp: float,
+        precipitation: float,
+    ) -> Mapping | None:
+        key = ("daily", target_date)
+        stored = self._inner.store_daily_forecast(
+            target_date, min_temp, max_temp, precipitation
+        )
+        if stored is not None:
+            self._put(key, stored)
+        else:
+            self.invalidate(key)
+        return stored
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _partday_entry(self) -> Optional[L1Entry]:
+        entry = self._get(_PARTDAY)
+        if entry is not None:
+            return entry
+        entries: Tuple[Mapping, ...] = tuple(self._inner.get_partday_forecast())
+        return self._put(_PARTDAY, entries) if entries else None
+
+    def _daily_entry(self, target_date: date) -> Optional[L1Entry]:
+        key = ("daily", target_date)
+        entry = self._get(key)
+        if entry is not None:
+            return entry
+        value = self._inner.get_daily_forecast(target_date)
+        return self._put(key, value) if value is not None else None
+
+    def _get(self, key: Hashable) -> Optional[L1Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: Hashable, value) -> L1Entry:
+        first = value[0] if isinstance(value, tuple) else value
+        entry = L1Entry(
+            value, self._clock() + self._ttl, parse_updated_at(first.get("updated_at"))
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return entry
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Mapping
+
+from domain.watering.entities import InterruptedRun
+from domain.watering.ports import RuntimeJournal
+
+logger = logging.getLogger(__name__)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class FileRuntimeJournal(RuntimeJournal):
+    """Append-only JSON lines journal of the runs owned by the runtime.
+
+    Starts and ends are flushed and fsync'ed. Progress checkpoints arrive in
+    batches (one write for every active task) and are fsync'ed once
+    ``sync_interval`` seconds have passed since the last fsync: after a power
+    loss, a recovered run has lost at most ``sync_interval`` seconds of
+    progress (plus the checkpoint interval of the runtime), and waters that
+    much longer than requested. The file is truncated as soon as no run is
+    left open, and ``compact`` rewrites it atomically with the open runs only.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        sync_interval: float = 15.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._path = path
+        self._sync_interval = sync_interval
+        self._clock = clock
+        self._synced_at = clock()
+        self._lock = threading.Lock()
+        self._open: set[str] = set()
+
+    def record_start(self, task_id: str, duration: int, elapsed: float = 0) -> None:
+        with self._lock:
+            self._open.add(task_id)
+            self._append(
+                [
+                    {
+                        "event": "start",
+                        "task_id": task_id,
+                        "duration": int(duration),
+                        "elapsed": float(elapsed),
+                    }
+                ],
+                sync=True,
+            )
+
+    def record_progress(self, progress: Mapping[str, float]) -> None:
+        if not progress:
+            return
+        with self._lock:
+            self._append(
+                [
+                    {"event": "progress", "task_id": task_id, "elapsed": float(elapsed)}
+                    for task_id, elapsed in progress.items()
+                ],
+                sync=self._clock() - self._synced_at >= self._sync_interval,
+            )
+
+    def record_end(self, task_id: str, status: str) -> None:
+        with self._lock:
+            self._open.discard(task_id)
+            if not self._open:
+                self._truncate()
+                return
+            self._append(
+                [{"event": "end", "task_id": task_id, "status": status}], sync=True
+            )
+
+    def pending(self) -> List[InterruptedRun]:
+        return list(self._read().values())
+
+    def _read(self) -> Dict[str, InterruptedRun]:
+        runs: Dict[str, InterruptedRun] = {}
+        try:
+            with open(self._path, "r", encoding="utf-8") as journal:
+                lines = journal.readlines()
+        except FileNotFoundError:
+            return []
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+                task_id = record["task_id"]
+                seen = datetime.fromisoformat(record["at"])
+            except (ValueError, KeyError, TypeError):
+                # Ligne tronquée par un arrêt brutal : on l'ignore.
+                continue
+            event = record.get("event")
+            if event == "start":
+                runs[task_id] = InterruptedRun(
+                    task_id=task_id,
+                    duration=int(record.get("duration", 0)),
+                    elapsed=float(record.get("elapsed", 0)),
+                    last_seen=seen,
+                )
+            elif event == "progress" and task_id in runs:
+                runs[task_id].elapsed = float(record.get("elapsed", 0))
+                runs[task_id].last_seen = seen
+            elif event == "end":
+                runs.pop(task_id, None)
+        return runs
+
+    def compact(self) -> None:
+        with self._lock:
+            if not self._open:
+                self._truncate()
+                return
+            runs = [run for run in self._read().values() if run.task_id in self._open]
+            payload = "".join(
+                json.dumps(
+                    {
+                        "event": "start",
+                        "task_id": run.task_id,
+                        "duration": run.duration,
+                        "elapsed": run.elapsed,
+                        "at": run.last_seen.isoformat(),
+                    },
+                    separators=(",", ":"),
+                )
+                + "\n"
+                for run in runs
+            )
+            # Copie complète puis remplacement : l'ancien journal reste
+            # lisible tant que le nouveau n'est pas sur disque.
+            tmp_path = f"{self._path}.tmp"
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as journal:
+                    journal.write(payload)
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                os.replace(tmp_path, self._path)
+            except OSError:
+                logger.exception("Unable to compact runtime journal %s", self._path)
+
+    def _append(self, records: List[dict], sync: bool) -> None:
+        at = _utc_now().isoformat()
+        payload = "".join(
+            json.dumps({**record, "at": at}, separators=(",", ":")) + "\n"
+            for record in records
+        )
+        try:
+            with open(self._path, "a", encoding="utf-8") as journal:
+                journal.write(payload)
+                journal.flush()
+                if sync:
+                    os.fsync(journal.fileno())
+                    self._synced_at = self._clock()
+        except OSError:
+            logger.exception("Unable to write runtime journal %s", self._path)
+
+    def _truncate(self) -> None:
+        try:
+            with open(self._path, "w", encoding="utf-8"):
+                pass
+        except OSError:
+            logger.exception("Unable to truncate runtime journal %s", self._path)
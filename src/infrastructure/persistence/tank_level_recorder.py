@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from datetime import timedelta
+from typing import Deque, Dict, Optional, Tuple
+
+from db import db_tank_levels
+from domain.shared.clock import Clock, SystemClock
+from infrastructure.devices.level_sampler import LevelSample
+
+logger = logging.getLogger(__name__)
+
+
+class TankLevelRecorder:
+    """Stores the sampler's readings in ``tank_level_samples``.
+
+    Samples are buffered in memory and written in one insert every
+    ``flush_interval`` seconds; each flush then rolls complete minutes and
+    hours up and, once an hour, applies the retention. If the database is
+    unavailable the buffer is kept, up to ``max_pending`` samples.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 60.0,
+        retention: Optional[Dict[str, timedelta]] = None,
+        max_pending: int = 10_000,
+        clock: Clock | None = None,
+    ) -> None:
+        self._flush_interval = flush_interval
+        self._retention = retention or {}
+        self._clock = clock or SystemClock()
+        self._pending: Deque[Tuple] = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_prune: float | None = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, sample: LevelSample) -> None:
+        with self._lock:
+            self._pending.append((sample.measured_at, sample.level))
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="tank-level-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._flush_interval + 1)
+            self._thread = None
+        self.flush()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+            try:
+                if batch:
+                    db_tank_levels.add_samples(batch)
+                now = self._clock.now()
+                db_tank_levels.downsample(now)
+                self._maybe_prune(now)
+            except Exception:
+                logger.exception("Unable to store tank level samples")
+                with self._lock:
+                    # Les échantillons non écrits repassent devant les nouveaux.
+                    self._pending.extendleft(reversed(batch))
+                return 0
+            return len(batch)
+
+    def _maybe_prune(self, now) -> None:
+        monotonic = self._clock.monotonic()
+        if self._last_prune is not None and monotonic - self._last_prune < 3600:
+            return
+        self._last_prune = monotonic
+        if self._retention:
+            db_tank_levels.prune(now, self._retention)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+from domain.watering.entities import WateringTask
+from domain.watering.ports import WateringTaskRepository
+
+
+class TaskReadModel:
+    """Projection of the active task and the last ``capacity`` tasks by id."""
+
+    def __init__(self, capacity: int = 50) -> None:
+        self._capacity = capacity
+        self._tasks: "OrderedDict[str, WateringTask]" = OrderedDict()
+        self._active_id: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def rebuild(self, tasks: Iterable[WateringTask]) -> None:
+        ordered = sorted(tasks, key=lambda task: task.created_at)
+        with self._lock:
+            self._tasks.clear()
+            self._active_id = None
+            for task in ordered[-self._capacity :]:
+                self._store(task)
+            # La tâche active n'est jamais évincée, même si elle est ancienne.
+            for task in ordered:
+                if task.is_active:
+                    self._tasks.setdefault(task.id, task)
+                    self._active_id = task.id
+
+    def apply(self, task: WateringTask) -> None:
+        with self._lock:
+            self._store(task)
+            while len(self._tasks) > self._capacity:
+                oldest = next(key for key in self._tasks if key != self._active_id)
+                del self._tasks[oldest]
+
+    def get(self, task_id: str) -> Optional[WateringTask]:
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    def active(self) -> Optional[WateringTask]:
+        with self._lock:
+            if self._active_id is None:
+                return None
+            return self._tasks.get(self._active_id)
+
+    def recent(self) -> List[WateringTask]:
+        with self._lock:
+            return list(reversed(self._tasks.values()))
+
+    def _store(self, task: WateringTask) -> None:
+        self._tasks[task.id] = task
+        if task.is_active:
+            self._active_id = task.id
+        elif self._active_id == task.id:
+            self._active_id = None
+
+
+class ReadModelWateringTaskRepository(WateringTaskRepository):
+    """Repository decorator keeping a ``TaskReadModel`` in sync with writes.
+
+    Active-task and by-id reads are answered from memory; writes go to the
+    wrapped repository, then the affected task is reloaded into the model.
+    """
+
+    def __init__(
+        self, inner: WateringTaskRepository, read_model: TaskReadModel
+    ) -> None:
+        self._inner = inner
+        self._read_model = read_model
+
+    @property
+    def read_model(self) -> TaskReadModel:
+        return self._read_model
+
+    def rebuild(self) -> None:
+        tasks = self._inner.list_recent(self._read_model.capacity)
+        active = self._inner.get_active_task()
+        if active is not None:
+            tasks.append(active)
+        self._read_model.rebuild(tasks)
+
+    def add(
+        self, duration: int, status: str, created_at: Optional[datetime] = None
+    ) -> str:
+        task_id = self._inner.add(duration, status, created_at)
+        self._refresh(task_id)
+        return task_id
+
+    def get(self, task_id: str) -> Optional[WateringTask]:
+        task = self._read_model.get(task_id)
+        if task is not None:
+            return task
+        # Tâche plus ancienne que la projection : lecture en base.
+        return self._inner.get(task_id)
+
+    def get_active_task(self) -> Optional[WateringTask]:
+        return self._read_model.active()
+
+    def list_all(self) -> List[WateringTask]:
+        return self._inner.list_all()
+
+    def list_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+        status: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[WateringTask]:
+        return self._inner.list_page(limit, after, status, start, end)
+
+    def list_recent(self, limit: int) -> List[WateringTask]:
+        return self._read_model.recent()[:limit]
+
+    def update_status(
+        self, task_id: str, status: str, error: Optional[str] = None
+    ) -> None:
+        self._inner.update_status(task_id, status, error)
+        self._refresh(task_id)
+
+    def clear_active_tasks(self, keep: Iterable[str] = ()) -> None:
+        self._inner.clear_active_tasks(keep=keep)
+        self.rebuild()
+
+    def _refresh(self, task_id: str) -> None:
+        # Appelé une fois l'écriture validée par le dépôt enveloppé : la
+        # projection ne montre jamais une tâche qu'un rollback effacerait.
+        task = self._inner.get(task_id)
+        if task is not None:
+            self._read_model.apply(task)
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, List, Optional, Tuple
 
+from domain.shared.clock import Clock, SystemClock
+from domain.shared.exceptions import DomainError
 from domain.watering.entities import TaskStatus, WateringTask
 from domain.watering.ports import WateringTaskRepository
 
 from db import db_tasks
+from db.database import commit_unit_of_work
 
 
 def _as_datetime(value) -> datetime:
@@ -16,10 +19,23 @@ def _as_datetime(value) -> datetime:
 
 
 class SqlAlchemyWateringTaskRepository(WateringTaskRepository):
+    def __init__(self, clock: Clock | None = None) -> None:
+        self._clock = clock or SystemClock()
+
     def add(
         self, duration: int, status: str, created_at: Optional[datetime] = None
     ) -> str:
-        return db_tasks.add_task(duration, status, created_at)
+        try:
+            task_id = db_tasks.add_task(
+                duration, status, created_at or self._clock.now()
+            )
+        except db_tasks.ActiveTaskExists:
+            raise DomainError("Watering is already in progress.") from None
+        # Validée avant que l'appelant ne démarre l'arrosage ou ne mette à
+        # jour la projection : le thread du runtime relit la tâche dans sa
+        # propre session, et un échec de la requête ne doit pas l'effacer.
+        commit_unit_of_work()
+        return task_id
 
     def get(self, task_id: str) -> Optional[WateringTask]:
         task = db_tasks.get_task(task_id)
@@ -36,14 +52,39 @@ class SqlAlchemyWateringTaskRepository(WateringTaskRepository):
     def list_all(self) -> List[WateringTask]:
         return [self._to_entity(task) for task in db_tasks.get_all_tasks()]
 
+    def list_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, str]] = None,
+        status: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[WateringTask]:
+        after_created_at, after_id = after if after else (None, None)
+        rows = db_tasks.get_tasks_page(
+            limit, after_created_at, after_id, status, start, end
+        )
+        return [self._to_entity(task) for task in rows]
+
+    def list_recent(self, limit: int) -> List[WateringTask]:
+        return [self._to_entity(task) for task in db_tasks.get_recent_tasks(limit)]
+
     def update_status(
         self, task_id: str, status: str, error: Optional[str] = None
     ) -> None:
-        db_tasks.update_status(task_id, status)
+        try:
+            db_tasks.update_status(task_id, status, self._clock.now())
+        except db_tasks.ActiveTaskExists:
+            raise DomainError("Watering is already in progress.") from None
+        commit_unit_of_work()
 
-    def clear_active_tasks(self) -> None:
+    def clear_active_tasks(self, keep: Iterable[str] = ()) -> None:
+        kept = set(keep)
         for task in db_tasks.get_tasks_by_status(TaskStatus.IN_PROGRESS.value):
-            db_tasks.update_status(task.id, TaskStatus.CANCELED.value)
+            if task.id not in kept:
+                db_tasks.update_status(
+                    task.id, TaskStatus.CANCELED.value, self._clock.now()
+                )
 
     def _to_entity(self, task) -> WateringTask:
         return WateringTask(
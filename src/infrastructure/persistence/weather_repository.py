@@ -6,25 +6,34 @@ from typing import List, Mapping, Sequence
 from domain.weather.ports import ForecastCache
 
 from db import db_forecast_data, db_weather_data
+from db.database import unit_of_work
+
+
+def _daily_entry(record) -> Mapping:
+    return {
+        "temperature_2m_min": record.min_temp,
+        "temperature_2m_max": record.max_temp,
+        "precipitation_sum": record.precipitation,
+        "updated_at": record.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+    }
 
 
 class SqlForecastCache(ForecastCache):
     def get_partday_forecast(self) -> List[Mapping]:
         return db_forecast_data.get_forecast()
 
-    def store_partday_forecast(self, entries: Sequence[Mapping]) -> None:
-        db_forecast_data.add_forecast_data(list(entries))
+    def store_partday_forecast(self, entries: Sequence[Mapping]) -> List[Mapping]:
+        with unit_of_work():
+            db_forecast_data.add_forecast_data(list(entries))
+            # Relu dans la même transaction : les jours inchangés gardent
+            # leur created_at.
+            return db_forecast_data.get_forecast()
 
     def get_daily_forecast(self, target_date: date) -> Mapping | None:
         record = db_weather_data.get_weather_data_by_date(target_date)
         if not record:
             return None
-        return {
-            "temperature_2m_min": record.min_temp,
-            "temperature_2m_max": record.max_temp,
-            "precipitation_sum": record.precipitation,
-            "updated_at": record.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-        }
+        return _daily_entry(record)
 
     def store_daily_forecast(
         self,
@@ -32,5 +41,11 @@ class SqlForecastCache(ForecastCache):
         min_temp: float,
         max_temp: float,
         precipitation: float,
-    ) -> None:
-        db_weather_data.add_weather_data(target_date, min_temp, max_temp, precipitation)
+    ) -> Mapping | None:
+        with unit_of_work():
+            data_id = db_weather_data.add_weather_data(
+                target_date, min_temp, max_temp, precipitation
+            )
+            # Même session : l'enregistrement vient de la map d'identité.
+            record = db_weather_data.get_weather_data(data_id)
+            return _daily_entry(record) if record else None
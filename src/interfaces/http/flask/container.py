@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Callable
 
+import config.config as local_config
 from application.configuration.service import ConfigurationService
 from application.weather.queries import WeatherQueries
 from application.watering.handlers import (
@@ -12,35 +13,90 @@ from application.watering.handlers import (
 from application.watering.runtime import WateringRuntime
 from application.watering.queries import WateringQueries
 from domain.watering.policies import WateringPolicy
-from domain.watering.ports import DeviceController
+from domain.watering.ports import DeviceController, WateringTaskRepository
 from domain.watering.services import WateringTaskManager
 from datetime import timedelta
 
+from domain.weather.ports import ForecastCache
 from domain.weather.services import ForecastService
 from infrastructure.configuration.file_repository import FileConfigurationRepository
 from infrastructure.devices.controllers import (
     DeviceTankLevelSensor,
     create_device_controller,
 )
+from infrastructure.external.http_client import HttpClient
 from infrastructure.external.open_meteo_client import OpenMeteoClient
+from infrastructure.persistence.memory_forecast_cache import MemoryForecastCache
+from infrastructure.persistence.runtime_journal import FileRuntimeJournal
+from infrastructure.persistence.tank_level_recorder import TankLevelRecorder
+from infrastructure.persistence.task_read_model import (
+    ReadModelWateringTaskRepository,
+    TaskReadModel,
+)
 from infrastructure.persistence.watering_task_repository import (
     SqlAlchemyWateringTaskRepository,
 )
 from infrastructure.persistence.weather_repository import SqlForecastCache
+from interfaces.ipc.client import (
+    RemoteDeviceController,
+    RemoteWateringRuntime,
+    RuntimeDaemonClient,
+)
 
 
 @dataclass(slots=True)
 class ServiceContainer:
     configuration_service: ConfigurationService
     device_controller: DeviceController
-    watering_repository: SqlAlchemyWateringTaskRepository
+    watering_repository: WateringTaskRepository
     forecast_service: ForecastService
-    watering_runtime: WateringRuntime
+    watering_runtime: WateringRuntime | RemoteWateringRuntime
     watering_queries: WateringQueries
     start_watering_handler: StartManualWateringHandler
     stop_watering_handler: StopWateringHandler
     weather_queries: WeatherQueries
     ttl_provider: Callable[[], timedelta] | None
+    forecast_cache: ForecastCache | None = None
+    http_client: HttpClient | None = None
+    level_recorder: TankLevelRecorder | None = None
+
+
+def build_watering_runtime(
+    controller: DeviceController,
+    watering_repository: WateringTaskRepository,
+) -> WateringRuntime:
+    runtime = WateringRuntime(
+        controller,
+        watering_repository,
+        journal=FileRuntimeJournal(
+            local_config.RUNTIME_JOURNAL_PATH,
+            sync_interval=local_config.JOURNAL_SYNC_INTERVAL,
+        ),
+        checkpoint_interval=local_config.JOURNAL_CHECKPOINT_INTERVAL,
+    )
+    # Les arrosages interrompus depuis moins de RESUME_GRACE_SECONDS reprennent
+    # pour leur durée restante ; les autres tâches en cours sont annulées.
+    resumed = runtime.recover(timedelta(seconds=local_config.RESUME_GRACE_SECONDS))
+    watering_repository.clear_active_tasks(keep=resumed)
+    return runtime
+
+
+def build_level_recorder(controller: DeviceController) -> TankLevelRecorder | None:
+    """Enregistre les lectures du sampler, dans le processus qui le possède."""
+    subscribe = getattr(controller, "subscribe_samples", None)
+    if not local_config.TANK_LEVEL_RECORDING or subscribe is None:
+        return None
+    recorder = TankLevelRecorder(
+        flush_interval=local_config.TANK_LEVEL_FLUSH_INTERVAL,
+        retention={
+            "raw": timedelta(hours=local_config.TANK_LEVEL_RAW_RETENTION_HOURS),
+            "1m": timedelta(days=local_config.TANK_LEVEL_MINUTE_RETENTION_DAYS),
+            "1h": timedelta(days=local_config.TANK_LEVEL_HOUR_RETENTION_DAYS),
+        },
+    )
+    subscribe(recorder.record)
+    recorder.start()
+    return recorder
 
 
 def build_container(
@@ -50,22 +106,51 @@ def build_container(
     configuration_repository = FileConfigurationRepository()
     configuration_service = ConfigurationService(configuration_repository)
 
-    controller = create_device_controller()
+    watering_repository: WateringTaskRepository = SqlAlchemyWateringTaskRepository()
+    level_recorder = None
+
+    if local_config.RUNTIME_SOCKET:
+        # Le démon matériel possède les GPIO et le runtime : chaque worker
+        # web n'en est qu'un client.
+        client = RuntimeDaemonClient(
+            local_config.RUNTIME_SOCKET, timeout=local_config.RUNTIME_SOCKET_TIMEOUT
+        )
+        controller = RemoteDeviceController(client)
+        runtime = RemoteWateringRuntime(client)
+    else:
+        # Toutes les écritures passent par ce processus : /api/task et
+        # /api/tasks/<id> sont servis depuis la projection en mémoire.
+        watering_repository = ReadModelWateringTaskRepository(
+            watering_repository, TaskReadModel(local_config.TASK_READ_MODEL_SIZE)
+        )
+        watering_repository.rebuild()
+        controller = create_device_controller()
+        level_recorder = build_level_recorder(controller)
+        runtime = build_watering_runtime(controller, watering_repository)
     tank_sensor = DeviceTankLevelSensor(controller)
 
-    watering_repository = SqlAlchemyWateringTaskRepository()
-    watering_repository.clear_active_tasks()
-
-    forecast_cache = SqlForecastCache()
-    forecast_provider = OpenMeteoClient()
+    forecast_cache = MemoryForecastCache(
+        SqlForecastCache(),
+        ttl=local_config.FORECAST_L1_TTL,
+        max_entries=local_config.FORECAST_L1_SIZE,
+    )
+    # Session HTTP partagée (pool keep-alive) : fermée par app.shutdown
+    http_client = HttpClient(
+        retries=local_config.OPEN_METEO_RETRIES,
+        backoff=local_config.OPEN_METEO_BACKOFF,
+    )
+    connect_timeout = local_config.OPEN_METEO_CONNECT_TIMEOUT
+    forecast_provider = OpenMeteoClient(
+        http_client,
+        daily_timeout=(connect_timeout, local_config.OPEN_METEO_DAILY_TIMEOUT),
+        forecast_timeout=(connect_timeout, local_config.OPEN_METEO_FORECAST_TIMEOUT),
+    )
     forecast_service = ForecastService(
         forecast_provider,
         forecast_cache,
         ttl=ttl or timedelta(minutes=30),
     )
 
-    runtime = WateringRuntime(controller, watering_repository)
-
     def build_policy() -> WateringPolicy:
         config = configuration_service.load()
         enabled_months = config.get("enabled_months", list(range(1, 13)))
@@ -99,4 +184,7 @@ def build_container(
         stop_watering_handler=stop_handler,
         weather_queries=weather_queries,
         ttl_provider=ttl_provider,
+        forecast_cache=forecast_cache,
+        http_client=http_client,
+        level_recorder=level_recorder,
     )
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+
+
+def parse_bound(value: str | None, end: bool = False) -> datetime | None:
+    """Date (YYYY-MM-DD, borne de fin incluse) ou horodatage ISO-8601."""
+    if not value:
+        return None
+    if len(value) == 10:
+        day = date.fromisoformat(value)
+        if end:
+            day += timedelta(days=1)
+        return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def parse_day(value: str | None) -> date | None:
+    """Date YYYY-MM-DD ; ValueError si le format est invalide."""
+    if not value:
+        return None
+    return date.fromisoformat(value)
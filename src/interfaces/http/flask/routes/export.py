@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from typing import Callable, Iterable, Iterator, Sequence
+
+from flask import Blueprint, Response, jsonify, request
+
+from db import db_tasks, db_weather_data
+from interfaces.http.flask.params import parse_bound, parse_day
+from utils.serializer import to_iso_utc
+
+bp = Blueprint("export", __name__)
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+# Taille des blocs envoyés au client (avant compression)
+CHUNK_SIZE = 64 * 1024
+
+TASK_COLUMNS = ("id", "status", "duration", "created_at", "updated_at")
+WEATHER_COLUMNS = (
+    "date",
+    "min_temp",
+    "max_temp",
+    "precipitation",
+    "created_at",
+    "updated_at",
+)
+
+
+def _task_record(row) -> tuple:
+    return (
+        row.id,
+        row.status,
+        row.duration,
+        to_iso_utc(row.created_at),
+        to_iso_utc(row.updated_at),
+    )
+
+
+def _weather_record(row) -> tuple:
+    return (
+        row.date.isoformat(),
+        row.min_temp,
+        row.max_temp,
+        row.precipitation,
+        to_iso_utc(row.created_at),
+        to_iso_utc(row.updated_at),
+    )
+
+
+def _csv_lines(columns: Sequence[str], records: Iterable[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _ndjson_lines(columns: Sequence[str], records: Iterable[tuple]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(dict(zip(columns, record)), ensure_ascii=False) + "\n"
+
+
+def _chunks(lines: Iterable[str]) -> Iterator[bytes]:
+    # Regroupe les lignes : un write() réseau par bloc, pas par ligne.
+    parts, size = [], 0
+    for line in lines:
+        parts.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(parts).encode("utf-8")
+            parts, size = [], 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+def _gzipped(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # en-tête gzip
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _export(
+    name: str,
+    columns: Sequence[str],
+    rows: Iterable,
+    to_record: Callable[[object], tuple],
+):
+    fmt = request.args.get("format", "csv")
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Unsupported format: {fmt}"}), 400
+
+    lines = (_csv_lines if fmt == "csv" else _ndjson_lines)(
+        columns, (to_record(row) for row in rows)
+    )
+    body = _chunks(lines)
+    filename = f"{name}.{fmt}"
+    mimetype = FORMATS[fmt]
+    if request.args.get("gzip") in ("1", "true"):
+        body = _gzipped(body)
+        filename += ".gz"
+        mimetype = "application/gzip"
+    return Response(
+        body,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@bp.route("/api/export/tasks")
+def export_tasks():
+    try:
+        start = parse_bound(request.args.get("from"))
+        end = parse_bound(request.args.get("to"), end=True)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    rows = db_tasks.iter_tasks(start, end, request.args.get("status") or None)
+    return _export("tasks", TASK_COLUMNS, rows, _task_record)
+
+
+@bp.route("/api/export/weather")
+def export_weather():
+    try:
+        start = parse_day(request.args.get("from"))
+        end = parse_day(request.args.get("to"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    rows = db_weather_data.iter_weather_data(start, end)
+    return _export("weather", WEATHER_COLUMNS, rows, _weather_record)
@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 
-from flask import Blueprint, current_app, jsonify, request
+from flask import Blueprint, current_app, jsonify, request, url_for
 from flask_babel import gettext as _
 
+import config.config as local_config
+
 from application.watering.commands import (
     StartManualWateringCommand,
     StopWateringCommand,
 )
+from application.watering.queries import ListTasksQuery
+from db import db_tank_levels
 from domain.shared.exceptions import DomainError
 from interfaces.http.flask.container import ServiceContainer
-from utils.serializer import task_to_dict
+from interfaces.http.flask.params import parse_bound
+from utils.serializer import task_to_dict, to_iso_utc
 
 bp = Blueprint("watering", __name__)
 
@@ -26,6 +31,56 @@ def water_level():
     return {"level": int(level * 25)}
 
 
+@bp.route("/api/water-level/history")
+def water_level_history():
+    return (
+        jsonify(
+            [
+                {
+                    "level": int(snapshot.level_percent),
+                    "measured_at": to_iso_utc(snapshot.measured_at),
+                }
+                for snapshot in container().device_controller.level_history()
+            ]
+        ),
+        200,
+    )
+
+
+@bp.route("/api/water-level/samples")
+def water_level_samples():
+    """Niveau stocké (tank_level_samples) sur [from, to[, 24 h par défaut."""
+    resolution = request.args.get("resolution") or None
+    if resolution is not None and resolution not in db_tank_levels.RESOLUTIONS:
+        return jsonify({"error": f"Unknown resolution: {resolution}"}), 400
+    try:
+        end = parse_bound(request.args.get("to"), end=True)
+        start = parse_bound(request.args.get("from"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(days=1)
+
+    resolution, samples = db_tank_levels.get_samples(start, end, resolution)
+    return (
+        jsonify(
+            {
+                "resolution": resolution,
+                "samples": [
+                    {
+                        "measured_at": to_iso_utc(sample.measured_at),
+                        "level": round(sample.level * 25, 1),
+                        "min_level": sample.min_level * 25,
+                        "max_level": sample.max_level * 25,
+                    }
+                    for sample in samples
+                ],
+            }
+        ),
+        200,
+    )
+
+
 @bp.route("/api/water-levels")
 def water_levels():
     return jsonify(container().device_controller.debug_water_levels()), 200
@@ -48,7 +103,27 @@ def classify_watering():
 
 @bp.route("/api/tasks")
 def task_list():
-    return jsonify(container().watering_queries.list_tasks()), 200
+    try:
+        limit = int(request.args.get("limit", local_config.TASKS_PAGE_SIZE))
+        query = ListTasksQuery(
+            limit=max(1, min(limit, local_config.TASKS_PAGE_SIZE_MAX)),
+            cursor=request.args.get("cursor") or None,
+            status=request.args.get("status") or None,
+            start=parse_bound(request.args.get("from")),
+            end=parse_bound(request.args.get("to"), end=True),
+        )
+        tasks, next_cursor = container().watering_queries.list_tasks(query)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    response = jsonify(tasks)
+    if next_cursor:
+        # Le corps reste une liste : le curseur suivant passe par les en-têtes.
+        args = {**request.args.to_dict(), "cursor": next_cursor}
+        response.headers["X-Next-Cursor"] = next_cursor
+        next_url = url_for("watering.task_list", **args)
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response, 200
 
 
 @bp.route("/api/tasks/<task_id>")
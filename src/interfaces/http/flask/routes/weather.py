@@ -14,12 +14,21 @@ def container() -> ServiceContainer:
     return current_app.config["container"]
 
 
+def _with_age(response, target_date: date | None = None):
+    # Age : secondes depuis le dernier rafraîchissement (l'entrée peut être
+    # servie expirée pendant son rafraîchissement en arrière-plan).
+    age = container().forecast_service.refresh_age(target_date)
+    if age is not None:
+        response.age = int(age)
+    return response
+
+
 @bp.route("/api/forecast")
 def forecast():
     try:
         data, from_cache = container().weather_queries.partday_forecast()
         status_code = 200 if from_cache else 201
-        return jsonify(data[:5]), status_code
+        return _with_age(jsonify(data[:5])), status_code
     except Exception as exc:  # pragma: no cover - defensive
         return (
             jsonify(
@@ -40,9 +49,10 @@ def forecast():
 @bp.route("/api/forecast-minmax-precip")
 def forecast_minmax_precip():
     try:
-        data, from_cache = container().weather_queries.daily_forecast(date.today())
+        today = date.today()
+        data, from_cache = container().weather_queries.daily_forecast(today)
         status_code = 200 if from_cache else 201
-        return jsonify(data), status_code
+        return _with_age(jsonify(data), today), status_code
     except Exception as exc:  # pragma: no cover - defensive
         return (
             jsonify(
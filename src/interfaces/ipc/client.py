@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import socket
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from domain.shared.exceptions import ApplicationError, DomainError
+from domain.watering.entities import TankLevelSnapshot, WateringTask
+from domain.watering.ports import DeviceController
+
+from . import protocol
+
+
+class RuntimeDaemonClient:
+    """Client of the hardware daemon, one short-lived connection per call.
+
+    A connection is never shared, so the client is safe across gunicorn
+    workers (forks) and threads.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 5.0) -> None:
+        self._socket_path = socket_path
+        self._timeout = timeout
+
+    def call(self, op: str, **params: Any) -> Any:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(self._timeout)
+                conn.connect(self._socket_path)
+                conn.sendall(protocol.encode({"op": op, **params}))
+                with conn.makefile("rb") as stream:
+                    line = stream.readline(protocol.MAX_MESSAGE_SIZE)
+        except OSError as exc:
+            raise ApplicationError(f"Runtime daemon unavailable: {exc}") from exc
+        if not line:
+            raise ApplicationError("Runtime daemon closed the connection")
+        if protocol.is_truncated(line):
+            raise ApplicationError("Runtime daemon response too large")
+
+        response = protocol.decode(line)
+        if response.get("ok"):
+            return response.get("result")
+        if response.get("kind") == protocol.KIND_DOMAIN:
+            raise DomainError(response.get("error"))
+        raise ApplicationError(response.get("error"))
+
+
+def _resolved(client: RuntimeDaemonClient, op: str) -> Future:
+    future: Future = Future()
+    try:
+        future.set_result(client.call(op))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+class RemoteDeviceController(DeviceController):
+    def __init__(self, client: RuntimeDaemonClient) -> None:
+        self._client = client
+
+    def setup(self) -> None:
+        self._client.call("setup")
+
+    def open_water(self) -> Future:
+        # Le démon répond dès que la séquence est confiée à son acteur.
+        return _resolved(self._client, "open_water")
+
+    def close_water(self) -> Future:
+        return _resolved(self._client, "close_water")
+
+    def get_level(self) -> float:
+        return float(self._client.call("level"))
+
+    def debug_water_levels(self) -> Dict[str, Any]:
+        return self._client.call("water_levels")
+
+    def level_history(self) -> List[TankLevelSnapshot]:
+        return [
+            TankLevelSnapshot(
+                level_percent=item["level_percent"],
+                measured_at=datetime.fromisoformat(
+                    item["measured_at"].replace("Z", "+00:00")
+                ),
+            )
+            for item in self._client.call("level_history")
+        ]
+
+    def subscribe_level_changes(self, callback: Callable[[float], None]) -> None:
+        # Les fronts de niveau sont traités par le runtime du démon.
+        return None
+
+    def cleanup(self) -> None:
+        # Le démon reste propriétaire des GPIO après l'arrêt d'un worker.
+        return None
+
+
+class RemoteWateringRuntime:
+    """Same surface as WateringRuntime, executed by the hardware daemon."""
+
+    def __init__(self, client: RuntimeDaemonClient) -> None:
+        self._client = client
+
+    def start(self, task: WateringTask, elapsed: float = 0) -> None:
+        self._client.call(
+            "start", task_id=task.id, duration=task.duration, elapsed=elapsed
+        )
+
+    def stop_all(self) -> list[str]:
+        return list(self._client.call("stop_all"))
+
+    def cancel_task(self, task_id: str) -> bool:
+        return bool(self._client.call("cancel", task_id=task_id))
+
+    def pause(self, task_id: str) -> bool:
+        return bool(self._client.call("pause", task_id=task_id))
+
+    def resume(self, task_id: str) -> bool:
+        return bool(self._client.call("resume", task_id=task_id))
+
+    def extend(self, task_id: str, seconds: float) -> bool:
+        return bool(self._client.call("extend", task_id=task_id, seconds=seconds))
+
+    def remaining(self, task_id: str) -> Optional[float]:
+        return self._client.call("remaining", task_id=task_id)
+
+    def is_active(self, task_id: str) -> bool:
+        return task_id in self.active_task_ids()
+
+    def active_task_ids(self) -> List[str]:
+        return [item["task_id"] for item in self.status()["active"]]
+
+    def status(self) -> Dict[str, Any]:
+        return self._client.call("status")
@@ -0,0 +1,65 @@
+"""Démon matériel : possède les GPIO et le runtime d'arrosage.
+
+   Les workers web s'y connectent via RUNTIME_SOCKET.
+   Usage: python -m interfaces.ipc.daemon"""
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import config.config as local_config  # noqa: E402
+from infrastructure.devices.controllers import create_device_controller  # noqa: E402
+from infrastructure.persistence.watering_task_repository import (  # noqa: E402
+    SqlAlchemyWateringTaskRepository,
+)
+from interfaces.http.flask.container import (  # noqa: E402
+    build_level_recorder,
+    build_watering_runtime,
+)
+from interfaces.ipc.server import RuntimeDaemonServer  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    environment = os.environ.get("FLASK_ENV", "production")
+    logging.basicConfig(
+        level=logging.DEBUG if environment == "development" else logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+    if not local_config.RUNTIME_SOCKET:
+        raise SystemExit("RUNTIME_SOCKET is not set")
+
+    controller = create_device_controller()
+    level_recorder = build_level_recorder(controller)
+    repository = SqlAlchemyWateringTaskRepository()
+    runtime = build_watering_runtime(controller, repository)
+    server = RuntimeDaemonServer(
+        local_config.RUNTIME_SOCKET, controller, runtime, repository
+    )
+
+    def terminate(signum, _frame) -> None:
+        logger.info("Received signal %s, stopping runtime daemon", signum)
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.shutdown()
+        if level_recorder is not None:
+            level_recorder.stop()
+        controller.cleanup()
+
+
+if __name__ == "__main__":
+    main()
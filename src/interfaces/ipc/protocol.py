@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict
+
+# Une requête et une réponse par ligne JSON sur la socket Unix.
+ENCODING = "utf-8"
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+KIND_DOMAIN = "domain"
+KIND_APPLICATION = "application"
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode(ENCODING)
+
+
+def is_truncated(line: bytes) -> bool:
+    """Ligne coupée par ``readline(MAX_MESSAGE_SIZE)`` avant son retour."""
+    return len(line) >= MAX_MESSAGE_SIZE and not line.endswith(b"\n")
+
+
+def decode(line: bytes) -> Dict[str, Any]:
+    message = json.loads(line.decode(ENCODING))
+    if not isinstance(message, dict):
+        raise ValueError("IPC message must be a JSON object")
+    return message
+
+
+def success(result: Any = None) -> Dict[str, Any]:
+    return {"ok": True, "result": result}
+
+
+def failure(error: str, kind: str = KIND_APPLICATION) -> Dict[str, Any]:
+    return {"ok": False, "error": error, "kind": kind}
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import logging
+import os
+import socketserver
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict
+
+from db.database import unit_of_work
+from domain.shared.exceptions import DomainError
+from domain.watering.entities import TaskStatus, WateringTask
+from domain.watering.ports import DeviceController, WateringTaskRepository
+from utils.serializer import to_iso_utc
+
+from . import protocol
+
+logger = logging.getLogger(__name__)
+
+
+class RuntimeDaemonServer:
+    """Serves the device controller and the watering runtime on a Unix socket.
+
+    Each connection carries JSON lines, one response per request; connections
+    are handled on their own thread so a slow client never blocks the runtime.
+    """
+
+    def __init__(
+        self,
+        socket_path: str,
+        controller: DeviceController,
+        runtime,
+        repository: WateringTaskRepository,
+    ) -> None:
+        self._socket_path = socket_path
+        self._controller = controller
+        self._runtime = runtime
+        self._repository = repository
+        self._server: socketserver.ThreadingUnixStreamServer | None = None
+        self._thread: threading.Thread | None = None
+        self._operations: Dict[str, Callable[..., Any]] = {
+            "ping": lambda: "pong",
+            "setup": controller.setup,
+            "open_water": lambda: self._submit(controller.open_water()),
+            "close_water": lambda: self._submit(controller.close_water()),
+            "level": controller.get_level,
+            "water_levels": controller.debug_water_levels,
+            "level_history": self._level_history,
+            "start": self._start,
+            "stop_all": runtime.stop_all,
+            "cancel": runtime.cancel_task,
+            "pause": runtime.pause,
+            "resume": runtime.resume,
+            "extend": runtime.extend,
+            "remaining": runtime.remaining,
+            "status": self._status,
+        }
+
+    def start(self) -> None:
+        self._bind()
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="runtime-daemon", daemon=True
+        )
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        self._bind()
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        if self._server is None:
+            return
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join(timeout=5)
+        self._server.server_close()
+        self._server = None
+        try:
+            os.unlink(self._socket_path)
+        except FileNotFoundError:
+            pass
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        params = dict(request)
+        operation = self._operations.get(params.pop("op", None))
+        if operation is None:
+            return protocol.failure(f"Unknown operation: {request.get('op')}")
+        try:
+            with unit_of_work():
+                return protocol.success(operation(**params))
+        except DomainError as exc:
+            return protocol.failure(str(exc), protocol.KIND_DOMAIN)
+        except Exception as exc:
+            logger.exception("IPC operation %s failed", request.get("op"))
+            return protocol.failure(str(exc))
+
+    def _bind(self) -> None:
+        # Socket orpheline laissée par un arrêt brutal du démon.
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+        self._server = socketserver.ThreadingUnixStreamServer(
+            self._socket_path, self._handler_class()
+        )
+        self._server.daemon_threads = True
+        os.chmod(self._socket_path, 0o660)
+        logger.info("Runtime daemon listening on %s", self._socket_path)
+
+    def _handler_class(self):
+        server = self
+
+        class _Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                while True:
+                    line = self.rfile.readline(protocol.MAX_MESSAGE_SIZE)
+                    if not line:
+                        return
+                    if protocol.is_truncated(line):
+                        # La suite de la ligne serait lue comme une requête :
+                        # on répond une erreur et on ferme la connexion.
+                        self.wfile.write(
+                            protocol.encode(protocol.failure("Request too large"))
+                        )
+                        self.wfile.flush()
+                        return
+                    try:
+                        response = server.dispatch(protocol.decode(line))
+                    except ValueError as exc:
+                        response = protocol.failure(f"Invalid request: {exc}")
+                    self.wfile.write(protocol.encode(response))
+                    self.wfile.flush()
+
+        return _Handler
+
+    def _submit(self, handle) -> None:
+        # L'appelant n'attend pas la temporisation vanne/pompe.
+        handle.add_done_callback(_log_actuation_error)
+
+    def _start(
+        self, task_id: str, duration: int, elapsed: float = 0
+    ) -> Dict[str, Any]:
+        # La tâche est décrite par le client : sa transaction n'est peut-être
+        # pas encore validée quand le démon la reçoit.
+        if int(duration) <= 0:
+            raise DomainError("Invalid duration")
+        now = datetime.now(timezone.utc)
+        task = WateringTask(
+            id=task_id,
+            duration=int(duration),
+            status=TaskStatus.IN_PROGRESS,
+            created_at=now,
+            updated_at=now,
+        )
+        self._runtime.start(task, elapsed=elapsed)
+        return {"task_id": task.id}
+
+    def _level_history(self):
+        return [
+            {
+                "level_percent": snapshot.level_percent,
+                "measured_at": to_iso_utc(snapshot.measured_at),
+            }
+            for snapshot in self._controller.level_history()
+        ]
+
+    def _status(self) -> Dict[str, Any]:
+        return {
+            "active": [
+                {"task_id": task_id, "remaining": self._runtime.remaining(task_id)}
+                for task_id in self._runtime.active_task_ids()
+            ],
+            "level": self._controller.get_level(),
+        }
+
+
+def _log_actuation_error(handle) -> None:
+    if handle.exception() is not None:
+        logger.error("Water actuation failed: %s", handle.exception())
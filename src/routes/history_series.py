@@ -1,17 +1,46 @@
 # routes/history_series.py
 
-from flask import Blueprint, jsonify, request
-from sqlalchemy import func, cast, Float, Integer
-from datetime import date, datetime, timedelta, time
+from flask import Blueprint, current_app, request
+from sqlalchemy import func, cast, literal_column, Date, Float, Integer
+from datetime import date, timedelta
 
+import config.config as local_config
 from db.db_tasks import get_session
-from db.models import (
-    Task,
-    WeatherData,
-)  # ForecastStats.date = Date, Task.created_at = DateTime
+from db.history_cache import current_version, history_cache, range_etag
+from db.models import DailyWateringStats, WeatherData
 
 bp = Blueprint("history_series", __name__)
 
+BUCKETS = ("day", "week", "month")
+# Nombre de jours maximal par granularité (5 ans en semaines ou en mois)
+MAX_DAYS = {"day": 365, "week": 5 * 366, "month": 5 * 366}
+
+
+def _bucket_start(column, bucket: str, dialect: str):
+    """Premier jour du seau (lundi pour ``week``) contenant ``column``.
+
+    Sans paramètre lié : l'expression est répétée telle quelle dans GROUP BY.
+    """
+    if bucket == "day":
+        return column
+    if dialect == "sqlite":
+        if bucket == "month":
+            return func.date(column, literal_column("'start of month'"), type_=Date)
+        # dimanche suivant (ou le jour même), puis lundi de la même semaine
+        return func.date(
+            column,
+            literal_column("'weekday 0'"),
+            literal_column("'-6 days'"),
+            type_=Date,
+        )
+    if dialect == "postgresql":
+        return cast(func.date_trunc(literal_column(f"'{bucket}'"), column), Date)
+    # MySQL / MariaDB
+    if bucket == "month":
+        offset = func.dayofmonth(column) - literal_column("1")
+        return func.subdate(column, offset, type_=Date)
+    return func.subdate(column, func.weekday(column), type_=Date)
+
 
 def _parse_date_ymd(s: str | None) -> date | None:
     if not s:
@@ -29,7 +58,10 @@ def history_series():
         days = int(request.args.get("days", 15))
     except ValueError:
         days = 15
-    days = max(1, min(days, 365))
+    bucket = request.args.get("bucket", "day")
+    if bucket not in BUCKETS:
+        bucket = "day"
+    days = max(1, min(days, MAX_DAYS[bucket]))
 
     today = date.today()
     end_date = _parse_date_ymd(request.args.get("end")) or today
@@ -37,54 +69,82 @@ def history_series():
         end_date = today
     start_date = end_date - timedelta(days=days - 1)
 
-    # bornes temporelles pour filtrer les DATETIME (intervalle semi-ouvert [start_dt, end_dt_next))
-    start_dt = datetime.combine(start_date, time.min)  # 00:00:00
-    end_dt_next = datetime.combine(
-        end_date + timedelta(days=1), time.min
-    )  # jour suivant 00:00:00
-
+    # ETag tiré du compteur history_version (une lecture par clé primaire) :
+    # toute écriture, quel que soit le processus, l'incrémente et invalide
+    # donc le cache.
+    key = (start_date, end_date, bucket)
     with get_session() as s:
-        # 1) Agrégation des tâches complétées par jour (DATE(Task.created_at))
-        tasks_agg_sq = (
-            s.query(
-                func.date(Task.created_at).label("day"),
-                cast(func.sum(Task.duration), Integer).label("duration_sec"),
-                cast(func.count(), Integer).label("runs"),
-            )
-            .filter(Task.status == "completed")
-            .filter(Task.created_at >= start_dt)
-            .filter(Task.created_at < end_dt_next)
-            .group_by(func.date(Task.created_at))
-        ).subquery()
+        etag = range_etag(key, current_version(s))
 
-        # 2) Plage météo + LEFT JOIN sur la clé DATE
+    entry = history_cache.get(key)
+    if entry is None or entry.etag != etag:
+        if etag in request.if_none_match:
+            body = ""  # 304 : le corps n'est pas envoyé
+        else:
+            payload = _series_payload(start_date, end_date, days, bucket)
+            body = current_app.json.dumps(payload)
+            entry = history_cache.put(key, body, etag, live=end_date >= today)
+    else:
+        body = entry.body
+
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    settled = today - timedelta(days=local_config.HISTORY_CACHE_SETTLED_DAYS)
+    if end_date < settled:
+        response.cache_control.public = True
+        response.cache_control.max_age = local_config.HISTORY_CACHE_MAX_AGE
+    else:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def _series_payload(start_date: date, end_date: date, days: int, bucket: str):
+    with get_session() as s:
+        # Parcours de plage sur weather_data, joint à l'agrégat journalier
+        # (daily_watering_stats) : coût indépendant du nombre de tâches. Les
+        # semaines et les mois sont agrégés en SQL : une ligne par seau.
+        period = _bucket_start(WeatherData.date, bucket, s.get_bind().dialect.name)
         rows = (
             s.query(
-                WeatherData.date.label("day"),
-                cast(WeatherData.min_temp, Float).label("min_temp"),
-                cast(WeatherData.max_temp, Float).label("max_temp"),
-                cast(WeatherData.precipitation, Float).label("precip_mm"),
-                cast(func.coalesce(tasks_agg_sq.c.duration_sec, 0), Integer).label(
-                    "duration_sec"
-                ),
-                cast(func.coalesce(tasks_agg_sq.c.runs, 0), Integer).label("runs"),
+                period.label("day"),
+                cast(func.min(WeatherData.min_temp), Float).label("min_temp"),
+                cast(func.max(WeatherData.max_temp), Float).label("max_temp"),
+                cast(
+                    func.avg((WeatherData.min_temp + WeatherData.max_temp) / 2), Float
+                ).label("mean_temp"),
+                cast(func.sum(WeatherData.precipitation), Float).label("precip_mm"),
+                cast(
+                    func.sum(func.coalesce(DailyWateringStats.total_seconds, 0)),
+                    Integer,
+                ).label("duration_sec"),
+                cast(
+                    func.sum(func.coalesce(DailyWateringStats.completed_runs, 0)),
+                    Integer,
+                ).label("runs"),
             )
-            .outerjoin(tasks_agg_sq, tasks_agg_sq.c.day == WeatherData.date)
+            .outerjoin(DailyWateringStats, DailyWateringStats.day == WeatherData.date)
             .filter(WeatherData.date >= start_date)
             .filter(WeatherData.date <= end_date)
-            .order_by(WeatherData.date)
+            .group_by(period)
+            .order_by(period)
             .all()
         )
 
-        # 3) Pour le bouton "-15j" : plus ancienne date météo disponible
-        oldest_date = s.query(func.min(WeatherData.date)).scalar()
-        has_prev = bool(oldest_date and oldest_date < start_date)
+        # Pour le bouton "-15j" : existe-t-il une date météo plus ancienne ?
+        has_prev = (
+            s.query(WeatherData.date)
+            .filter(WeatherData.date < start_date)
+            .limit(1)
+            .first()
+            is not None
+        )
 
     data = [
         {
             "day": r.day.isoformat() if r.day else None,
             "min_temp": float(r.min_temp) if r.min_temp is not None else None,
             "max_temp": float(r.max_temp) if r.max_temp is not None else None,
+            "mean_temp": round(r.mean_temp, 1) if r.mean_temp is not None else None,
             "precip_mm": float(r.precip_mm) if r.precip_mm is not None else 0.0,
             "duration_min": round((r.duration_sec or 0) / 60, 1),
             "runs": int(r.runs or 0),
@@ -94,15 +154,14 @@ def history_series():
 
     prev_end = (start_date - timedelta(days=1)) if has_prev else None
 
-    return jsonify(
-        {
-            "meta": {
-                "days": days,
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat(),
-                "has_prev": has_prev,
-                "prev_end": prev_end.isoformat() if prev_end else None,
-            },
-            "data": data,
-        }
-    )
+    return {
+        "meta": {
+            "days": days,
+            "bucket": bucket,
+            "start": start_date.isoformat(),
+            "end": end_date.isoformat(),
+            "has_prev": has_prev,
+            "prev_end": prev_end.isoformat() if prev_end else None,
+        },
+        "data": data,
+    }
@@ -0,0 +1,209 @@
+"""Agrégation par tranche de journée, par plages d'indices.
+
+Même résultat que ``weather.aggregate_by_partday``, sans parser chaque
+horodatage ni construire de listes d'indices : une série horaire régulière
+(cas d'Open-Meteo) est découpée une fois en plages contiguës (jour,
+tranche), et chaque plage est réduite par tranches de listes (sum, min, max,
+list.count en C). Une série irrégulière (heure manquante ou doublée) passe
+par un parcours heure par heure, cumuls dans des tableaux typés (``array``).
+"""
+
+from __future__ import annotations
+
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from services.weather import wmo_icon_text
+
+# (nom, première heure, heure de fin exclue) ; les heures hors tranche
+# sont ignorées
+PartDayWindows = Tuple[Tuple[str, int, int], ...]
+PARTDAY_WINDOWS: PartDayWindows = (
+    ("night", 0, 6),
+    ("morning", 6, 12),
+    ("afternoon", 12, 18),
+    ("evening", 18, 24),
+)
+
+
+HOUR_LABELS = [f"{hour:02d}" for hour in range(24)]
+
+
+@lru_cache(maxsize=8)
+def hour_slots(windows: PartDayWindows = PARTDAY_WINDOWS) -> array:
+    """Table heure (0-23) -> indice de tranche, -1 hors tranche."""
+    slots = array("b", [-1] * 24)
+    for index, (_, start, end) in enumerate(windows):
+        for hour in range(start, end):
+            slots[hour] = index
+    return slots
+
+
+def aggregate_partday_columns(
+    data, windows: PartDayWindows = PARTDAY_WINDOWS
+) -> List[dict]:
+    hourly = data["hourly"]
+    times = hourly["time"]
+    runs = _contiguous_runs(times, tuple(windows))
+    if runs is None:
+        return _aggregate_by_hour(hourly, tuple(windows))
+
+    codes = hourly["weather_code"]
+    temps = hourly["temperature_2m"]
+    precips = hourly["precipitation"]
+    names = [name for name, _, _ in windows]
+    out = []
+    for day, cells in runs:
+        row = {"date": day, "temp_min": None, "temp_max": None}
+        day_min = day_max = None
+        for name, cell in zip(names, cells):
+            if cell is None:
+                row[f"{name}_icon"] = "—"
+                row[f"{name}_precip_mm"] = 0.0
+                row[f"{name}_temp_avg"] = None
+                continue
+
+            start, end = cell
+            cell_temps = temps[start:end]
+            if None in cell_temps:
+                cell_temps = [temp for temp in cell_temps if temp is not None]
+            cell_precips = precips[start:end]
+            if None in cell_precips:
+                cell_precips = [precip for precip in cell_precips if precip]
+            icon, text = wmo_icon_text(_dominant(codes[start:end]))
+
+            row[f"{name}_icon"] = icon
+            row[f"{name}_text"] = text
+            row[f"{name}_precip_mm"] = round(sum(cell_precips), 1)
+            if cell_temps:
+                row[f"{name}_temp_avg"] = round(sum(cell_temps) / len(cell_temps), 1)
+                low, high = min(cell_temps), max(cell_temps)
+                day_min = low if day_min is None or low < day_min else day_min
+                day_max = high if day_max is None or high > day_max else day_max
+            else:
+                row[f"{name}_temp_avg"] = None
+        if day_min is not None:
+            row["temp_min"] = round(day_min, 1)
+            row["temp_max"] = round(day_max, 1)
+        out.append(row)
+    return out
+
+
+def _dominant(codes: Sequence) -> int:
+    # Code le plus fréquent ; à égalité, le plus sévère (le plus grand)
+    return max(set(codes), key=lambda code: (codes.count(code), code))
+
+
+def _dominant_count(counts: Dict[int, int]) -> int:
+    return max(counts.items(), key=lambda item: (item[1], item[0]))[0]
+
+
+def _contiguous_runs(
+    times: Sequence[str], windows: PartDayWindows
+) -> Optional[List[Tuple[str, List[Optional[Tuple[int, int]]]]]]:
+    """Découpe une série horaire régulière en plages d'indices
+    ``(jour, [(début, fin) ou None par tranche])``, sans parcourir chaque
+    heure en Python ; None si la série n'est pas régulière (heure manquante
+    ou doublée, changement d'heure), auquel cas on agrège heure par heure."""
+    if not times:
+        return []
+    first_hour = int(times[0][11:13])
+    count = len(times)
+    expected = (HOUR_LABELS * (count // 24 + 2))[first_hour : first_hour + count]
+    if [time[11:13] for time in times] != expected:
+        return None
+
+    runs = []
+    for day_start in range(-first_hour, count, 24):
+        first, last = max(day_start, 0), min(day_start + 24, count) - 1
+        day = times[first][:10]
+        if times[last][:10] != day or (runs and runs[-1][0] >= day):
+            return None
+        cells = []
+        for _, start_hour, end_hour in windows:
+            start = max(day_start + start_hour, first)
+            end = min(day_start + end_hour, last + 1)
+            cells.append((start, end) if start < end else None)
+        if any(cells):
+            runs.append((day, cells))
+    return runs
+
+
+def _aggregate_by_hour(hourly, windows: PartDayWindows) -> List[dict]:
+    """Chemin général, heure par heure, cumuls dans des tableaux typés."""
+    names: Sequence[str] = [name for name, _, _ in windows]
+    width = len(names)
+    slots = hour_slots(windows)
+
+    days: Dict[str, int] = {}
+    hours = array("i")  # heures par (jour, tranche)
+    temp_sum = array("d")
+    temp_count = array("i")
+    precip_sum = array("d")
+    codes: List[Dict[int, int]] = []
+    day_min = array("d")
+    day_max = array("d")
+
+    for time, code, temp, precip in zip(
+        hourly["time"],
+        hourly["weather_code"],
+        hourly["temperature_2m"],
+        hourly["precipitation"],
+    ):
+        slot = slots[int(time[11:13])]  # "YYYY-MM-DDTHH:MM"
+        if slot < 0:
+            continue
+        day = time[:10]
+        index = days.get(day)
+        if index is None:
+            index = days[day] = len(days)
+            hours.extend([0] * width)
+            temp_sum.extend([0.0] * width)
+            temp_count.extend([0] * width)
+            precip_sum.extend([0.0] * width)
+            codes.extend({} for _ in range(width))
+            day_min.append(float("inf"))
+            day_max.append(float("-inf"))
+
+        cell = index * width + slot
+        hours[cell] += 1
+        counts = codes[cell]
+        counts[code] = counts.get(code, 0) + 1
+        if precip:
+            precip_sum[cell] += precip
+        if temp is not None:
+            temp_sum[cell] += temp
+            temp_count[cell] += 1
+            if temp < day_min[index]:
+                day_min[index] = temp
+            if temp > day_max[index]:
+                day_max[index] = temp
+
+    out = []
+    for day, index in sorted(days.items()):
+        has_temp = day_min[index] <= day_max[index]
+        row = {
+            "date": day,
+            "temp_min": round(day_min[index], 1) if has_temp else None,
+            "temp_max": round(day_max[index], 1) if has_temp else None,
+        }
+        for slot, name in enumerate(names):
+            cell = index * width + slot
+            if not hours[cell]:
+                row[f"{name}_icon"] = "—"
+                row[f"{name}_precip_mm"] = 0.0
+                row[f"{name}_temp_avg"] = None
+                continue
+
+            counts = codes[cell]
+            icon, text = wmo_icon_text(_dominant_count(counts))
+            count = temp_count[cell]
+            row[f"{name}_icon"] = icon
+            row[f"{name}_text"] = text
+            row[f"{name}_precip_mm"] = round(precip_sum[cell], 1)
+            row[f"{name}_temp_avg"] = (
+                round(temp_sum[cell] / count, 1) if count else None
+            )
+        out.append(row)
+    return out
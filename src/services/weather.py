@@ -51,16 +51,27 @@ def wmo_icon_text(code: int):
     return WMO.get(code, ("❔", _("Unknown weather code")))
 
 
-def fetch_open_meteo(lat, lon, days=7):
+HOURLY_VARIABLES = "weather_code,cloudcover,temperature_2m,precipitation"
+DAILY_VARIABLES = "temperature_2m_max,temperature_2m_min,precipitation_sum"
+
+
+def fetch_open_meteo(lat, lon, days=7, daily=None, client=None, timeout=15):
+    """Prévisions horaires, et journalières si ``daily`` liste des variables
+    (une seule requête pour les deux). ``client`` : HttpClient partagé
+    (connexions gardées ouvertes, requêtes conditionnelles, reprises)."""
     url = "https://api.open-meteo.com/v1/forecast"
     params = {
         "latitude": lat,
         "longitude": lon,
-        "hourly": "weather_code,cloudcover,temperature_2m,precipitation",
+        "hourly": HOURLY_VARIABLES,
         "forecast_days": days,
         "timezone": "Europe/Paris",
     }
-    r = requests.get(url, params=params, timeout=15)
+    if daily:
+        params["daily"] = daily
+    if client is not None:
+        return client.get_json(url, params=params, timeout=timeout)
+    r = requests.get(url, params=params, timeout=timeout)
     r.raise_for_status()
     return r.json()
 
@@ -0,0 +1,84 @@
+"""Doublures partagées par les tests et les scripts de benchmark."""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from domain.shared.exceptions import DomainError
+from domain.watering.entities import TaskStatus, WateringTask
+from domain.watering.ports import WateringTaskRepository
+
+
+class InMemoryRepository(WateringTaskRepository):
+    """Dépôt de tâches en mémoire.
+
+    ``statuses`` garde le dernier statut reçu par tâche ; ``updated`` est
+    levé à chaque mise à jour et ``wait`` attend celle d'une tâche donnée.
+    """
+
+    def __init__(self, tasks=()) -> None:
+        self.tasks: Dict[str, WateringTask] = {task.id: task for task in tasks}
+        self.statuses: Dict[str, str] = {}
+        self.updated = threading.Event()
+        self._events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self, duration: int, status: str, created_at: Optional[datetime] = None
+    ) -> str:
+        now = created_at or datetime.now(timezone.utc)
+        task = WateringTask(
+            id=str(uuid.uuid4()),
+            duration=int(duration),
+            status=TaskStatus(status),
+            created_at=now,
+            updated_at=now,
+        )
+        with self._lock:
+            # Même règle que la contrainte unique du dépôt SQL
+            if task.status is TaskStatus.IN_PROGRESS and self._active() is not None:
+                raise DomainError("Watering is already in progress.")
+            self.tasks[task.id] = task
+        return task.id
+
+    def get(self, task_id: str) -> Optional[WateringTask]:
+        return self.tasks.get(task_id)
+
+    def get_active_task(self) -> Optional[WateringTask]:
+        with self._lock:
+            return self._active()
+
+    def list_all(self) -> List[WateringTask]:
+        return list(self.tasks.values())
+
+    def update_status(
+        self, task_id: str, status: str, error: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            task = self.tasks.get(task_id)
+            if task is not None:
+                task.status = (
+                    TaskStatus(status)
+                    if status in TaskStatus._value2member_map_
+                    else TaskStatus.ERROR
+                )
+                task.updated_at = datetime.now(timezone.utc)
+                task.error = error
+            self.statuses[task_id] = status
+            event = self._events.setdefault(task_id, threading.Event())
+        event.set()
+        self.updated.set()
+
+    def wait(self, task_id: str, timeout: float) -> bool:
+        with self._lock:
+            event = self._events.setdefault(task_id, threading.Event())
+        return event.wait(timeout)
+
+    def _active(self) -> Optional[WateringTask]:
+        return next(
+            (t for t in self.tasks.values() if t.status is TaskStatus.IN_PROGRESS),
+            None,
+        )
@@ -0,0 +1,55 @@
+import time
+
+from infrastructure.devices.actuator import ActuatorSequencer, WaterState
+
+
+class RecordingControl:
+    def __init__(self):
+        self.calls = []
+
+    def setValve(self, opened):
+        self.calls.append(("valve", opened))
+
+    def setPump(self, running):
+        self.calls.append(("pump", running))
+
+
+def test_open_returns_immediately_and_runs_sequence():
+    control = RecordingControl()
+    actuator = ActuatorSequencer(control, settle_delay=0.2)
+
+    started = time.monotonic()
+    opening = actuator.open()
+    assert time.monotonic() - started < 0.05
+
+    assert opening.result(timeout=2) == WaterState.OPEN
+    assert control.calls == [("valve", True), ("pump", True)]
+
+    assert actuator.close().result(timeout=2) == WaterState.CLOSED
+    assert control.calls[2:] == [("pump", False), ("valve", False)]
+    actuator.stop()
+
+
+def test_concurrent_requests_are_coalesced():
+    control = RecordingControl()
+    actuator = ActuatorSequencer(control, settle_delay=0.2)
+    actuator.open().result(timeout=2)
+
+    closings = [actuator.close() for _ in range(5)]
+    assert all(c.result(timeout=2) == WaterState.CLOSED for c in closings)
+    assert control.calls.count(("pump", False)) == 1
+    assert control.calls.count(("valve", False)) == 1
+    actuator.stop()
+
+
+def test_close_while_opening_never_starts_pump():
+    control = RecordingControl()
+    actuator = ActuatorSequencer(control, settle_delay=0.5)
+
+    opening = actuator.open()
+    closing = actuator.close()
+
+    assert closing.result(timeout=2) == WaterState.CLOSED
+    assert opening.result(timeout=2) == WaterState.CLOSED
+    assert ("pump", True) not in control.calls
+    actuator.stop()
@@ -5,7 +5,7 @@ from dotenv import load_dotenv
 from app import app
 from config import config as local_config
 import db.db_weather_data as db_weather_data
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone
 
 
 def pytest_configure(config):
@@ -58,6 +58,8 @@ def test_minmax_temperature_precip_cache(client):
     db_weather_data.delete_weather_data_by_date(
         date.today()
     )  # Supprime les données si elles existent
+    # Suppression hors du cache : le cache mémoire l'ignore jusqu'à son échéance
+    app.config["container"].forecast_cache.clear()
     response1 = client.get("/api/forecast-minmax-precip")
     assert response1.status_code == 201
     data1 = response1.get_json()
@@ -79,6 +81,8 @@ def test_minmax_temperature_precip_cache_ttl(client, monkeypatch):
     db_weather_data.delete_weather_data_by_date(
         date.today()
     )  # Supprime les données si elles existent
+    # Suppression hors du cache : le cache mémoire l'ignore jusqu'à son échéance
+    app.config["container"].forecast_cache.clear()
 
     # Mock le TTL à 1 secondes
     monkeypatch.setattr("app.TTL", timedelta(seconds=1))
@@ -87,10 +91,15 @@ def test_minmax_temperature_precip_cache_ttl(client, monkeypatch):
     assert response1.status_code in [201]
     data1 = response1.get_json()
     time.sleep(2)  # Attendre plus longtemps que le TTL
+    # L'entrée expirée est servie tout de suite (200), avec son âge...
+    stale = client.get("/api/forecast-minmax-precip")
+    assert stale.status_code == 200
+    assert stale.get_json() == data1
+    assert stale.age >= timedelta(seconds=1)
+    # ... pendant qu'un worker la rafraîchit
+    app.config["container"].forecast_service.wait_for_refreshes(timeout=30)
     response2 = client.get("/api/forecast-minmax-precip")
-    assert response2.status_code in [
-        201
-    ]  # Devrait être 201 car les données sont rafraîchies
+    assert response2.status_code == 200
     data2 = response2.get_json()
 
     def _without_updated_at(payload):
@@ -142,12 +151,19 @@ def test_forecast_data_TTL(client, monkeypatch):
     # Mock le TTL à 1 secondes
     monkeypatch.setattr("app.TTL", timedelta(seconds=1))
     time.sleep(2)
+    # Expirées : servies depuis le cache, rafraîchies en arrière-plan
     response = client.get("/api/forecast")
-    assert response.status_code in [201]
+    assert response.status_code in [200]
+    assert response.age >= timedelta(seconds=1)
     data = response.get_json()
     assert isinstance(data, list)
     assert len(data) >= 5
 
+    app.config["container"].forecast_service.wait_for_refreshes(timeout=30)
+    response = client.get("/api/forecast")
+    assert response.status_code in [200]
+    assert response.age < timedelta(seconds=2)
+
 
 def test_watering_type(client):
     response = client.get("/api/watering-type")
@@ -262,6 +278,73 @@ def test_tasks_endpoint(client):
         assert isinstance(task["created_at"], str)
 
 
+def test_tasks_endpoint_pagination(client):
+    from db.db_tasks import add_task
+
+    created = [
+        add_task(10, "completed", created_at=datetime(2001, 5, day, tzinfo=timezone.utc))
+        for day in (1, 2, 3)
+    ]
+    params = "from=2001-05-01&to=2001-05-03&limit=2"
+
+    response = client.get(f"/api/tasks?{params}")
+    assert response.status_code == 200
+    assert [t["id"] for t in response.get_json()] == [created[2], created[1]]
+    cursor = response.headers["X-Next-Cursor"]
+    assert 'rel="next"' in response.headers["Link"]
+
+    response = client.get(f"/api/tasks?{params}&cursor={cursor}")
+    assert [t["id"] for t in response.get_json()] == [created[0]]
+    assert "X-Next-Cursor" not in response.headers
+
+    assert client.get("/api/tasks?cursor=not-a-cursor").status_code == 400
+
+
+def test_history_series_reads_daily_stats(client):
+    from db.db_tasks import add_task, update_status
+
+    started = datetime(2002, 4, 1, 7, tzinfo=timezone.utc)
+    for day in (date(2002, 4, 1), date(2002, 4, 2)):
+        db_weather_data.add_weather_data(day, 8.0, 21.0, 0.0)
+    task_id = add_task(90, "in progress", created_at=started)
+    update_status(task_id, "completed", updated_at=started + timedelta(seconds=90))
+
+    response = client.get("/api/history/series?end=2002-04-02&days=2")
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+    assert [(d["day"], d["runs"], d["duration_min"]) for d in data] == [
+        ("2002-04-01", 1, 1.5),
+        ("2002-04-02", 0, 0.0),
+    ]
+
+
+def test_history_series_buckets(client):
+    from db.db_tasks import add_task, update_status
+
+    first = date(2003, 3, 3)  # lundi
+    for offset in range(14):
+        db_weather_data.add_weather_data(
+            first + timedelta(days=offset), float(offset), 20.0 + offset, 1.0
+        )
+    started = datetime(2003, 3, 12, 7, tzinfo=timezone.utc)
+    task_id = add_task(120, "in progress", created_at=started)
+    update_status(task_id, "completed", updated_at=started + timedelta(seconds=120))
+
+    response = client.get("/api/history/series?end=2003-03-16&days=14&bucket=week")
+    payload = response.get_json()
+    assert payload["meta"]["bucket"] == "week"
+    assert [
+        (d["day"], d["min_temp"], d["max_temp"], d["precip_mm"], d["runs"])
+        for d in payload["data"]
+    ] == [("2003-03-03", 0.0, 26.0, 7.0, 0), ("2003-03-10", 7.0, 33.0, 7.0, 1)]
+    assert payload["data"][1]["duration_min"] == 2.0
+    assert payload["data"][0]["mean_temp"] == 13.0
+
+    response = client.get("/api/history/series?end=2003-03-16&days=1500&bucket=month")
+    assert response.get_json()["meta"]["days"] == 1500
+    assert [d["day"] for d in response.get_json()["data"]][-1] == "2003-03-01"
+
+
 def test_task_current(client):
     response = client.get("/api/task")
     assert response.status_code in [200, 404]
@@ -280,3 +363,116 @@ def test_task_current(client):
     if response.status_code == 404:
         assert data is not None
         assert data["task_id"] is None
+
+
+def test_history_series_cache_and_etag(client):
+    from db.db_tasks import add_task
+    from db.history_cache import history_cache
+
+    history_cache.clear()
+    day = date(2004, 6, 1)
+    db_weather_data.add_weather_data(day, 10.0, 20.0, 0.0)
+    url = "/api/history/series?end=2004-06-01&days=1"
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert response.cache_control.max_age == local_config.HISTORY_CACHE_MAX_AGE
+    assert response.get_json()["data"][0]["runs"] == 0
+
+    revalidated = client.get(url, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+
+    # Une tâche sur ce jour invalide les plages qui le contiennent
+    add_task(60, "completed", created_at=datetime(2004, 6, 1, 8, tzinfo=timezone.utc))
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["data"][0]["runs"] == 1
+    assert response.headers["ETag"] != etag
+
+
+def test_history_series_sees_writes_from_other_processes(client):
+    from sqlalchemy import text
+
+    from db.database import engine
+
+    day = date(2004, 7, 1)
+    db_weather_data.add_weather_data(day, 10.0, 20.0, 0.0)
+    url = "/api/history/series?end=2004-07-01&days=1"
+    etag = client.get(url).headers["ETag"]
+
+    # Écriture d'un autre processus (démon, autre worker, dataget.py) : elle
+    # incrémente history_version dans sa transaction, comme dataget.py
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE weather_data SET max_temp = 25 WHERE date = :day"),
+            {"day": day},
+        )
+        conn.execute(
+            text("UPDATE history_version SET version = version + 1 WHERE id = 1")
+        )
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["data"][0]["max_temp"] == 25.0
+
+    # Les derniers jours ne sont jamais servis en cache public
+    response = client.get("/api/history/series?days=3")
+    assert response.cache_control.no_cache
+    assert response.cache_control.max_age is None
+
+
+def test_export_tasks_csv_and_ndjson(client):
+    import csv
+    import gzip
+    import io
+    import json
+
+    from db.db_tasks import add_task
+
+    created = [
+        add_task(30 + day, "completed", datetime(2005, 7, day, tzinfo=timezone.utc))
+        for day in (1, 2, 3)
+    ]
+    response = client.get("/api/export/tasks?from=2005-07-02&to=2005-07-03")
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row["id"] for row in rows] == created[1:]
+    assert rows[0]["created_at"] == "2005-07-02T00:00:00Z"
+
+    response = client.get(
+        "/api/export/tasks?from=2005-07-01&to=2005-07-01&format=ndjson&gzip=1"
+    )
+    assert "tasks.ndjson.gz" in response.headers["Content-Disposition"]
+    lines = gzip.decompress(response.get_data()).decode().splitlines()
+    assert [json.loads(line)["duration"] for line in lines] == [31]
+
+    assert client.get("/api/export/tasks?format=xml").status_code == 400
+
+
+def test_export_weather(client):
+    import json
+
+    db_weather_data.add_weather_data(date(2005, 8, 1), 12.5, 24.0, 1.5)
+    response = client.get(
+        "/api/export/weather?from=2005-08-01&to=2005-08-01&format=ndjson"
+    )
+    (line,) = response.get_data(as_text=True).splitlines()
+    assert json.loads(line)["date"] == "2005-08-01"
+    assert json.loads(line)["max_temp"] == 24.0
+    assert client.get("/api/export/weather?from=yesterday").status_code == 400
+
+
+def test_water_level_samples(client):
+    from db import db_tank_levels
+
+    t0 = datetime(2005, 8, 1, 6, tzinfo=timezone.utc)
+    db_tank_levels.add_samples([(t0, 2), (t0 + timedelta(seconds=30), 4)])
+    response = client.get(
+        "/api/water-level/samples?from=2005-08-01T06:00:00Z"
+        "&to=2005-08-01T07:00:00Z"
+    )
+    data = response.get_json()
+    assert data["resolution"] == "raw"
+    assert [s["level"] for s in data["samples"]] == [50.0, 100.0]
+
+    assert client.get("/api/water-level/samples?resolution=5m").status_code == 400
@@ -62,3 +62,23 @@ def test_add_forecast_data(db):
     assert data[0]["created_at"] is not None
     assert data[0]["updated_at"] is not None
     assert data[0]["created_at"] == data[0]["updated_at"]
+
+
+def test_add_forecast_data_rewrites_only_changed_days(db):
+    db_forecast_data.add_forecast_data(forecast_data)
+    before = {row["date"]: row for row in db_forecast_data.get_forecast()}
+
+    later = "2099-01-01 00:00:00"
+    refreshed = [dict(entry, updated_at=later) for entry in forecast_data]
+    refreshed[1] = dict(refreshed[1], temp_max=40.0)
+    db_forecast_data.add_forecast_data(refreshed[:-1])
+
+    after = {row["date"]: row for row in db_forecast_data.get_forecast()}
+    # Jour absent du nouveau lot : supprimé
+    assert forecast_data[-1]["date"] not in after
+    unchanged = after[forecast_data[0]["date"]]
+    assert unchanged["created_at"] == before[forecast_data[0]["date"]]["created_at"]
+    assert unchanged["updated_at"] == later
+    changed = after[forecast_data[1]["date"]]
+    assert changed["temp_max"] == 40.0
+    assert changed["created_at"] == changed["updated_at"] == later
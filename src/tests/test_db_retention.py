@@ -0,0 +1,91 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from dotenv import load_dotenv
+from sqlalchemy import func, select
+from sqlalchemy.sql import text
+
+from db.database import get_session
+from db.db_retention import archive_tasks, run_retention
+from db.db_tasks import add_task, get_task, get_tasks_page, iter_tasks
+from db.db_watering_stats import get_daily_stats, rebuild_daily_stats
+from db.models import ForecastData, Task, TaskArchive
+
+NOW = datetime(2025, 7, 1, 3, 0, tzinfo=timezone.utc)
+
+
+def pytest_configure(config):
+    # Charger le .env.test en priorité
+    load_dotenv(dotenv_path=".env.test", override=True)
+
+
+@pytest.fixture(autouse=True)
+def db():
+    tables = ["tasks", "tasks_archive", "daily_watering_stats", "forecast_data"]
+    with get_session() as s:
+        for table in tables:
+            s.execute(text(f"DELETE FROM {table}"))
+        s.commit()
+    yield
+    with get_session() as s:
+        for table in tables:
+            s.execute(text(f"DELETE FROM {table}"))
+        s.commit()
+
+
+def _count(model) -> int:
+    with get_session() as s:
+        return s.scalar(select(func.count()).select_from(model))
+
+
+def test_archive_tasks_in_batches():
+    old = [
+        add_task(60, "completed", NOW - timedelta(days=400, hours=i)) for i in range(5)
+    ]
+    recent = add_task(60, "completed", NOW - timedelta(days=3))
+    stuck = add_task(60, "in progress", NOW - timedelta(days=500))
+
+    assert archive_tasks(NOW - timedelta(days=365), batch_size=2, now=NOW) == 5
+    assert _count(Task) == 2
+    assert _count(TaskArchive) == 5
+    # Relance : plus rien à archiver
+    assert archive_tasks(NOW - timedelta(days=365), batch_size=2) == 0
+
+    # Lectures transparentes : tâche, page et export voient l'archive
+    assert get_task(old[0]).status == "completed"
+    assert [t.id for t in get_tasks_page(10)] == [recent, *old, stuck]
+    assert len(list(iter_tasks())) == 7
+    last = get_tasks_page(2)[-1]
+    page = get_tasks_page(2, last.created_at, last.id)
+    assert [t.id for t in page] == old[1:3]
+
+
+def test_archived_tasks_stay_in_daily_stats():
+    day = NOW - timedelta(days=400)
+    add_task(60, "completed", day)
+    archive_tasks(NOW - timedelta(days=365))
+
+    (stats,) = get_daily_stats(day.date(), day.date())
+    assert stats.completed_runs == 1
+    rebuild_daily_stats()
+    (stats,) = get_daily_stats(day.date(), day.date())
+    assert stats.completed_runs == 1
+
+
+def test_run_retention_purges_forecast_and_optimizes():
+    add_task(60, "completed", NOW - timedelta(days=30))
+    with get_session() as s:
+        for offset in (-2, 0, 1):
+            s.add(
+                ForecastData(
+                    date=date(2025, 7, 1) + timedelta(days=offset),
+                    temp_min=10,
+                    temp_max=20,
+                )
+            )
+        s.commit()
+
+    counts = run_retention(NOW, task_retention_days=7, batch_size=10)
+    assert counts == {"tasks": 1, "forecast_data": 1}
+    assert _count(ForecastData) == 2
+    assert run_retention(NOW, task_retention_days=0)["tasks"] == 0
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from dotenv import load_dotenv
+from sqlalchemy.sql import text
+
+from db.database import get_session
+from db.db_tank_levels import add_samples, downsample, get_samples, prune
+from domain.shared.clock import SimulatedClock
+from infrastructure.devices.level_sampler import LevelSample
+from infrastructure.persistence.tank_level_recorder import TankLevelRecorder
+
+T0 = datetime(2025, 7, 1, 6, 0, tzinfo=timezone.utc)
+
+
+def pytest_configure(config):
+    # Charger le .env.test en priorité
+    load_dotenv(dotenv_path=".env.test", override=True)
+
+
+@pytest.fixture(autouse=True)
+def db():
+    with get_session() as s:
+        s.execute(text("DELETE FROM tank_level_samples"))
+        s.commit()
+
+
+def test_downsample_minutes_and_hours():
+    # 2 h de relevés toutes les 15 s : niveau 2 puis 3 à partir de 7 h
+    add_samples(
+        (T0 + timedelta(seconds=15 * i), 2 if i < 240 else 3) for i in range(480)
+    )
+
+    written = downsample(T0 + timedelta(hours=2, seconds=30))
+    assert written == {"1m": 120, "1h": 2}
+
+    _, hours = get_samples(T0, T0 + timedelta(hours=2), "1h")
+    assert [(h.level, h.min_level, h.max_level, h.samples) for h in hours] == [
+        (2.0, 2, 2, 240),
+        (3.0, 3, 3, 240),
+    ]
+
+    # Reprise un seau avant le dernier stocké : seule cette fenêtre est relue
+    assert downsample(T0 + timedelta(hours=2, seconds=30)) == {"1m": 2, "1h": 2}
+
+
+def test_downsample_aggregates_late_sample_behind_watermark():
+    add_samples((T0 + timedelta(seconds=15 * i), 2) for i in range(8))
+    downsample(T0 + timedelta(minutes=2))
+
+    # Échantillon en retard pour le premier seau, déjà agrégé
+    add_samples([(T0 + timedelta(seconds=50), 0)])
+    downsample(T0 + timedelta(minutes=2))
+
+    _, minutes = get_samples(T0, T0 + timedelta(minutes=2), "1m")
+    assert [(m.min_level, m.samples) for m in minutes] == [(0, 5), (2, 4)]
+
+
+def test_downsample_skips_incomplete_bucket():
+    add_samples([(T0, 1), (T0 + timedelta(seconds=30), 3)])
+    assert downsample(T0 + timedelta(seconds=45)) == {"1m": 0, "1h": 0}
+
+    downsample(T0 + timedelta(minutes=1))
+    _, minutes = get_samples(T0, T0 + timedelta(minutes=1), "1m")
+    assert [(m.level, m.min_level, m.max_level) for m in minutes] == [(2.0, 1, 3)]
+
+
+def test_get_samples_picks_resolution_from_span():
+    add_samples([(T0, 2)])
+    assert get_samples(T0, T0 + timedelta(hours=1))[0] == "raw"
+    assert get_samples(T0, T0 + timedelta(hours=12))[0] == "1m"
+    assert get_samples(T0, T0 + timedelta(days=7))[0] == "1h"
+
+
+def test_prune_applies_retention_per_resolution():
+    add_samples((T0 + timedelta(minutes=i), 2) for i in range(10))
+    downsample(T0 + timedelta(minutes=10))
+
+    deleted = prune(T0 + timedelta(minutes=15), {"raw": timedelta(minutes=10)})
+    assert deleted == 5
+    assert len(get_samples(T0, T0 + timedelta(hours=1), "raw")[1]) == 5
+    assert len(get_samples(T0, T0 + timedelta(hours=1), "1m")[1]) == 10
+
+
+def test_recorder_flush_writes_batch_and_rollups():
+    clock = SimulatedClock(T0)
+    recorder = TankLevelRecorder(clock=clock)
+    for i in range(8):
+        recorder.record(
+            LevelSample(
+                mask=0b11,
+                monotonic=15 * i,
+                measured_at=T0 + timedelta(seconds=15 * i),
+            )
+        )
+
+    clock.advance(120)
+    assert recorder.flush() == 8
+    assert recorder.flush() == 0
+    _, minutes = get_samples(T0, T0 + timedelta(minutes=2), "1m")
+    assert [m.samples for m in minutes] == [4, 4]
@@ -1,14 +1,22 @@
+import threading
+
 import pytest
 from sqlalchemy.sql import text
 from dotenv import load_dotenv
 from db.db_tasks import (
+    ActiveTaskExists,
     get_connection,
     add_task,
     get_all_tasks,
     update_status,
     get_task,
     get_tasks_by_status,
+    get_tasks_page,
 )
+from db.database import SessionLocal, unit_of_work
+from db.models import Task
+from db.db_watering_stats import get_daily_stats, rebuild_daily_stats
+from datetime import datetime, timedelta, timezone
 
 
 def pytest_configure(config):
@@ -20,7 +28,7 @@ def pytest_configure(config):
 def db(monkeypatch):
     # Nettoyage : supprime les données de toutes les tables
     with get_connection() as s:
-        tables = ["tasks"]
+        tables = ["tasks", "tasks_archive"]
         for table in tables:
             s.execute(text(f"DELETE FROM {table}"))
         s.commit()
@@ -41,7 +49,7 @@ def test_add_task(db):
 
 
 def test_get_all_tasks(db):
-    task_id1 = add_task(10, "in progress")
+    task_id1 = add_task(10, "completed")
     task_id2 = add_task(10, "in progress")
     tasks = get_all_tasks()
     assert len(tasks) >= 2
@@ -57,8 +65,8 @@ def test_update_status(db):
 
 def test_get_tasks_by_status(db):
     task_id1 = add_task(10, "in progress")
-    task_id2 = add_task(10, "in progress")
     update_status(task_id1, "completed")
+    task_id2 = add_task(10, "in progress")
 
     completed_tasks = get_tasks_by_status("completed")
     assert len(completed_tasks) == 1
@@ -87,3 +95,148 @@ def test_get_task(db):
     assert task.id == task_id
     assert task.created_at is not None
     assert task.updated_at is not None
+
+
+def test_get_tasks_page_keyset(db):
+    same_time = datetime(2025, 7, 1, 7, 0, tzinfo=timezone.utc)
+    ids = sorted(add_task(10, "completed", created_at=same_time) for _ in range(3))
+    newest = add_task(10, "in progress", datetime(2025, 7, 2, tzinfo=timezone.utc))
+
+    first = get_tasks_page(2)
+    assert [t.id for t in first] == [newest, ids[2]]
+    # Curseur sur (created_at, id) : les ex aequo ne sont ni perdus ni dupliqués
+    second = get_tasks_page(2, first[-1].created_at, first[-1].id)
+    assert [t.id for t in second] == [ids[1], ids[0]]
+    assert get_tasks_page(2, second[-1].created_at, second[-1].id) == []
+
+
+def test_get_tasks_page_filters(db):
+    add_task(10, "completed", datetime(2025, 6, 30, tzinfo=timezone.utc))
+    kept = add_task(10, "completed", datetime(2025, 7, 1, 8, tzinfo=timezone.utc))
+    add_task(10, "canceled", datetime(2025, 7, 1, 9, tzinfo=timezone.utc))
+
+    tasks = get_tasks_page(
+        10,
+        status="completed",
+        start=datetime(2025, 7, 1, tzinfo=timezone.utc),
+        end=datetime(2025, 7, 2, tzinfo=timezone.utc),
+    )
+    assert [t.id for t in tasks] == [kept]
+
+
+def test_unit_of_work_commits_once(db):
+    with unit_of_work():
+        task_id = add_task(10, "in progress")
+        update_status(task_id, "completed")
+        assert get_task(task_id).status == "completed"
+    assert get_task(task_id).status == "completed"
+
+
+def test_unit_of_work_rolls_back_on_error(db):
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            add_task(10, "in progress")
+            # Un UnitOfWork imbriqué rejoint la transaction englobante
+            with unit_of_work():
+                add_task(20, "completed")
+            raise RuntimeError("boom")
+    assert get_all_tasks() == []
+
+
+def test_repository_commits_task_before_side_effects(db):
+    from infrastructure.persistence.watering_task_repository import (
+        SqlAlchemyWateringTaskRepository,
+    )
+
+    repository = SqlAlchemyWateringTaskRepository()
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            task_id = repository.add(10, "in progress")
+            # Déjà visible d'une autre session (thread du runtime)
+            with SessionLocal() as other:
+                assert other.get(Task, task_id) is not None
+            raise RuntimeError("échec après l'ouverture de la vanne")
+    # La fin en échec de la requête n'efface pas la tâche démarrée
+    assert get_task(task_id).status == "in progress"
+
+
+def test_single_active_task_is_enforced(db):
+    task_id = add_task(10, "in progress")
+    with pytest.raises(ActiveTaskExists):
+        add_task(10, "in progress")
+    update_status(task_id, "completed")
+    # L'emplacement est libéré dès que la tâche quitte "in progress"
+    assert add_task(10, "in progress")
+
+
+def test_concurrent_starts_keep_one_active_task(db):
+    barrier = threading.Barrier(4)
+    results = []
+
+    def start():
+        barrier.wait()
+        try:
+            results.append(add_task(10, "in progress"))
+        except ActiveTaskExists:
+            results.append(None)
+
+    threads = [threading.Thread(target=start) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len([r for r in results if r]) == 1
+    assert len(get_tasks_by_status("in progress")) == 1
+
+
+def _counters(stats):
+    return (
+        stats.runs,
+        stats.completed_runs,
+        stats.total_seconds,
+        stats.actual_seconds,
+        stats.canceled_runs,
+        stats.error_runs,
+    )
+
+
+def test_daily_stats_follow_status_changes(db):
+    day = datetime(2002, 3, 4, 6, 0, tzinfo=timezone.utc)
+    done = add_task(60, "in progress", created_at=day)
+    update_status(done, "completed", updated_at=day + timedelta(seconds=55))
+    evening = day + timedelta(hours=12)
+    canceled = add_task(30, "in progress", created_at=evening)
+    update_status(canceled, "canceled", updated_at=evening + timedelta(seconds=10))
+    add_task(30, "error: pump", created_at=evening)
+
+    (stats,) = get_daily_stats(day.date(), day.date())
+    assert _counters(stats) == (3, 1, 60, 65, 1, 1)
+
+    # La reconstruction depuis tasks donne le même agrégat
+    rebuild_daily_stats()
+    (rebuilt,) = get_daily_stats(day.date(), day.date())
+    assert _counters(rebuilt) == _counters(stats)
+
+
+def test_transition_on_task_older_than_daily_stats(db):
+    # Tâche écrite avant la table d'agrégat : aucune ligne pour son jour
+    day = datetime(2001, 5, 6, 7, 0, tzinfo=timezone.utc)
+    with SessionLocal() as s:
+        s.add(
+            Task(
+                id="legacy",
+                duration=60,
+                status="in progress",
+                created_at=day,
+                updated_at=day,
+            )
+        )
+        s.commit()
+
+    update_status("legacy", "completed", updated_at=day + timedelta(seconds=60))
+    assert get_daily_stats(day.date(), day.date()) == []
+
+    rebuild_daily_stats()
+    (stats,) = get_daily_stats(day.date(), day.date())
+    assert _counters(stats) == (1, 1, 60, 60, 0, 0)
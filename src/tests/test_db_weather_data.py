@@ -82,3 +82,24 @@ def test_get_forecast_data(db):
 def test_get_nonexistent_forecast_data(db):
     data = db_weather_data.get_weather_data(9999)  # ID qui n'existe pas
     assert data is None
+
+
+def test_add_weather_data_many_upserts_on_date(db):
+    days = [date(2024, 6, d) for d in range(1, 31)]
+    for day in days:
+        db_weather_data.delete_weather_data_by_date(day)
+    first_id = db_weather_data.add_weather_data(days[0], 1.0, 2.0, 3.0)
+    created_at = db_weather_data.get_weather_data(first_id).created_at
+
+    count = db_weather_data.add_weather_data_many(
+        {"date": day, "min_temp": 10.0, "max_temp": 20.0, "precipitation": 0.5}
+        for day in days
+    )
+
+    assert count == len(days)
+    first = db_weather_data.get_weather_data_by_date(days[0])
+    # La ligne existante est mise à jour, pas dupliquée
+    assert first.id == first_id
+    assert first.min_temp == 10.0
+    assert first.created_at == created_at
+    assert db_weather_data.get_weather_data_by_date(days[-1]).max_temp == 20.0
@@ -0,0 +1,195 @@
+import threading
+from datetime import date, datetime, timedelta, timezone
+
+from domain.weather.ports import ForecastCache, ForecastProvider
+from domain.weather.services import ForecastService
+
+TODAY = date(2025, 7, 1)
+
+
+def _stamp(age: timedelta) -> str:
+    return (datetime.now(timezone.utc) - age).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class SlowProvider(ForecastProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def fetch_daily_forecast(self, latitude, longitude):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        return {
+            "temperature_2m_min": 12.0,
+            "temperature_2m_max": 25.0,
+            "precipitation_sum": 0.0,
+        }
+
+    def fetch_partday_forecast(self, latitude, longitude):
+        return [{"part_of_day": "morning"}]
+
+
+class MemoryCache(ForecastCache):
+    def __init__(self, daily=None) -> None:
+        self.daily = daily
+        self.partday = []
+
+    def get_partday_forecast(self):
+        return self.partday
+
+    def store_partday_forecast(self, entries):
+        stamp = _stamp(timedelta(0))
+        self.partday = [{**entry, "updated_at": stamp} for entry in entries]
+
+    def get_daily_forecast(self, target_date):
+        return self.daily
+
+    def store_daily_forecast(self, target_date, min_temp, max_temp, precipitation):
+        self.daily = {
+            "temperature_2m_min": min_temp,
+            "temperature_2m_max": max_temp,
+            "precipitation_sum": precipitation,
+            "updated_at": _stamp(timedelta(0)),
+        }
+        return self.daily
+
+
+def test_stale_entry_is_served_while_refreshing():
+    stale = {"temperature_2m_max": 20.0, "updated_at": _stamp(timedelta(hours=1))}
+    provider = SlowProvider()
+    cache = MemoryCache(stale)
+    service = ForecastService(provider, cache)
+
+    # Le fournisseur est bloqué : la réponse n'attend pas le rafraîchissement
+    assert service.get_daily_minmax_precip(TODAY, 48.8, 2.3) == (stale, True)
+    assert service.refresh_age(TODAY) >= 3600
+    provider.release.set()
+    service.wait_for_refreshes(timeout=5)
+
+    data, from_cache = service.get_daily_minmax_precip(TODAY, 48.8, 2.3)
+    assert from_cache and data["temperature_2m_max"] == 25.0
+    assert provider.calls == 1
+
+
+class BarrierCache(MemoryCache):
+    # Les 4 appelants constatent l'absence avant que l'un d'eux ne la comble
+    def __init__(self) -> None:
+        super().__init__()
+        self.barrier = threading.Barrier(4)
+
+    def get_daily_forecast(self, target_date):
+        daily = self.daily
+        if threading.current_thread().name.startswith("caller"):
+            self.barrier.wait(5)
+        return daily
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    provider = SlowProvider()
+    service = ForecastService(provider, BarrierCache())
+    results = []
+
+    def get():
+        results.append(service.get_daily_minmax_precip(TODAY, 48.8, 2.3))
+
+    threads = [threading.Thread(target=get, name=f"caller-{i}") for i in range(4)]
+    for thread in threads:
+        thread.start()
+    # Le fournisseur n'est libéré qu'une fois le rafraîchissement enregistré.
+    assert provider.started.wait(5)
+    provider.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert provider.calls == 1
+    assert [from_cache for _, from_cache in results] == [False] * 4
+
+
+def test_late_miss_reuses_entry_stored_by_finished_refresh():
+    provider = SlowProvider()
+    provider.release.set()
+    cache = MemoryCache()
+    service = ForecastService(provider, cache)
+    service.get_daily_minmax_precip(TODAY, 48.8, 2.3)
+
+    # Appelant ayant lu le cache vide avant la fin du premier rafraîchissement
+    daily, _ = service._refresh_forecast(TODAY, 48.8, 2.3).result(timeout=5)
+    assert daily == cache.daily
+    assert provider.calls == 1
+
+
+class CombinedProvider(SlowProvider):
+    def __init__(self) -> None:
+        super().__init__()
+        self.release.set()
+        self.combined_calls = 0
+
+    def fetch_forecast(self, latitude, longitude):
+        self.combined_calls += 1
+        daily, _ = super().fetch_forecast(latitude, longitude)
+        return daily, [{"date": "2025-07-01", "updated_at": _stamp(timedelta(0))}]
+
+
+def test_one_upstream_call_fills_daily_and_partday():
+    provider = CombinedProvider()
+    service = ForecastService(provider, MemoryCache())
+
+    assert service.get_daily_minmax_precip(TODAY, 48.8, 2.3)[1] is False
+    partday, from_cache = service.get_partday_forecast(48.8, 2.3)
+    assert from_cache and partday[0]["date"] == "2025-07-01"
+    assert provider.combined_calls == 1
+
+
+def test_open_meteo_client_parses_combined_payload(monkeypatch):
+    from infrastructure.external.open_meteo_client import OpenMeteoClient
+    from services import weather
+
+    requested = []
+
+    def fetch(lat, lon, days=7, daily=None, **kwargs):
+        requested.append(daily)
+        return {
+            "daily": {
+                "temperature_2m_min": [11.5],
+                "temperature_2m_max": [23.0],
+                "precipitation_sum": [0.4],
+            },
+            "hourly": {
+                "time": ["2025-07-01T07:00", "2025-07-01T13:00"],
+                "weather_code": [1, 3],
+                "cloudcover": [10, 90],
+                "temperature_2m": [14.0, 22.0],
+                "precipitation": [0.0, 0.4],
+            },
+        }
+
+    monkeypatch.setattr(weather, "fetch_open_meteo", fetch)
+    daily, partday = OpenMeteoClient().fetch_forecast(48.8, 2.3)
+
+    assert requested == [weather.DAILY_VARIABLES]
+    assert daily["temperature_2m_max"] == 23.0
+    assert partday[0]["afternoon_temp_avg"] == 22.0
+    assert daily["updated_at"] == partday[0]["updated_at"]
+
+
+def test_open_meteo_client_keeps_daily_when_hourly_is_malformed(monkeypatch):
+    from infrastructure.external.open_meteo_client import OpenMeteoClient
+    from services import weather
+
+    def fetch(lat, lon, days=7, daily=None, **kwargs):
+        return {
+            "daily": {
+                "temperature_2m_min": [11.5],
+                "temperature_2m_max": [23.0],
+                "precipitation_sum": [0.4],
+            },
+        }
+
+    monkeypatch.setattr(weather, "fetch_open_meteo", fetch)
+    daily, partday = OpenMeteoClient().fetch_forecast(48.8, 2.3)
+
+    assert daily["temperature_2m_max"] == 23.0
+    # Seule la partie horaire retombe sur les valeurs par défaut
+    assert len(partday) == 5 and partday[0]["night_text"] == "Clear"
@@ -0,0 +1,97 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from infrastructure.external.http_client import HttpClient
+
+ETAG = '"v1"'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers), self.client_address))
+        if self.path.startswith("/flaky") and server.failures > 0:
+            server.failures -= 1
+            return self._send(503, b"")
+        if self.path.startswith("/slow"):
+            server.release.wait(2)
+        if self.headers.get("If-None-Match") == ETAG:
+            return self._send(304, b"")
+
+        body = json.dumps({"daily": {"temperature_2m_max": [24.0]}}).encode()
+        headers = {"ETag": ETAG, "Content-Type": "application/json"}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self._send(200, body, headers)
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests = []
+    server.failures = 0
+    server.release = threading.Event()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_pooled_compressed_conditional_requests(stub):
+    client = HttpClient()
+    first = client.get_json(_url(stub, "/forecast"), params={"latitude": 48.8})
+    second = client.get_json(_url(stub, "/forecast"), params={"latitude": 48.8})
+    client.close()
+
+    assert first == second == {"daily": {"temperature_2m_max": [24.0]}}
+    (_, headers1, addr1), (_, headers2, addr2) = stub.requests
+    assert "gzip" in headers1["Accept-Encoding"]
+    # Deuxième appel conditionnel (304), sur la même connexion
+    assert headers2["If-None-Match"] == ETAG
+    assert addr1 == addr2
+
+
+def test_retries_with_jittered_backoff(stub):
+    delays = []
+    client = HttpClient(retries=2, backoff=0.5, sleep=delays.append)
+    stub.failures = 2
+
+    assert client.get_json(_url(stub, "/flaky"))["daily"]
+    assert len(stub.requests) == 3
+    # Délai tiré dans [0, backoff * 2^tentative]
+    assert 0 <= delays[0] <= 0.5 and 0 <= delays[1] <= 1.0
+
+    stub.failures = 5
+    with pytest.raises(requests.HTTPError):
+        client.get_json(_url(stub, "/flaky?again"))
+
+
+def test_timeout_is_per_call(stub):
+    client = HttpClient(retries=0)
+    with pytest.raises(requests.Timeout):
+        client.get_json(_url(stub, "/slow"), timeout=(1, 0.2))
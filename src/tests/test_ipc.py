@@ -0,0 +1,108 @@
+import os
+import socket
+import tempfile
+from datetime import datetime, timezone
+
+import pytest
+from dotenv import load_dotenv
+
+from application.watering.runtime import WateringRuntime
+from domain.shared.exceptions import ApplicationError, DomainError
+from domain.watering.entities import TaskStatus, WateringTask
+from infrastructure.devices.controllers import DeviceControllerAdapter
+from interfaces.ipc.client import (
+    RemoteDeviceController,
+    RemoteWateringRuntime,
+    RuntimeDaemonClient,
+)
+from interfaces.ipc import protocol
+from interfaces.ipc.server import RuntimeDaemonServer
+from tests.fakes import InMemoryRepository
+
+
+def pytest_configure(config):
+    # Charger le .env.test en priorité
+    load_dotenv(dotenv_path=".env.test", override=True)
+
+
+def _task(task_id, duration):
+    now = datetime.now(timezone.utc)
+    return WateringTask(
+        id=task_id,
+        duration=duration,
+        status=TaskStatus.IN_PROGRESS,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture
+def daemon():
+    controller = DeviceControllerAdapter()
+    controller.setup()
+    repository = InMemoryRepository([_task("short", 1), _task("long", 120)])
+    runtime = WateringRuntime(controller, repository)
+    socket_path = os.path.join(tempfile.mkdtemp(), "runtime.sock")
+    server = RuntimeDaemonServer(socket_path, controller, runtime, repository)
+    server.start()
+    yield RuntimeDaemonClient(socket_path, timeout=2), repository
+    server.shutdown()
+    controller.cleanup()
+
+
+def test_remote_runtime_completes_task(daemon):
+    client, repository = daemon
+    runtime = RemoteWateringRuntime(client)
+
+    runtime.start(_task("short", 1))
+
+    assert repository.updated.wait(5)
+    assert repository.statuses["short"] == "completed"
+
+
+def test_remote_stop_all_and_status(daemon):
+    client, repository = daemon
+    runtime = RemoteWateringRuntime(client)
+    controller = RemoteDeviceController(client)
+
+    runtime.start(_task("long", 120))
+    assert runtime.active_task_ids() == ["long"]
+    assert controller.get_level() == 4.0
+
+    assert runtime.stop_all() == ["long"]
+    assert repository.statuses["long"] == "canceled"
+    assert controller.close_water().result(timeout=2) is None
+    assert runtime.active_task_ids() == []
+
+
+def test_remote_errors_are_mapped(daemon):
+    client, _ = daemon
+
+    with pytest.raises(DomainError):
+        RemoteWateringRuntime(client).start(_task("invalid", 0))
+    with pytest.raises(ApplicationError):
+        client.call("unknown")
+
+
+def test_client_reports_unavailable_daemon():
+    client = RuntimeDaemonClient(os.path.join(tempfile.mkdtemp(), "none.sock"))
+
+    with pytest.raises(ApplicationError):
+        client.call("ping")
+
+
+def test_oversized_request_is_rejected_and_connection_closed(daemon):
+    client, _ = daemon
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(2)
+        conn.connect(client._socket_path)
+        # Aucune fin de ligne dans la limite : le reste ne doit pas être lu
+        # comme une nouvelle requête
+        prefix = b'{"op":"ping","pad":"'
+        conn.sendall(prefix + b"x" * (protocol.MAX_MESSAGE_SIZE - len(prefix)))
+        with conn.makefile("rb") as stream:
+            response = protocol.decode(stream.readline())
+            assert response == protocol.failure("Request too large")
+            assert stream.readline() == b""
+    assert client.call("ping") == "pong"
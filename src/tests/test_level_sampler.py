@@ -0,0 +1,57 @@
+import time
+
+from infrastructure.devices.controllers import DeviceControllerAdapter
+from infrastructure.devices.level_sampler import TankLevelSampler
+
+
+def test_readers_share_latest_sample():
+    reads = []
+
+    def read_mask():
+        reads.append(time.monotonic())
+        return 0b0111
+
+    sampler = TankLevelSampler(read_mask, max_age=60)
+    for _ in range(100):
+        assert sampler.latest().level == 3
+    assert len(reads) == 1
+
+
+def test_stale_sample_is_refreshed():
+    masks = iter([0b0001, 0b0011])
+    sampler = TankLevelSampler(lambda: next(masks), max_age=0.05)
+    assert sampler.latest().level == 1
+    time.sleep(0.1)
+    assert sampler.latest().level == 2
+    assert [sample.mask for sample in sampler.history()] == [0b0001, 0b0011]
+
+
+def test_ring_buffer_is_bounded():
+    sampler = TankLevelSampler(lambda: 0b1111, history_size=3)
+    for _ in range(10):
+        sampler.sample_now()
+    assert len(sampler.history()) == 3
+    assert sampler.hardware_reads == 10
+
+
+def test_level_edge_refreshes_adapter_sample():
+    controller = DeviceControllerAdapter()
+    assert controller.get_level() == 4
+    controller._control.level = 1
+    assert controller.get_level() == 1
+    levels = controller.debug_water_levels()
+    assert [levels[f"level_{i}"]["state"] for i in range(4)] == [1, 0, 0, 0]
+
+
+def test_failing_subscriber_does_not_block_the_others():
+    controller = DeviceControllerAdapter()
+    received = []
+
+    def failing(level):
+        raise RuntimeError("boom")
+
+    controller.subscribe_level_changes(failing)
+    controller.subscribe_level_changes(received.append)
+    controller._on_level_edge(0)
+
+    assert received == [4.0]
@@ -0,0 +1,94 @@
+from datetime import date, datetime, timezone
+
+from domain.weather.ports import ForecastCache
+from infrastructure.persistence.memory_forecast_cache import MemoryForecastCache
+
+
+class CountingCache(ForecastCache):
+    def __init__(self) -> None:
+        self.reads = 0
+        self.daily = {}
+
+    def get_partday_forecast(self):
+        self.reads += 1
+        return [{"date": "2025-07-01", "updated_at": "2025-07-01 06:00:00"}]
+
+    def store_partday_forecast(self, entries):
+        return [{**entry, "updated_at": "2025-07-01 07:00:00"} for entry in entries]
+
+    def get_daily_forecast(self, target_date):
+        self.reads += 1
+        return self.daily.get(target_date)
+
+    def store_daily_forecast(self, target_date, min_temp, max_temp, precipitation):
+        self.daily[target_date] = {"temperature_2m_max": max_temp}
+        return self.daily[target_date]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hits_skip_inner_until_ttl():
+    inner, clock = CountingCache(), FakeClock()
+    cache = MemoryForecastCache(inner, ttl=60, clock=clock)
+
+    first = cache.get_partday_forecast()
+    assert cache.get_partday_forecast() == first
+    assert inner.reads == 1
+    clock.now = 61
+    cache.get_partday_forecast()
+    assert inner.reads == 2
+
+
+def test_store_replaces_entry_and_size_is_bounded():
+    inner = CountingCache()
+    cache = MemoryForecastCache(inner, max_entries=2, clock=FakeClock())
+    days = [date(2025, 7, d) for d in (1, 2, 3)]
+
+    # Les absences ne sont pas mises en cache
+    assert cache.get_daily_forecast(days[0]) is None
+    assert cache.get_daily_forecast(days[0]) is None
+    assert inner.reads == 2
+
+    for day in days:
+        cache.store_daily_forecast(day, 10.0, 20.0, 0.0)
+    cache.store_daily_forecast(days[2], 10.0, 25.0, 0.0)
+    assert cache.get_daily_forecast(days[2]) == {"temperature_2m_max": 25.0}
+    assert inner.reads == 2
+    # Le jour le moins récemment utilisé a été évincé
+    cache.get_daily_forecast(days[0])
+    assert inner.reads == 3
+
+
+def test_store_repopulates_partday_with_decoded_timestamp():
+    inner = CountingCache()
+    cache = MemoryForecastCache(inner, clock=FakeClock())
+
+    cache.get_partday_forecast()
+    cache.store_partday_forecast([{"date": "2025-07-01"}])
+
+    assert cache.get_partday_forecast()[0]["updated_at"] == "2025-07-01 07:00:00"
+    assert cache.partday_updated_at() == datetime(2025, 7, 1, 7, tzinfo=timezone.utc)
+    assert inner.reads == 1
+
+
+def test_refresh_age_reads_the_decoded_timestamp(monkeypatch):
+    from domain.weather.services import ForecastService
+    from infrastructure.persistence import memory_forecast_cache
+
+    inner = CountingCache()
+    cache = MemoryForecastCache(inner, clock=FakeClock())
+    service = ForecastService(provider=None, cache=cache)
+    cache.get_partday_forecast()
+
+    def no_parse(value):
+        raise AssertionError("timestamp parsed again")
+
+    monkeypatch.setattr(memory_forecast_cache, "parse_updated_at", no_parse)
+    assert service.refresh_age() > 0
+    assert inner.reads == 1
@@ -0,0 +1,64 @@
+import random
+from datetime import datetime, timedelta
+
+from services.partday import aggregate_partday_columns, hour_slots
+from services.weather import aggregate_by_partday
+
+
+def _hourly(days, seed=0, start=datetime(2025, 7, 1)):
+    rng = random.Random(seed)
+    hours = [start + timedelta(hours=h) for h in range(24 * days)]
+    return {
+        "hourly": {
+            "time": [h.strftime("%Y-%m-%dT%H:%M") for h in hours],
+            "weather_code": [rng.choice([0, 1, 3, 61, 95]) for _ in hours],
+            "cloudcover": [rng.randint(0, 100) for _ in hours],
+            "temperature_2m": [
+                None if rng.random() < 0.05 else round(rng.uniform(-5, 35), 1)
+                for _ in hours
+            ],
+            "precipitation": [
+                None if rng.random() < 0.05 else round(rng.uniform(0, 3), 1)
+                for _ in hours
+            ],
+        }
+    }
+
+
+def test_matches_aggregate_by_partday():
+    for seed in range(20):
+        data = _hourly(16, seed)
+        assert aggregate_partday_columns(data) == aggregate_by_partday(data)
+
+
+def test_partial_days_and_missing_values():
+    # Horizon commençant en cours de journée, températures absentes
+    data = _hourly(2, 3, start=datetime(2025, 7, 1, 14))
+    data["hourly"]["temperature_2m"][:10] = [None] * 10
+    assert aggregate_partday_columns(data) == aggregate_by_partday(data)
+
+
+def test_irregular_series_falls_back_to_hourly_path():
+    # Heure manquante puis heure doublée (changement d'heure)
+    data = _hourly(3, 5)
+    hourly = data["hourly"]
+    for column in hourly.values():
+        del column[30]
+        column.insert(60, column[59])
+    assert aggregate_partday_columns(data) == aggregate_by_partday(data)
+
+
+def test_custom_windows():
+    windows = (("day", 8, 20),)
+    assert list(hour_slots(windows)[7:9]) == [-1, 0]
+
+    (row,) = aggregate_partday_columns(_hourly(1), windows)
+    assert set(row) == {
+        "date",
+        "temp_min",
+        "temp_max",
+        "day_icon",
+        "day_text",
+        "day_precip_mm",
+        "day_temp_avg",
+    }
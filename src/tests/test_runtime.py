@@ -0,0 +1,239 @@
+import threading
+import time
+import json
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+
+from application.watering.runtime import WateringRuntime
+from application.watering.scheduler import RuntimeScheduler
+from domain.watering.entities import TaskStatus, WaterState, WateringTask
+from infrastructure.devices.controllers import DeviceControllerAdapter
+from infrastructure.persistence.runtime_journal import FileRuntimeJournal
+from tests.fakes import InMemoryRepository
+
+
+def pytest_configure(config):
+    # Charger le .env.test en priorité
+    load_dotenv(dotenv_path=".env.test", override=True)
+
+
+def _task(duration):
+    now = datetime.now(timezone.utc)
+    return WateringTask(
+        id="task-1",
+        duration=duration,
+        status=TaskStatus.IN_PROGRESS,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_runtime_completes_task():
+    controller = DeviceControllerAdapter()
+    repository = InMemoryRepository()
+    runtime = WateringRuntime(controller, repository)
+
+    runtime.start(_task(1))
+
+    assert repository.updated.wait(5)
+    assert repository.statuses["task-1"] == "completed"
+
+
+def test_runtime_cuts_off_on_level_edge():
+    controller = DeviceControllerAdapter()
+    repository = InMemoryRepository()
+    # Intervalle de secours volontairement long : seul le front doit réveiller la tâche
+    runtime = WateringRuntime(controller, repository, level_check_interval=60)
+
+    runtime.start(_task(120))
+    time.sleep(0.2)
+
+    dried_at = time.monotonic()
+    controller._control.level = 0
+
+    assert repository.updated.wait(5)
+    latency = time.monotonic() - dried_at
+    assert repository.statuses["task-1"] == "canceled"
+    assert latency < 0.5
+
+
+def test_runtime_cancels_task_when_opening_is_aborted():
+    controller = DeviceControllerAdapter()
+    repository = InMemoryRepository()
+    runtime = WateringRuntime(controller, repository)
+    # Ouverture interrompue par une fermeture : la séquence finit vanne fermée
+    aborted = Future()
+    aborted.set_result(WaterState.CLOSED)
+    controller.open_water = lambda: aborted
+
+    runtime.start(_task(60))
+
+    assert repository.updated.wait(5)
+    assert repository.statuses["task-1"] == "canceled"
+    assert runtime.remaining("task-1") is None
+
+
+def test_runtime_cancels_paused_task_when_reopening_is_aborted():
+    controller = DeviceControllerAdapter()
+    repository = InMemoryRepository()
+    runtime = WateringRuntime(controller, repository)
+    runtime.start(_task(60))
+    deadline = time.monotonic() + 5
+    while runtime.remaining("task-1") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert runtime.pause("task-1")
+    aborted = Future()
+    aborted.set_result(WaterState.CLOSED)
+    controller.open_water = lambda: aborted
+
+    assert runtime.resume("task-1")
+
+    assert repository.updated.wait(5)
+    assert repository.statuses["task-1"] == "canceled"
+    assert runtime.remaining("task-1") is None
+
+
+def test_runtime_uses_single_scheduler_thread():
+    controller = DeviceControllerAdapter()
+    repository = InMemoryRepository()
+    runtime = WateringRuntime(controller, repository)
+    runtime.start(_task(60))
+    time.sleep(0.1)
+    baseline = threading.active_count()
+
+    for i in range(20):
+        task = _task(60)
+        task.id = f"task-{i + 2}"
+        runtime.start(task)
+    time.sleep(0.1)
+
+    assert threading.active_count() == baseline
+    assert len(runtime.stop_all()) == 21
+
+
+def test_scheduler_pause_and_extend():
+    scheduler = RuntimeScheduler()
+    fired = threading.Event()
+    started = time.monotonic()
+    scheduler.schedule("job", 0.3, fired.set)
+
+    assert scheduler.pause("job")
+    time.sleep(0.4)
+    assert not fired.is_set()
+    assert scheduler.remaining("job") > 0.2
+
+    assert scheduler.resume("job")
+    assert scheduler.extend("job", 0.2)
+    assert fired.wait(2)
+    # 0.4 s de pause + 0.3 s restantes + 0.2 s d'extension
+    assert time.monotonic() - started >= 0.85
+    scheduler.shutdown()
+
+
+def test_journal_tracks_open_runs_and_ignores_torn_lines(tmp_path):
+    journal = FileRuntimeJournal(str(tmp_path / "journal.jsonl"))
+    journal.record_start("a", 60)
+    journal.record_start("b", 30)
+    journal.record_progress({"a": 12.5, "b": 3})
+    journal.record_end("b", "completed")
+    with open(tmp_path / "journal.jsonl", "a") as f:
+        f.write('{"event": "progress", "task_id": "a", "ela')
+
+    pending = journal.pending()
+    assert [run.task_id for run in pending] == ["a"]
+    assert pending[0].elapsed == 12.5
+    assert pending[0].remaining == 47.5
+
+    journal.record_end("a", "completed")
+    assert journal.pending() == []
+
+
+def test_journal_progress_is_durable_within_sync_interval(tmp_path, monkeypatch):
+    from infrastructure.persistence import runtime_journal
+
+    path = tmp_path / "journal.jsonl"
+    durable = []  # contenu garanti sur disque à chaque fsync
+    real_fsync = runtime_journal.os.fsync
+
+    def fsync(fd):
+        real_fsync(fd)
+        durable[:] = path.read_text().splitlines()
+
+    monkeypatch.setattr(runtime_journal.os, "fsync", fsync)
+    now = [0.0]
+    journal = FileRuntimeJournal(str(path), sync_interval=10, clock=lambda: now[0])
+    journal.record_start("task-1", 600)
+
+    for second in range(1, 121):
+        now[0] = float(second)
+        journal.record_progress({"task-1": second})
+        # Coupure de courant ici : seul l'état durable est relu au redémarrage
+        elapsed = max(
+            json.loads(line).get("elapsed", 0)
+            for line in durable
+            if json.loads(line)["task_id"] == "task-1"
+        )
+        assert second - elapsed <= 10
+
+
+def test_runtime_resumes_interrupted_task(tmp_path):
+    journal = FileRuntimeJournal(str(tmp_path / "journal.jsonl"))
+    journal.record_start("task-1", 60)
+    journal.record_progress({"task-1": 58.5})
+
+    repository = InMemoryRepository([_task(60)])
+    runtime = WateringRuntime(
+        DeviceControllerAdapter(), repository, journal=journal, checkpoint_interval=0.2
+    )
+
+    assert runtime.recover(timedelta(minutes=10)) == ["task-1"]
+    assert repository.wait("task-1", 5)
+    assert repository.statuses["task-1"] == "completed"
+    # La fin est journalisée juste après la mise à jour du dépôt
+    deadline = time.monotonic() + 5
+    while journal.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal.pending() == []
+
+
+def test_recover_rerecords_runs_before_compacting(tmp_path, monkeypatch):
+    path = tmp_path / "journal.jsonl"
+    previous = FileRuntimeJournal(str(path))  # processus interrompu
+    previous.record_start("task-1", 60)
+    previous.record_progress({"task-1": 10})
+    previous.record_start("gone", 60)  # tâche absente du dépôt
+
+    journal = FileRuntimeJournal(str(path))
+    repository = InMemoryRepository([_task(60)])
+    runtime = WateringRuntime(DeviceControllerAdapter(), repository, journal=journal)
+    # Arrêt brutal juste avant le compactage : la reprise est déjà sur disque
+    monkeypatch.setattr(journal, "compact", lambda: None)
+    assert runtime.recover(timedelta(minutes=10)) == ["task-1"]
+    runs = {run.task_id: run for run in FileRuntimeJournal(str(path)).pending()}
+    assert runs["task-1"].elapsed == 10
+
+    monkeypatch.undo()
+    journal.compact()
+    assert [r.task_id for r in FileRuntimeJournal(str(path)).pending()] == ["task-1"]
+    assert len(path.read_text().splitlines()) == 1
+    runtime.stop_all()
+
+
+def test_runtime_cancels_task_outside_grace_window(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    stale = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+    path.write_text(
+        json.dumps(
+            {"event": "start", "task_id": "task-1", "duration": 60, "at": stale}
+        )
+        + "\n"
+    )
+    repository = InMemoryRepository([_task(60)])
+    runtime = WateringRuntime(
+        DeviceControllerAdapter(), repository, journal=FileRuntimeJournal(str(path))
+    )
+
+    assert runtime.recover(timedelta(minutes=10)) == []
+    assert repository.statuses["task-1"] == "canceled"
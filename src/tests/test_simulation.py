@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+from application.watering.runtime import WateringRuntime
+from application.watering.scheduler import RuntimeScheduler
+from domain.shared.clock import SimulatedClock
+from domain.watering.entities import TaskStatus, WateringTask
+from infrastructure.devices.simulated import SimulatedDeviceController, SimulatedTank
+from tests.fakes import InMemoryRepository
+
+
+def pytest_configure(config):
+    # Charger le .env.test en priorité
+    load_dotenv(dotenv_path=".env.test", override=True)
+
+
+def _simulation(litres):
+    clock = SimulatedClock(datetime(2025, 7, 1, 7, tzinfo=timezone.utc))
+    scheduler = RuntimeScheduler(clock=clock.monotonic, threaded=False)
+    tank = SimulatedTank(capacity_litres=100, litres=litres, pump_flow_lpm=60)
+    controller = SimulatedDeviceController(tank, clock, scheduler)
+    repository = InMemoryRepository()
+    runtime = WateringRuntime(controller, repository, scheduler=scheduler, clock=clock)
+    return clock, scheduler, controller, repository, runtime
+
+
+def _run(clock, scheduler, runtime):
+    while runtime.active_task_ids():
+        scheduler.run_pending()
+        deadline = scheduler.next_deadline()
+        if deadline is None:
+            break
+        clock.advance(deadline - clock.monotonic())
+
+
+def _task(duration, clock):
+    return WateringTask(
+        id="task-1",
+        duration=duration,
+        status=TaskStatus.IN_PROGRESS,
+        created_at=clock.now(),
+        updated_at=clock.now(),
+    )
+
+
+def test_simulated_run_completes_without_waiting():
+    clock, scheduler, controller, repository, runtime = _simulation(litres=100)
+
+    runtime.start(_task(60, clock))
+    _run(clock, scheduler, runtime)
+
+    assert repository.statuses["task-1"] == "completed"
+    assert clock.monotonic() == 60
+    assert controller.pump_seconds == 60
+    assert controller.tank.litres == 40
+    assert clock.now() == datetime(2025, 7, 1, 7, 1, tzinfo=timezone.utc)
+
+
+def test_simulated_tank_runs_dry_on_float_edge():
+    # 30 L au-dessus du dernier flotteur (5 L) à 1 L/s : coupure à 25 s
+    clock, scheduler, controller, repository, runtime = _simulation(litres=30)
+
+    runtime.start(_task(600, clock))
+    _run(clock, scheduler, runtime)
+
+    assert repository.statuses["task-1"] == "canceled"
+    assert abs(controller.pump_seconds - 25) < 0.01
+    assert controller.get_level() == 0
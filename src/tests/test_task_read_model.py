@@ -0,0 +1,114 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+
+from domain.watering.entities import TaskStatus, WateringTask
+from domain.watering.ports import WateringTaskRepository
+from infrastructure.persistence.task_read_model import (
+    ReadModelWateringTaskRepository,
+    TaskReadModel,
+)
+
+
+def pytest_configure(config):
+    # Charger le .env.test en priorité
+    load_dotenv(dotenv_path=".env.test", override=True)
+
+
+class CountingRepository(WateringTaskRepository):
+    def __init__(self):
+        self.tasks = {}
+        self.reads = 0
+        self._created = datetime(2025, 7, 1, tzinfo=timezone.utc)
+
+    def add(self, duration, status, created_at=None):
+        task_id = str(uuid.uuid4())
+        self._created += timedelta(minutes=1)
+        self.tasks[task_id] = WateringTask(
+            id=task_id,
+            duration=duration,
+            status=TaskStatus(status),
+            created_at=self._created,
+            updated_at=self._created,
+        )
+        return task_id
+
+    def get(self, task_id):
+        self.reads += 1
+        task = self.tasks.get(task_id)
+        if task is None:
+            return None
+        return WateringTask(
+            id=task.id,
+            duration=task.duration,
+            status=task.status,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+        )
+
+    def get_active_task(self):
+        self.reads += 1
+        active = [t for t in self.tasks.values() if t.is_active]
+        return active[-1] if active else None
+
+    def list_all(self):
+        self.reads += 1
+        return sorted(self.tasks.values(), key=lambda t: t.created_at, reverse=True)
+
+    def list_recent(self, limit):
+        return self.list_all()[:limit]
+
+    def update_status(self, task_id, status, error=None):
+        self.tasks[task_id].status = TaskStatus(status)
+
+    def clear_active_tasks(self, keep=()):
+        for task in self.tasks.values():
+            if task.is_active and task.id not in keep:
+                task.status = TaskStatus.CANCELED
+
+
+def test_reads_are_served_from_memory():
+    inner = CountingRepository()
+    repository = ReadModelWateringTaskRepository(inner, TaskReadModel(capacity=5))
+    task_id = repository.add(30, "in progress")
+    reads = inner.reads
+
+    assert repository.get_active_task().id == task_id
+    assert repository.get(task_id).status == TaskStatus.IN_PROGRESS
+    assert inner.reads == reads
+
+    repository.update_status(task_id, "completed")
+    assert repository.get_active_task() is None
+    assert repository.get(task_id).status == TaskStatus.COMPLETED
+
+
+def test_active_task_survives_eviction():
+    inner = CountingRepository()
+    repository = ReadModelWateringTaskRepository(inner, TaskReadModel(capacity=3))
+    active_id = repository.add(30, "in progress")
+    finished = [repository.add(30, "completed") for _ in range(5)]
+
+    assert repository.get_active_task().id == active_id
+    assert [task.id for task in repository.list_recent(10)] == [
+        finished[-1],
+        finished[-2],
+        active_id,
+    ]
+    # Tâche évincée : relue en base
+    reads = inner.reads
+    assert repository.get(finished[0]).id == finished[0]
+    assert inner.reads == reads + 1
+
+
+def test_rebuild_after_clearing_active_tasks():
+    inner = CountingRepository()
+    stale = inner.add(30, "in progress")
+    repository = ReadModelWateringTaskRepository(inner, TaskReadModel(capacity=5))
+    repository.rebuild()
+    assert repository.get_active_task().id == stale
+
+    repository.clear_active_tasks()
+
+    assert repository.get_active_task() is None
+    assert repository.get(stale).status == TaskStatus.CANCELED
@@ -0,0 +1,95 @@
+import importlib
+import threading
+import time
+
+import pytest
+from dotenv import load_dotenv
+
+import config.config as local_config
+import infrastructure.devices.controllers  # noqa: F401 - alias du paquet "control"
+from infrastructure.control import virtual_gpio
+
+
+def pytest_configure(config):
+    # Charger le .env.test en priorité
+    load_dotenv(dotenv_path=".env.test", override=True)
+
+
+def _gpio_control(**options):
+    config = local_config.load_config()
+    board = virtual_gpio.install(config["pump"], config["levels"], **options)
+    control_gpio = importlib.import_module("infrastructure.control.control_gpio")
+    control = control_gpio.GPIOControl()
+    control.settleDelay = 0.0
+    control.setup()
+    return board, control
+
+
+@pytest.fixture(autouse=True)
+def close_board():
+    yield
+    virtual_gpio.board.close()
+
+
+def test_gpio_control_reads_full_tank():
+    board, control = _gpio_control()
+
+    assert control.readLevelMask() == 0b1111
+    assert control.getLevel() == 4
+    assert all(
+        state["state"] == 1 for state in control.debugWaterLevels().values()
+    )
+    assert board.reads == 12
+
+
+def test_pump_drains_tank_and_emits_edges():
+    board, control = _gpio_control(drain_rate=4.0)
+    levels = []
+    dry = threading.Event()
+
+    def on_level(channel):
+        # Le front ne porte pas le niveau : l'abonné le relit
+        level = control.getLevel()
+        levels.append(level)
+        if level == 0:
+            dry.set()
+
+    control.watchLevels(on_level)
+    control.openWater()
+
+    assert dry.wait(2)
+    control.closeWater()
+    assert levels == sorted(levels, reverse=True)
+    assert control.getLevel() == 0
+
+
+def test_bouncetime_filters_contact_chatter():
+    board, control = _gpio_control(chatter=2)
+
+    board.set_fill(0.0)
+    time.sleep(0.1)
+
+    # Un seul front par flotteur malgré les rebonds
+    assert board.events == 4
+    assert control.readLevelMask() == 0
+
+
+def test_level_edges_do_not_read_the_floats():
+    board, control = _gpio_control()
+    channels = []
+    control.watchLevels(channels.append)
+    reads = board.reads
+
+    board.set_fill(0.0)
+    time.sleep(0.1)
+
+    # La relecture est laissée à l'abonné, sérialisée par l'acteur
+    assert sorted(channels) == sorted(local_config.load_config()["levels"])
+    assert board.reads == reads
+
+
+def test_unconfigured_channel_raises():
+    board, _ = _gpio_control()
+
+    with pytest.raises(RuntimeError):
+        board.input(99)
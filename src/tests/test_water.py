@@ -168,8 +168,8 @@ def test_open_water_command_not_enough_water(client):
     with unittest.mock.patch.object(
         local_config, "load_config", side_effect=mock_load_config
     ):
-        # Mock getLevel to return a low value (simulate not enough water)
-        with unittest.mock.patch("app.ctlInst.getLevel", return_value=0):
+        # Mock get_level to return a low value (simulate not enough water)
+        with unittest.mock.patch("app.ctlInst.get_level", return_value=0):
             response = client.get("/api/command/open-water?duration=300")
             assert (
                 response.status_code == 507
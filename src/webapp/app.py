@@ -12,14 +12,15 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from flask import Flask, jsonify, request, session
+from flask import Flask, g, jsonify, request, session
 from flask_babel import Babel, lazy_gettext as _l
 from werkzeug.exceptions import HTTPException
 
 import config.config as local_config
 from babel.messages import mofile, pofile
+from db.database import unit_of_work
 from interfaces.http.flask.container import build_container
-from interfaces.http.flask.routes import system, ui, watering, weather
+from interfaces.http.flask.routes import export, system, ui, watering, weather
 from routes.history_series import bp as history_series_bp
 
 logger = logging.getLogger(__name__)
@@ -50,6 +51,7 @@ def create_app() -> Flask:
 
     register_context_processors(app)
     register_before_request(app)
+    register_unit_of_work(app)
     register_blueprints(app)
 
     atexit.register(lambda: shutdown(container))
@@ -112,6 +114,26 @@ def register_before_request(app: Flask) -> None:
             session["lang"] = "fr"
 
 
+def register_unit_of_work(app: Flask) -> None:
+    # Une session et une transaction par requête pour tous les dépôts.
+    @app.before_request
+    def begin_unit_of_work():
+        g.unit_of_work = unit_of_work().begin()
+
+    @app.after_request
+    def flag_failed_request(response):
+        if response.status_code >= 500:
+            g.unit_of_work_failed = True
+        return response
+
+    @app.teardown_request
+    def end_unit_of_work(error):
+        work = g.pop("unit_of_work", None)
+        if work is not None:
+            failed = error is not None or g.pop("unit_of_work_failed", False)
+            work.end(failed=failed)
+
+
 def _ensure_translations() -> None:
     translations_root = os.path.join(os.path.dirname(__file__), "translations")
     if not os.path.isdir(translations_root):
@@ -134,6 +156,7 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(weather.bp)
     app.register_blueprint(watering.bp)
     app.register_blueprint(system.bp)
+    app.register_blueprint(export.bp)
 
 
 def get_locale():
@@ -143,6 +166,10 @@ def get_locale():
 
 
 def shutdown(container) -> None:
+    if container.level_recorder is not None:
+        container.level_recorder.stop()
+    if container.http_client is not None:
+        container.http_client.close()
     try:
         container.device_controller.cleanup()
     except Exception:  # pragma: no cover - defensive
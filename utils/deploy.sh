@@ -10,6 +10,7 @@ SHARED_DIR="$APP_ROOT/shared"
 
 # systemd service
 SYSTEMD_SERVICE="gunicorn_arrosage.service"
+RUNTIME_SERVICE="arrosage-runtime.service"
 
 # Healthcheck URL (use a very lightweight endpoint, e.g.: /healthz)
 HEALTHCHECK_URL="${HEALTHCHECK_URL:-http://127.0.0.1/healthz}"
@@ -147,6 +148,8 @@ log "ℹ️ [deploy] Switching symlink…"
 ln -sfn "$NEW_RELEASE" "$CURRENT_LINK"
 
 log "ℹ️ [deploy] Restarting service…"
+# The hardware daemon resumes interrupted watering from its journal
+systemctl restart "$RUNTIME_SERVICE" || true
 systemctl restart "$SYSTEMD_SERVICE"
 
 log "ℹ️ [deploy] Healthcheck ($HEALTHCHECK_URL)…"
@@ -164,6 +167,7 @@ if [[ $ok -ne 1 ]]; then
   log "❌ [deploy] Healthcheck FAILED → rollback…"
   if [[ -n "${PREV_TARGET:-}" && -d "$PREV_TARGET" ]]; then
     ln -sfn "$PREV_TARGET" "$CURRENT_LINK"
+    systemctl restart "$RUNTIME_SERVICE" || true
     systemctl restart "$SYSTEMD_SERVICE" || true
     log "⚠️ [deploy] Rollback performed to: $PREV_TARGET"
   else